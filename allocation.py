@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+METHODS = {
+    "Parité de risque": "risk_parity",
+    "Moyenne-variance": "mean_variance",
+}
+
+HORIZON_RISK_AVERSION = {
+    "Court terme": 2.0,
+    "Moyen terme": 1.0,
+    "Long terme": 0.5,
+}
+
+ASSET_CLASS_VOLATILITY = {
+    "Actions": 0.28,
+    "Indices": 0.18,
+    "Obligations": 0.08,
+    "Devises": 0.09,
+    "Matières premières": 0.30,
+    "Crypto": 0.70,
+}
+
+_DEFAULT_VOLATILITY = 0.20
+_INTRA_CLASS_CORRELATION = 0.6
+_CROSS_CLASS_CORRELATION = 0.15
+
+
+@dataclass
+class AllocationResult:
+    method: str
+    weights: np.ndarray
+    cash: float
+    volatility: float
+    iterations: int
+
+
+def target_volatility(risk_budget: int) -> float:
+    return 0.02 * risk_budget
+
+
+def proxy_covariance(universe: Dict[str, List[str]]) -> np.ndarray:
+    classes = np.array([asset_class for asset_class, assets in universe.items() for _ in assets])
+    vols = np.array([ASSET_CLASS_VOLATILITY.get(asset_class, _DEFAULT_VOLATILITY) for asset_class in classes])
+    corr = np.where(classes[:, None] == classes[None, :], _INTRA_CLASS_CORRELATION, _CROSS_CLASS_CORRELATION)
+    np.fill_diagonal(corr, 1.0)
+    return corr * np.multiply.outer(vols, vols)
+
+
+def expected_returns(composite_scores: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    sharpe = (np.asarray(composite_scores, dtype=float) - 50.0) / 100.0
+    return sharpe * np.sqrt(np.diagonal(cov))
+
+
+def risk_parity(
+    cov: np.ndarray,
+    budgets: Optional[np.ndarray] = None,
+    x0: Optional[np.ndarray] = None,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+) -> Tuple[np.ndarray, int]:
+    """Risk budgeting weights via Newton-CG on Spinu's convex formulation
+
+        min 0.5 x'Σx - b'log(x),
+
+    whose minimiser has x_i (Σx)_i = b_i. Only matrix-vector products with Σ
+    are needed, so each iteration is O(n²)."""
+    n_assets = cov.shape[0]
+    b = np.full(n_assets, 1.0 / n_assets) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+    diag = np.diagonal(cov)
+    if x0 is None:
+        x = np.sqrt(b / diag)
+    else:
+        x = np.maximum(np.asarray(x0, dtype=float), 1e-12)
+        x *= np.sqrt(b.sum() / (x @ cov @ x))
+
+    for iteration in range(max_iter):
+        sx = cov @ x
+        contributions = x * sx
+        if np.max(np.abs(contributions / contributions.sum() - b)) < tol:
+            return x / x.sum(), iteration
+        grad = sx - b / x
+        curvature = b / x**2
+        precond = diag + curvature
+        grad_norm = np.linalg.norm(grad)
+        forcing = min(0.5, np.sqrt(grad_norm)) * grad_norm
+
+        step_dir = np.zeros(n_assets)
+        cov_dir = np.zeros(n_assets)
+        residual = -grad
+        z = residual / precond
+        search = z.copy()
+        rz = residual @ z
+        for _ in range(n_assets):
+            cov_search = cov @ search
+            hess_search = cov_search + curvature * search
+            alpha = rz / (search @ hess_search)
+            step_dir += alpha * search
+            cov_dir += alpha * cov_search
+            residual -= alpha * hess_search
+            if np.linalg.norm(residual) <= forcing:
+                break
+            z = residual / precond
+            rz_next = residual @ z
+            search = z + (rz_next / rz) * search
+            rz = rz_next
+
+        step = 1.0
+        shrinking = step_dir < 0
+        if shrinking.any():
+            step = min(1.0, 0.95 * float(np.min(-x[shrinking] / step_dir[shrinking])))
+        x_sx, d_sx, d_cd = x @ sx, step_dir @ sx, step_dir @ cov_dir
+        slope = grad @ step_dir
+
+        def objective(t: float) -> float:
+            return 0.5 * (x_sx + 2 * t * d_sx + t * t * d_cd) - b @ np.log(x + t * step_dir)
+
+        base = objective(0.0)
+        while objective(step) > base + 1e-4 * step * slope and step > 1e-12:
+            step *= 0.5
+        x = x + step * step_dir
+    return x / x.sum(), max_iter
+
+
+def _project_capped_simplex(v: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    # h(τ) = Σ clip(v - τ, lower, upper) is piecewise linear and decreasing with
+    # breakpoints at v - upper and v - lower; evaluate it at every breakpoint
+    # from prefix sums, then interpolate inside the bracketing segment.
+    ordered = np.sort(v)
+    prefix = np.concatenate(([0.0], np.cumsum(ordered)))
+    n_assets = len(v)
+
+    def h(tau: np.ndarray) -> np.ndarray:
+        lo_count = np.searchsorted(ordered, tau + lower, side="right")
+        hi_start = np.searchsorted(ordered, tau + upper, side="left")
+        middle = prefix[hi_start] - prefix[lo_count] - tau * (hi_start - lo_count)
+        return lower * lo_count + upper * (n_assets - hi_start) + middle
+
+    breakpoints = np.unique(np.concatenate((ordered - upper, ordered - lower)))
+    values = h(breakpoints)
+    index = int(np.searchsorted(-values, -1.0, side="left"))
+    if index == 0:
+        tau = breakpoints[0]
+    elif index == len(breakpoints):
+        tau = breakpoints[-1]
+    else:
+        t0, t1 = breakpoints[index - 1], breakpoints[index]
+        h0, h1 = values[index - 1], values[index]
+        tau = t0 if h0 == h1 else t0 + (h0 - 1.0) * (t1 - t0) / (h0 - h1)
+    return np.clip(v - tau, lower, upper)
+
+
+def _largest_feasible_eigenvalue(cov: np.ndarray, start: Optional[np.ndarray], iterations: int = 30) -> float:
+    # Only directions with Σd = 0 move along the budget constraint, so the step
+    # size is set by the top eigenvalue of the centred Σ, not of Σ itself: the
+    # market mode, which usually dominates, is mostly projected out.
+    n_assets = cov.shape[0]
+    rng = np.random.default_rng(n_assets)
+    vector = rng.normal(size=n_assets) if start is None or len(start) != n_assets else start - start.mean()
+    for _ in range(iterations):
+        vector = vector - vector.mean()
+        vector = cov @ vector
+        vector -= vector.mean()
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return float(np.max(np.diagonal(cov)))
+        vector /= norm
+    return float(vector @ cov @ vector)
+
+
+def mean_variance(
+    cov: np.ndarray,
+    mu: np.ndarray,
+    risk_aversion: float,
+    lower: float = 0.0,
+    upper: float = 1.0,
+    x0: Optional[np.ndarray] = None,
+    tol: float = 1e-6,
+    max_iter: int = 5000,
+) -> Tuple[np.ndarray, int]:
+    """Long-only, fully invested mean-variance weights with box constraints,
+
+        min (λ/2) w'Σw - μ'w  s.t.  Σw = 1, lower <= w <= upper,
+
+    solved by accelerated projected gradient (FISTA) with adaptive restart."""
+    n_assets = cov.shape[0]
+    if upper * n_assets < 1.0 or lower * n_assets > 1.0:
+        raise ValueError("Contraintes de poids infaisables")
+    step = 1.0 / (risk_aversion * _largest_feasible_eigenvalue(cov, x0) * 1.05)
+    start = np.full(n_assets, 1.0 / n_assets) if x0 is None or len(x0) != n_assets else x0
+    w = _project_capped_simplex(np.asarray(start, dtype=float), lower, upper)
+    y, momentum = w.copy(), 1.0
+    for iteration in range(max_iter):
+        grad = risk_aversion * (cov @ y) - mu
+        w_next = _project_capped_simplex(y - step * grad, lower, upper)
+        if np.max(np.abs(w_next - w)) < tol:
+            return w_next, iteration
+        if (y - w_next) @ (w_next - w) > 0:
+            momentum = 1.0
+        momentum_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum**2))
+        y = w_next + ((momentum - 1.0) / momentum_next) * (w_next - w)
+        w, momentum = w_next, momentum_next
+    return w, max_iter
+
+
+class AllocationEngine:
+    """Keeps the last solution per (method, universe) to warm-start the next solve."""
+
+    def __init__(self) -> None:
+        self._previous: Dict[Hashable, np.ndarray] = {}
+
+    def allocate(
+        self,
+        cov: np.ndarray,
+        mu: np.ndarray,
+        risk_budget: int,
+        horizon: str,
+        method: str = "risk_parity",
+        universe_key: Hashable = None,
+    ) -> AllocationResult:
+        key = (method, universe_key, cov.shape[0])
+        previous = self._previous.get(key)
+        if method == "risk_parity":
+            weights, iterations = risk_parity(cov, x0=previous)
+        elif method == "mean_variance":
+            n_assets = cov.shape[0]
+            upper = min(1.0, max(2.0 / n_assets, 0.05 * risk_budget))
+            risk_aversion = HORIZON_RISK_AVERSION.get(horizon, 1.0) * (11 - risk_budget)
+            weights, iterations = mean_variance(cov, mu, risk_aversion, upper=upper, x0=previous)
+        else:
+            raise ValueError(f"Méthode d'allocation inconnue : {method}")
+        self._previous[key] = weights
+
+        volatility = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+        invested = min(1.0, target_volatility(risk_budget) / volatility) if volatility > 0 else 1.0
+        return AllocationResult(
+            method=method,
+            weights=weights * invested,
+            cash=1.0 - invested,
+            volatility=volatility * invested,
+            iterations=iterations,
+        )
@@ -1,805 +1,1055 @@
- #!/usr/bin/env python3
- # -*- coding: utf-8 -*-
- 
--import ccxt
--import yfinance as yf
-+import hashlib
-+from dataclasses import dataclass
-+from typing import Dict, List
-+
- import pandas as pd
--import numpy as np
--import streamlit as st
- import plotly.graph_objects as go
--from datetime import datetime, time
--import pytz
--import json
--import os
--from typing import Dict, Tuple, List
--
--# ====================== CONFIGURATION ======================
--CONFIG_DIR = "config"
--ASSETS_FILE = os.path.join(CONFIG_DIR, "assets.json")
--SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
--
--# Fuseau horaire du Congo (GMT+1)
--CONGO_TZ = pytz.timezone("Africa/Brazzaville")
--
--DEFAULT_ASSETS = {
--    "crypto": ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"],
--    "stocks": ["AAPL", "TSLA", "NVDA", "SPY"],
--    "forex": ["EUR/USD", "GBP/USD", "USD/JPY"]
-+import streamlit as st
-+
-+
-+ASSET_UNIVERSE = {
-+    "Actions": ["AAPL", "MSFT", "NVDA", "TSLA", "LVMH.PA"],
-+    "Indices": ["SPX", "NDX", "EUROSTOXX50", "NIKKEI225"],
-+    "Obligations": ["US10Y", "US2Y", "BUND10Y", "OAT10Y"],
-+    "Devises": ["EUR/USD", "USD/JPY", "GBP/USD", "USD/CNH"],
-+    "Matières premières": ["Brent", "WTI", "Gold", "Copper"],
-+    "Crypto": ["BTC", "ETH", "SOL", "XRP"],
- }
- 
--DEFAULT_SETTINGS = {
--    "theme": "dark",
--    "timeframes": ["15m", "1h", "4h", "1d"],
--    "default_timeframe": "4h",
--    "trading_sessions": {
--        "London": {"start": "07:00", "end": "16:00"},
--        "New York": {"start": "13:00", "end": "22:00"}
--    },
--    "risk_per_trade": 0.01,
--    "candle_colors": {
--        "bullish": "#34C759",  # Vert iOS
--        "bearish": "#FF3B30"   # Rouge iOS
--    },
--    "ios_colors": {
--        "primary": "#007AFF",   # Bleu iOS
--        "secondary": "#5856D6", # Violet iOS
--        "background": "#F2F2F7", # Gris clair iOS
--        "card": "#FFFFFF",      # Blanc iOS
--        "text": "#1C1C1E",      # Noir iOS
--        "border": "#C6C6C8"     # Gris bordure iOS
--    }
-+THEME = {
-+    "bg": "#0B0F1A",
-+    "panel": "#111827",
-+    "panel_alt": "#0F172A",
-+    "text": "#E5E7EB",
-+    "muted": "#9CA3AF",
-+    "accent": "#3B82F6",
-+    "accent_alt": "#6366F1",
-+    "positive": "#10B981",
-+    "negative": "#EF4444",
-+    "warning": "#F59E0B",
- }
- 
--# ====================== CORE CLASSES ======================
--class ICTAnalyzer:
--    """Analyseur complet des concepts ICT"""
--    def __init__(self, settings: Dict):
--        self.settings = settings
--        self.congo_tz = pytz.timezone("Africa/Brazzaville")
--    
--    # ... (keep all other methods unchanged) ...
--
--class TradingDashboard:
--    """Interface utilisateur de l'assistant de trading"""
--    def __init__(self):
--        self._init_data()
--        self._setup_ui()
--    
--    def _init_data(self):
--        """Initialise les données et configurations"""
--        os.makedirs(CONFIG_DIR, exist_ok=True)
--        
--        # Crée assets.json si inexistant
--        if not os.path.exists(ASSETS_FILE):
--            with open(ASSETS_FILE, 'w') as f:
--                json.dump(DEFAULT_ASSETS, f, indent=4)
--        
--        # Crée settings.json si inexistant
--        if not os.path.exists(SETTINGS_FILE):
--            with open(SETTINGS_FILE, 'w') as f:
--                json.dump(DEFAULT_SETTINGS, f, indent=4)
--        
--        # Charge les assets et settings
--        with open(ASSETS_FILE, 'r') as f:
--            self.assets = json.load(f)
--        
--        with open(SETTINGS_FILE, 'r') as f:
--            raw_settings = json.load(f)
--            self.settings = raw_settings
--            
--        self.data_fetcher = DataFetcher()
--        self.ict_analyzer = ICTAnalyzer(self.settings)
--    
--    def _setup_ui(self):
--        """Configure l'interface utilisateur avec style iOS"""
--        st.set_page_config(
--            layout="wide", 
--            page_title="ICT Trading Assistant Pro",
--            page_icon="📊"
--        )
--        
--        self._apply_ios_style()
--        self._setup_sidebar()
--        
--        st.title("📊 Assistant de Trading ICT - Analyse Pré-Marché")
--        
--        if hasattr(st.session_state, 'analyze_clicked') and st.session_state.analyze_clicked:
--            self._perform_analysis()
--        else:
--            self._display_welcome_screen()
--    
--    def _apply_ios_style(self):
--        """Applique le style iOS"""
--        ios_colors = self.settings['ios_colors']
--        
--        st.markdown(f"""
-+
-+@dataclass
-+class MacroFactor:
-+    label: str
-+    signal: str
-+    weight: float
-+    score: int
-+
-+
-+@dataclass
-+class Scenario:
-+    name: str
-+    probability: float
-+    narrative: str
-+
-+
-+@dataclass
-+class ThesisBlock:
-+    title: str
-+    content: str
-+
-+
-+def _stable_seed(text: str) -> int:
-+    digest = hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
-+    return int(digest, 16)
-+
-+
-+def _score_to_rating(score: int) -> str:
-+    if score >= 85:
-+        return "AAA"
-+    if score >= 75:
-+        return "AA"
-+    if score >= 65:
-+        return "A"
-+    if score >= 55:
-+        return "BBB"
-+    if score >= 45:
-+        return "BB"
-+    if score >= 35:
-+        return "B"
-+    return "D"
-+
-+
-+def _score_to_decision(score: int) -> str:
-+    if score >= 75:
-+        return "Accumuler"
-+    if score >= 60:
-+        return "Conserver"
-+    if score >= 45:
-+        return "Réduire"
-+    return "Short"
-+
-+
-+def _make_macro_factors(seed: int) -> List[MacroFactor]:
-+    base_scores = [70, 64, 59, 61, 56, 67]
-+    labels = [
-+        "Cycle économique",
-+        "Politique monétaire",
-+        "Inflation",
-+        "Croissance PIB",
-+        "Flux de capitaux",
-+        "Risque géopolitique",
-+    ]
-+    signals = [
-+        "Expansion tardive",
-+        "Restrictive mais prévisible",
-+        "Désinflation graduelle",
-+        "Croissance sous tendance",
-+        "Flux sélectifs",
-+        "Tensions régionales persistantes",
-+    ]
-+    weights = [0.2, 0.2, 0.15, 0.15, 0.15, 0.15]
-+
-+    adjustment = (seed % 11) - 5
-+    factors = []
-+    for label, signal, weight, base in zip(labels, signals, weights, base_scores):
-+        score = max(35, min(90, base + adjustment))
-+        factors.append(MacroFactor(label, signal, weight, score))
-+    return factors
-+
-+
-+def _weighted_score(factors: List[MacroFactor]) -> int:
-+    return int(sum(f.weight * f.score for f in factors))
-+
-+
-+def _fundamental_metrics(seed: int) -> Dict[str, str]:
-+    adj = (seed % 9) - 4
-+    roe = 17.5 + adj
-+    margin = 22.5 + (adj // 2)
-+    leverage = 1.4 + (adj / 20)
-+    growth = 7.5 + (adj / 2)
-+    valuation = 21 + adj
-+    fcf = 12 + (adj / 3)
-+    return {
-+        "ROE": f"{roe:.1f}%",
-+        "Marge opérationnelle": f"{margin:.1f}%",
-+        "FCF yield": f"{fcf:.1f}%",
-+        "Levier net": f"{leverage:.2f}x",
-+        "Croissance CA 3a": f"{growth:.1f}%",
-+        "EV/EBITDA": f"{valuation:.1f}x",
-+    }
-+
-+
-+def _market_signals(seed: int) -> Dict[str, str]:
-+    adj = (seed % 7) - 3
-+    curve = 12 + adj
-+    credit = 135 + adj * 5
-+    corr = 0.55 + adj * 0.02
-+    vol = 18 + adj
-+    return {
-+        "Pente de courbe": f"{curve:.1f} pb",
-+        "Spread crédit": f"{credit} pb",
-+        "Corrélation cross-asset": f"{corr:.2f}",
-+        "Volatilité implicite": f"{vol:.1f}%",
-+        "Régime": "Risk-on sélectif",
-+    }
-+
-+
-+def _portfolio_metrics(seed: int) -> Dict[str, str]:
-+    adj = (seed % 5) - 2
-+    sharpe = 1.05 + adj * 0.1
-+    sortino = 1.35 + adj * 0.12
-+    drawdown = 8.5 + adj
-+    diversification = 0.6 + adj * 0.02
-+    liquidity = 2.4 + adj * 0.1
-+    return {
-+        "Sharpe": f"{sharpe:.2f}",
-+        "Sortino": f"{sortino:.2f}",
-+        "Max drawdown": f"-{drawdown:.1f}%",
-+        "Diversification effective": f"{diversification:.2f}",
-+        "Budget liquidité": f"{liquidity:.2f}x",
-+    }
-+
-+
-+def _hedge_signals(seed: int) -> Dict[str, str]:
-+    adj = (seed % 6) - 3
-+    asym = 1.3 + adj * 0.1
-+    catalyst = "Résultats + guidance" if seed % 2 == 0 else "Macro surprise + positioning"
-+    stress = "Moderate" if seed % 3 == 0 else "Elevated"
-+    return {
-+        "Asymétrie rendement/risque": f"{asym:.2f}",
-+        "Inefficiences détectées": "Dispersion + microstructure",
-+        "Catalyseur": catalyst,
-+        "Stress de liquidité": stress,
-+    }
-+
-+
-+def _scenarios(seed: int) -> List[Scenario]:
-+    base = seed % 10
-+    central = 55 + (base - 5)
-+    bull = 25 - (base - 5) // 2
-+    bear = 100 - central - bull
-+    return [
-+        Scenario("Scénario central", central, "Normalisation progressive et croissance modérée."),
-+        Scenario("Scénario haussier", bull, "Désinflation rapide et regain d'appétit au risque."),
-+        Scenario("Scénario baissier", bear, "Choc de liquidité et stress de crédit."),
-+    ]
-+
-+
-+def _thesis_blocks(seed: int) -> List[ThesisBlock]:
-+    risk_focus = "corrélations élevées" if seed % 2 == 0 else "fragilité du crédit"
-+    return [
-+        ThesisBlock(
-+            "Thèse d'investissement",
-+            "Prime de qualité justifiée par la résilience cash-flow et le pricing power.",
-+        ),
-+        ThesisBlock(
-+            "Risques prioritaires",
-+            f"Durcissement financier, {risk_focus}, liquidité asymétrique.",
-+        ),
-+        ThesisBlock(
-+            "Catalyseurs",
-+            "Normalisation macro, re-rating sélectif, rotation vers actifs défensifs.",
-+        ),
-+    ]
-+
-+
-+def _layout_style() -> None:
-+    st.set_page_config(page_title="Institutional Fundamental Command", layout="wide")
-+    st.markdown(
-+        f"""
-         <style>
--        :root {{
--            --primary: {ios_colors['primary']};
--            --secondary: {ios_colors['secondary']};
--            --background: {ios_colors['background']};
--            --card-bg: {ios_colors['card']};
--            --text: {ios_colors['text']};
--            --border: {ios_colors['border']};
-+        body, .stApp {{
-+            background-color: {THEME['bg']};
-+            color: {THEME['text']};
-+            font-family: "Inter", "Segoe UI", sans-serif;
-         }}
--        
--        body {{
--            background-color: var(--background);
-+        .block-container {{
-+            padding-top: 2rem;
-         }}
--        
--        .main {{
--            background-color: var(--background);
--            color: var(--text);
--            font-family: -apple-system, BlinkMacSystemFont, sans-serif;
-+        .panel {{
-+            background: {THEME['panel']};
-+            border: 1px solid #1F2937;
-+            border-radius: 16px;
-+            padding: 16px;
-+            margin-bottom: 16px;
-         }}
--        
--        .sidebar .sidebar-content {{
--            background-color: var(--card-bg);
--            border-right: 1px solid var(--border);
-+        .panel h3 {{
-+            margin: 0 0 10px 0;
-+            color: {THEME['text']};
-         }}
--        
--        .stButton>button {{
--            background-color: var(--primary);
--            border: none;
--            color: white;
-+        .metric-pill {{
-+            background: {THEME['panel_alt']};
-             border-radius: 10px;
--            padding: 10px 24px;
--            font-weight: 500;
--            font-size: 16px;
-+            padding: 12px;
-+            border: 1px solid #1F2937;
-         }}
--        
--        .stAlert {{
--            background-color: var(--card-bg);
--            border-radius: 14px;
--            border: 1px solid var(--border);
--            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-+        .muted {{
-+            color: {THEME['muted']};
-         }}
--        
--        .stTextInput>div>div>input {{
--            border-radius: 10px;
--            border: 1px solid var(--border);
--        }}
--        
--        .stSelectbox>div>div {{
--            border-radius: 10px;
--            border: 1px solid var(--border);
--        }}
--        
--        .css-1aumxhk {{
--            color: var(--text) !important;
-+        .decision {{
-+            font-size: 20px;
-+            font-weight: 700;
-         }}
--        
--        /* Cards style */
--        .custom-card {{
--            background-color: var(--card-bg);
--            border-radius: 12px;
--            padding: 15px;
--            margin-bottom: 15px;
--            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
--            border: 1px solid var(--border);
-+        .rating {{
-+            font-size: 24px;
-+            font-weight: 700;
-         }}
--        
--        /* Section headers */
--        .section-header {{
--            font-size: 20px;
--            font-weight: 600;
--            margin-bottom: 15px;
--            color: var(--text);
-+        .sidebar .sidebar-content {{
-+            background-color: {THEME['panel']};
-         }}
-         </style>
--        """, unsafe_allow_html=True)
--    
--    def _setup_sidebar(self):
--        """Configure la barre latérale avec style iOS"""
--        with st.sidebar:
--            st.image("https://i.imgur.com/JQ6wB2n.png", width=120)
--            st.title("Configuration")
--            
--            # Sélection de l'actif
--            self.asset_category = st.selectbox(
--                "Catégorie d'actif",
--                list(self.assets.keys()),
--                key="asset_category"
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def _metric_grid(metrics: Dict[str, str]) -> None:
-+    cols = st.columns(len(metrics))
-+    for col, (label, value) in zip(cols, metrics.items()):
-+        with col:
-+            st.markdown(
-+                f"""
-+                <div class="metric-pill">
-+                    <div class="muted" style="font-size:12px;">{label}</div>
-+                    <div style="font-size:18px; font-weight:600;">{value}</div>
-+                </div>
-+                """,
-+                unsafe_allow_html=True,
-+            )
-+
-+
-+def _header_kpis(composite_score: int, rating: str, decision: str, horizon: str) -> None:
-+    kpi_cols = st.columns(4)
-+    kpi_data = [
-+        ("Score composite", f"{composite_score}/100"),
-+        ("Notation interne", rating),
-+        ("Décision", decision),
-+        ("Horizon", horizon),
-+    ]
-+    for col, (label, value) in zip(kpi_cols, kpi_data):
-+        with col:
-+            st.markdown(
-+                f"""
-+                <div class="panel">
-+                    <div class="muted" style="font-size:12px;">{label}</div>
-+                    <div style="font-size:22px; font-weight:700;">{value}</div>
-+                </div>
-+                """,
-+                unsafe_allow_html=True,
-             )
--            
--            self.selected_symbol = st.selectbox(
--                "Actif",
--                self.assets[self.asset_category],
--                key="asset_select"
-+
-+
-+def _macro_tab(macro_factors: List[MacroFactor], macro_score: int) -> None:
-+    st.markdown("<div class='panel'><h3>Analyse macroéconomique globale</h3></div>", unsafe_allow_html=True)
-+    macro_df = pd.DataFrame(
-+        {
-+            "Facteur": [f.label for f in macro_factors],
-+            "Signal": [f.signal for f in macro_factors],
-+            "Poids": [f.weight for f in macro_factors],
-+            "Score": [f.score for f in macro_factors],
-+        }
-+    )
-+    st.dataframe(macro_df, width="stretch")
-+    fig = go.Figure(
-+        data=[
-+            go.Bar(
-+                x=macro_df["Facteur"],
-+                y=macro_df["Score"],
-+                marker_color=THEME["accent"],
-+            )
-+        ]
-+    )
-+    fig.update_layout(
-+        height=320,
-+        plot_bgcolor=THEME["panel"],
-+        paper_bgcolor=THEME["panel"],
-+        font_color=THEME["text"],
-+        yaxis=dict(range=[0, 100]),
-+    )
-+    st.plotly_chart(fig, width="stretch")
-+    st.markdown(
-+        f"<div class='panel'><div class='muted'>Score macro pondéré</div><div style='font-size:20px;font-weight:600;'>{macro_score}/100</div></div>",
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def _fundamentals_tab(seed: int) -> None:
-+    st.markdown("<div class='panel'><h3>Analyse fondamentale entreprises/actifs</h3></div>", unsafe_allow_html=True)
-+    _metric_grid(_fundamental_metrics(seed))
-+    st.markdown(
-+        """
-+        <div class="panel">
-+            <h4>Diagnostic qualitatif</h4>
-+            <ul>
-+                <li>Moat : différenciation prix/qualité et leadership technologique.</li>
-+                <li>Management : discipline capitalistique et amélioration du mix.</li>
-+                <li>Risque : sensibilité aux conditions de financement globales.</li>
-+            </ul>
-+        </div>
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def _markets_tab(seed: int) -> None:
-+    st.markdown("<div class='panel'><h3>Analyse des marchés financiers</h3></div>", unsafe_allow_html=True)
-+    _metric_grid(_market_signals(seed))
-+    st.markdown(
-+        """
-+        <div class="panel">
-+            <h4>Lecture du régime de marché</h4>
-+            <p>La corrélation reste élevée, signal d'allocation prudente et d'arbitrages ciblés.</p>
-+        </div>
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def _portfolio_tab(seed: int) -> None:
-+    st.markdown("<div class='panel'><h3>Gestion de portefeuille institutionnelle</h3></div>", unsafe_allow_html=True)
-+    _metric_grid(_portfolio_metrics(seed))
-+    alloc_df = pd.DataFrame(
-+        {
-+            "Segment": ["Core", "Satellite", "Hedges", "Cash"],
-+            "Allocation": [45, 25, 20, 10],
-+        }
-+    )
-+    fig_alloc = go.Figure(
-+        data=[
-+            go.Pie(
-+                labels=alloc_df["Segment"],
-+                values=alloc_df["Allocation"],
-+                hole=0.55,
-+                marker=dict(colors=[THEME["accent"], THEME["accent_alt"], THEME["warning"], THEME["muted"]]),
-+            )
-+        ]
-+    )
-+    fig_alloc.update_layout(
-+        height=320,
-+        plot_bgcolor=THEME["panel"],
-+        paper_bgcolor=THEME["panel"],
-+        font_color=THEME["text"],
-+        legend_orientation="h",
-+    )
-+    st.plotly_chart(fig_alloc, width="stretch")
-+
-+
-+def _hedge_tab(seed: int) -> None:
-+    st.markdown("<div class='panel'><h3>Comportement hedge fund</h3></div>", unsafe_allow_html=True)
-+    _metric_grid(_hedge_signals(seed))
-+    st.markdown(
-+        """
-+        <div class="panel">
-+            <h4>Arbitrages et inefficiences</h4>
-+            <ul>
-+                <li>Relative value : dispersion extrême intra-secteur.</li>
-+                <li>Macro : asymétrie favorable en cas de repli des taux réels.</li>
-+                <li>Contrarian : consensus encore fragile sur la trajectoire de croissance.</li>
-+            </ul>
-+        </div>
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def _decision_tab(seed: int, rating: str, decision: str) -> None:
-+    st.markdown("<div class='panel'><h3>Thèse d'investissement structurée</h3></div>", unsafe_allow_html=True)
-+    scenarios = _scenarios(seed)
-+    scenario_df = pd.DataFrame(
-+        {
-+            "Scénario": [s.name for s in scenarios],
-+            "Probabilité": [s.probability for s in scenarios],
-+            "Narratif": [s.narrative for s in scenarios],
-+        }
-+    )
-+    fig_scenarios = go.Figure(
-+        data=[
-+            go.Bar(
-+                x=scenario_df["Scénario"],
-+                y=scenario_df["Probabilité"],
-+                marker_color=THEME["accent"],
-             )
--            
--            # Sélection du timeframe
--            self.selected_timeframe = st.selectbox(
--                "Intervalle",
--                self.settings['timeframes'],
--                index=self.settings['timeframes'].index(
--                    self.settings['default_timeframe']
--                )
-+        ]
-+    )
-+    fig_scenarios.update_layout(
-+        height=280,
-+        plot_bgcolor=THEME["panel"],
-+        paper_bgcolor=THEME["panel"],
-+        font_color=THEME["text"],
-+        yaxis=dict(range=[0, 100], ticksuffix="%"),
-+    )
-+    st.plotly_chart(fig_scenarios, width="stretch")
-+    st.dataframe(scenario_df, width="stretch")
-+
-+    thesis_blocks = _thesis_blocks(seed)
-+    cols = st.columns(len(thesis_blocks))
-+    for col, block in zip(cols, thesis_blocks):
-+        with col:
-+            st.markdown(
-+                f"""
-+                <div class="panel">
-+                    <h4>{block.title}</h4>
-+                    <p class="muted">{block.content}</p>
-+                </div>
-+                """,
-+                unsafe_allow_html=True,
-             )
--            
--            # Bouton d'analyse avec style iOS
--            if st.button("🔍 Analyser le Marché", key="analyze_btn"):
--                st.session_state.analyze_clicked = True
--                st.rerun()
--            
--            st.markdown("---")
--            
--            # Heures de trading
--            st.subheader("🕒 Sessions de Trading")
--            
--            # Afficher les heures des sessions de trading en temps Congo
--            london_start = self.settings['trading_sessions']['London']['start']
--            london_end = self.settings['trading_sessions']['London']['end']
--            ny_start = self.settings['trading_sessions']['New York']['start']
--            ny_end = self.settings['trading_sessions']['New York']['end']
--            
--            st.markdown(f"""
--            <div class="custom-card">
--                <p><strong>Londres</strong>: {london_start}-{london_end}</p>
--                <p><strong>New York</strong>: {ny_start}-{ny_end}</p>
--                <p><strong>Heure Congo</strong>: {datetime.now(CONGO_TZ).strftime("%H:%M")}</p>
--            </div>
--            """, unsafe_allow_html=True)
--            
--            # Gestion des actifs
--            with st.expander("📋 Gérer les actifs"):
--                new_asset = st.text_input("Ajouter un nouvel actif")
--                col1, col2 = st.columns(2)
--                with col1:
--                    if st.button("➕ Ajouter") and new_asset:
--                        if self.asset_category not in self.assets:
--                            self.assets[self.asset_category] = []
--                        self.assets[self.asset_category].append(new_asset)
--                        self._save_assets()
--                        st.success(f"Actif {new_asset} ajouté !")
--                with col2:
--                    if st.button("🗑️ Supprimer"):
--                        if self.selected_symbol in self.assets[self.asset_category]:
--                            self.assets[self.asset_category].remove(self.selected_symbol)
--                            self._save_assets()
--                            st.success(f"Actif {self.selected_symbol} supprimé !")
--                            st.rerun()
--    
--    def _create_ios_card(self, title: str, content: str):
--        """Crée une carte avec style iOS"""
--        return f"""
--        <div class="custom-card">
--            <h3 style="margin: 0 0 10px 0; color: var(--primary);">{title}</h3>
--            <p style="margin: 0; color: var(--text); white-space: pre-wrap;">{content}</p>
-+
-+    st.markdown(
-+        f"""
-+        <div class="panel">
-+            <div class="rating">Notation interne : {rating}</div>
-+            <div class="decision" style="color:{THEME['accent']};">Décision : {decision}</div>
-         </div>
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+
-+def main() -> None:
-+    _layout_style()
-+
-+    st.sidebar.title("Allocation Intelligence")
-+    asset_class = st.sidebar.selectbox("Classe d'actifs", list(ASSET_UNIVERSE.keys()))
-+    asset = st.sidebar.selectbox("Actif", ASSET_UNIVERSE[asset_class])
-+    horizon = st.sidebar.selectbox("Horizon", ["Court terme", "Moyen terme", "Long terme"], index=1)
-+    risk_budget = st.sidebar.slider("Budget de risque", 1, 10, 6)
-+
-+    seed = _stable_seed(f"{asset_class}-{asset}-{horizon}-{risk_budget}")
-+    macro_factors = _make_macro_factors(seed)
-+    macro_score = _weighted_score(macro_factors)
-+    fundamental_score = max(40, min(90, macro_score + (seed % 7) - 3))
-+    market_score = max(35, min(90, macro_score + (seed % 9) - 4))
-+    portfolio_score = max(35, min(90, macro_score + (seed % 5) - 2))
-+    hedge_score = max(35, min(90, macro_score + (seed % 11) - 5))
-+
-+    composite_score = int(
-+        0.25 * macro_score
-+        + 0.3 * fundamental_score
-+        + 0.2 * market_score
-+        + 0.15 * portfolio_score
-+        + 0.1 * hedge_score
-+    )
-+
-+    rating = _score_to_rating(composite_score)
-+    decision = _score_to_decision(composite_score)
-+
-+    st.markdown(
-         """
--    
--    def _display_pre_market_analysis(self, analysis: Dict):
--        """Affiche l'analyse pré-marché avec style iOS"""
--        st.subheader("🔍 Analyse Pré-Marché ICT")
--        
--        cols = st.columns(4)
--        
--        # Hauts/Bas égaux
--        with cols[0]:
--            eh_val = analysis['equal_highs_lows']['equal_highs']
--            el_val = analysis['equal_highs_lows']['equal_lows']
--            
--            eh_text = f"Haut: {eh_val:.2f}" if eh_val is not None else "N/A"
--            el_text = f"Bas: {el_val:.2f}" if el_val is not None else "N/A"
--            
--            st.markdown(self._create_ios_card(
--                "📏 Hauts et bas égaux",
--                f"{'✅ Détecté' if analysis['equal_highs_lows']['is_equal_high'] or analysis['equal_highs_lows']['is_equal_low'] else '❌ Non détecté'}\n{eh_text}\n{el_text}"
--            ), unsafe_allow_html=True)
--        
--        # ... (rest of the methods remain similar but use _create_ios_card) ...
--
--# ... (keep DataFetcher class and main execution unchanged) ...
-+        <div class="panel">
-+            <h2>Fonds d'investissement — Tableau de commandement fondamental</h2>
-+            <div class="muted">Décisions structurées. Priorité à la préservation du capital.</div>
-+        </div>
-+        """,
-+        unsafe_allow_html=True,
-+    )
-+
-+    _header_kpis(composite_score, rating, decision, horizon)
-+
-+    tabs = st.tabs(
-+        [
-+            "Vue macro",
-+            "Fondamentaux",
-+            "Marchés",
-+            "Portefeuille",
-+            "Hedge fund",
-+            "Décision",
-+        ]
-+    )
-+
-+    with tabs[0]:
-+        _macro_tab(macro_factors, macro_score)
-+
-+    with tabs[1]:
-+        _fundamentals_tab(seed)
-+
-+    with tabs[2]:
-+        _markets_tab(seed)
-+
-+    with tabs[3]:
-+        _portfolio_tab(seed)
-+
-+    with tabs[4]:
-+        _hedge_tab(seed)
-+
-+    with tabs[5]:
-+        _decision_tab(seed, rating, decision)
-+
-+
-+if __name__ == "__main__":
-+    main()
-
-
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+
+if __name__ == "__main__" and "--batch" in sys.argv[1:]:
+    from batch import main as _batch_main
+
+    sys.exit(_batch_main([arg for arg in sys.argv[1:] if arg != "--batch"]))
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from allocation import METHODS, AllocationEngine, AllocationResult, expected_returns, proxy_covariance
+from cache import SharedCache
+from charts import CHART_RANGES, WEBGL_MIN_POINTS, ChartSeries, chart_series
+from curves import RATE_ASSETS, CurveBook
+from fetcher import MarketDataFetcher, default_fetcher
+from fundamentals import RATIOS, FundamentalsBook, FundamentalsStore
+from journal import DecisionEntry, DecisionJournal, period_bounds_ms
+from live import SimulatedFeed, Subscription, TickBus
+from montecarlo import SimulationSnapshot, SimulationSpec, bucket_labels, process_pool, run_simulation
+from panels import banner, kpi_strip, metric_grid, note, score_panel, section, stylesheet_injector, thesis_row, verdict
+from perf import JSON_FILE, PERF, PERF_DIR, PROMETHEUS_FILE
+from pipeline import Pipeline, scoring_pipeline
+from risk import RISK_METHODS, RiskCheck, RiskMonitor
+from rolling import TRADING_DAYS, RollingCovariance, average_correlation, diversification_ratio, returns_matrix
+from score_index import ScoreIndex
+from scoring import (
+    ASSET_UNIVERSE,
+    HORIZONS,
+    SCORE_COLUMNS,
+    Instrument,
+    MacroFactor,
+    Scenario,
+    ThesisBlock,
+    _composite_score,
+    _live_market_score,
+    _load_instruments,
+    _load_settings,
+    _load_universe,
+    _macro_weights,
+    _market_signals,
+    _score_to_decision,
+    _score_to_rating,
+    score_universe,
+)
+from search import SymbolIndex
+from store import OHLCVStore
+
+
+THEME = {
+    "bg": "#0B0F1A",
+    "panel": "#111827",
+    "panel_alt": "#0F172A",
+    "text": "#E5E7EB",
+    "muted": "#9CA3AF",
+    "accent": "#3B82F6",
+    "accent_alt": "#6366F1",
+    "positive": "#10B981",
+    "negative": "#EF4444",
+    "warning": "#F59E0B",
+}
+
+ALLOCATION_COLORS = [THEME["accent"], THEME["accent_alt"], THEME["positive"], THEME["warning"], THEME["negative"], "#14B8A6"]
+
+SCREENER_COLUMNS = {
+    "composite": "Composite",
+    "macro": "Macro",
+    "fundamental": "Fondamental",
+    "market": "Marchés",
+    "portfolio": "Portefeuille",
+    "hedge": "Hedge",
+}
+
+FULL_PATHS = 1_000_000
+
+RISK_WINDOW = 250
+RISK_MIN_DAYS = 60
+RISK_CONFIDENCE = 0.99
+
+
+@dataclass
+class AnalysisBundle:
+    asset_class: str
+    asset: str
+    horizon: str
+    risk_budget: int
+    macro_weights: Tuple[float, ...]
+    seed: int
+    macro_factors: List[MacroFactor]
+    macro_score: int
+    fundamental_score: int
+    market_score: int
+    portfolio_score: int
+    hedge_score: int
+    composite_score: int
+    rating: str
+    decision: str
+    fundamental_metrics: Dict[str, str]
+    market_signals: Dict[str, str]
+    portfolio_metrics: Dict[str, str]
+    hedge_signals: Dict[str, str]
+    live_risk: Optional[Dict[str, float]]
+    reported_fundamentals: Optional[Dict[str, float]]
+    curve_signals: Optional[Dict[str, float]]
+    asset_risk: Optional[Dict[str, float]]
+    portfolio_risk: Optional[Dict[str, pd.DataFrame]]
+    scenarios: List[Scenario]
+    simulation_spec: SimulationSpec
+    thesis_blocks: List[ThesisBlock]
+    macro_df: pd.DataFrame
+    scenario_df: pd.DataFrame
+    alloc_frames: Dict[str, pd.DataFrame]
+    macro_fig: go.Figure
+    alloc_figs: Dict[str, go.Figure]
+    scenario_fig: go.Figure
+
+
+def _macro_frame(macro_factors: List[MacroFactor]) -> pd.DataFrame:
+    # The factors view one table row: build the frame from its columns.
+    first = macro_factors[0]
+    frame = first.table.asset_frame(first.index)
+    return frame.rename(columns={"label": "Facteur", "signal": "Signal", "weight": "Poids", "score": "Score"})
+
+
+def _scenario_frame(scenarios: List[Scenario]) -> pd.DataFrame:
+    first = scenarios[0]
+    frame = first.table.asset_frame(first.index)
+    return frame.rename(columns={"name": "Scénario", "probability": "Probabilité", "narrative": "Narratif"})
+
+
+def _allocation_frame(result: AllocationResult) -> pd.DataFrame:
+    classes = [asset_class for asset_class, assets in ASSET_UNIVERSE.items() for _ in assets]
+    by_class = pd.Series(result.weights * 100, index=classes).groupby(level=0, sort=False).sum()
+    return pd.DataFrame(
+        {
+            "Segment": [*by_class.index, "Cash"],
+            "Allocation": [*by_class.round(1), round(result.cash * 100, 1)],
+        }
+    )
+
+
+def _macro_figure(macro_df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=macro_df["Facteur"],
+                y=macro_df["Score"],
+                marker_color=THEME["accent"],
+            )
+        ]
+    )
+    fig.update_layout(
+        height=320,
+        plot_bgcolor=THEME["panel"],
+        paper_bgcolor=THEME["panel"],
+        font_color=THEME["text"],
+        yaxis=dict(range=[0, 100]),
+    )
+    return fig
+
+
+def _allocation_figure(alloc_df: pd.DataFrame) -> go.Figure:
+    fig_alloc = go.Figure(
+        data=[
+            go.Pie(
+                labels=alloc_df["Segment"],
+                values=alloc_df["Allocation"],
+                hole=0.55,
+                marker=dict(colors=ALLOCATION_COLORS[: len(alloc_df) - 1] + [THEME["muted"]]),
+            )
+        ]
+    )
+    fig_alloc.update_layout(
+        height=320,
+        plot_bgcolor=THEME["panel"],
+        paper_bgcolor=THEME["panel"],
+        font_color=THEME["text"],
+        legend_orientation="h",
+    )
+    return fig_alloc
+
+
+def _scenario_figure(scenario_df: pd.DataFrame) -> go.Figure:
+    fig_scenarios = go.Figure(
+        data=[
+            go.Bar(
+                x=scenario_df["Scénario"],
+                y=scenario_df["Probabilité"],
+                marker_color=THEME["accent"],
+            )
+        ]
+    )
+    fig_scenarios.update_layout(
+        height=280,
+        plot_bgcolor=THEME["panel"],
+        paper_bgcolor=THEME["panel"],
+        font_color=THEME["text"],
+        yaxis=dict(range=[0, 100], ticksuffix="%"),
+    )
+    return fig_scenarios
+
+
+def _price_figure(series: ChartSeries) -> go.Figure:
+    trace = go.Scattergl if len(series) >= WEBGL_MIN_POINTS else go.Scatter
+    fig_price = go.Figure(
+        data=[
+            trace(
+                # Epoch milliseconds on a date axis: a numeric array serialises
+                # far smaller than ISO date strings.
+                x=series.ts,
+                y=series.close,
+                mode="lines",
+                line=dict(color=THEME["accent"], width=1.5),
+                hovertemplate="%{x|%d/%m/%Y %H:%M}<br>%{y:,.2f}<extra></extra>",
+            )
+        ]
+    )
+    fig_price.update_layout(
+        height=320,
+        plot_bgcolor=THEME["panel"],
+        paper_bgcolor=THEME["panel"],
+        font_color=THEME["text"],
+        xaxis=dict(type="date"),
+        margin=dict(l=40, r=20, t=20, b=40),
+    )
+    return fig_price
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _price_chart(
+    symbol: str,
+    range_label: str,
+    resolution: int,
+    method: str,
+    data_version: Tuple[Tuple[str, Optional[int]], ...],
+) -> Optional[Dict]:
+    # Keyed by (asset, range, resolution); data_version changes when bars are
+    # appended, so a refreshed store never serves a stale figure.
+    series = chart_series(OHLCVStore(), symbol, range_label, resolution, method)
+    if series is None:
+        return None
+    return {
+        "spec": _price_figure(series).to_json(),
+        "points": len(series),
+        "source_points": series.source_points,
+        "timeframe": series.timeframe,
+    }
+
+
+def _price_history(asset: str) -> None:
+    store = OHLCVStore()
+    data_version = tuple((timeframe, store.last_ts(asset, timeframe)) for timeframe in store.timeframes(asset))
+    if not data_version:
+        st.info(f"Aucun historique local pour {asset} : alimentez le store OHLCV pour afficher le graphique.")
+        return
+    controls = st.columns([3, 1, 1])
+    range_label = controls[0].radio(
+        "Période", list(CHART_RANGES), index=2, horizontal=True, key="chart_range"
+    )
+    resolution = controls[1].selectbox("Points", [500, 1000, 2000], index=1, key="chart_resolution")
+    method = controls[2].selectbox(
+        "Réduction", ["lttb", "minmax"], format_func={"lttb": "LTTB", "minmax": "Min/max"}.get, key="chart_method"
+    )
+    chart = _price_chart(asset, range_label, resolution, method, data_version)
+    if chart is None:
+        st.info(f"Aucune barre pour {asset} sur la période.")
+        return
+    st.plotly_chart(pio.from_json(chart["spec"], skip_invalid=True), width="stretch")
+    st.caption(
+        f"{chart['points']:,} points affichés sur {chart['source_points']:,} barres {chart['timeframe']} · "
+        f"{len(chart['spec']) / 1024:,.0f} Ko".replace(",", " ")
+    )
+
+
+@st.cache_resource(ttl=3600)
+def _universe_returns() -> Tuple[List[str], np.ndarray]:
+    symbols = [symbol for assets in ASSET_UNIVERSE.values() for symbol in assets]
+    return returns_matrix(OHLCVStore(), symbols)
+
+
+@st.cache_resource(ttl=3600)
+def _rolling_stats() -> Tuple[List[str], Optional[RollingCovariance]]:
+    available, returns = _universe_returns()
+    if len(returns) < 2:
+        return [], None
+    return available, RollingCovariance.from_history(returns, window=min(60, len(returns)))
+
+
+def _live_risk(asset: str) -> Optional[Dict[str, float]]:
+    symbols, stats = _rolling_stats()
+    if stats is None or asset not in symbols:
+        return None
+    index = symbols.index(asset)
+    return {
+        "volatility": float(stats.volatility()[index]),
+        "correlation": average_correlation(stats.correlation(), index),
+        "diversification": diversification_ratio(stats.cov),
+    }
+
+
+@st.cache_resource(ttl=3600)
+def _fundamentals_book() -> Optional[FundamentalsBook]:
+    store = FundamentalsStore()
+    return FundamentalsBook(store) if len(store) else None
+
+
+def _reported_fundamentals(asset: str) -> Optional[Dict[str, float]]:
+    book = _fundamentals_book()
+    return book.latest(asset) if book is not None else None
+
+
+@st.cache_resource(ttl=3600)
+def _curve_book() -> CurveBook:
+    return CurveBook.load()
+
+
+def _curve_signals(asset: str) -> Optional[Dict[str, float]]:
+    return _curve_book().signals(asset)
+
+
+@st.cache_resource(ttl=3600)
+def _risk_monitor() -> Tuple[List[str], Optional[RiskMonitor]]:
+    # The rolling history is computed once per process; moving the risk
+    # budget slider only re-reads it against new limits.
+    available, returns = _universe_returns()
+    if len(returns) < RISK_MIN_DAYS:
+        return [], None
+    return available, RiskMonitor(returns, window=min(RISK_WINDOW, len(returns)), confidence=RISK_CONFIDENCE)
+
+
+def _asset_risk(asset: str, risk_budget: int) -> Optional[Dict[str, float]]:
+    symbols, monitor = _risk_monitor()
+    if monitor is None or asset not in symbols:
+        return None
+    check = monitor.asset_check(symbols.index(asset), risk_budget)
+    return {"var": check.var, "var_limit": check.var_limit, "max_drawdown": check.max_drawdown}
+
+
+def _portfolio_risk(allocations: Dict[str, AllocationResult], risk_budget: int) -> Optional[Dict[str, pd.DataFrame]]:
+    symbols, monitor = _risk_monitor()
+    if monitor is None or symbols != [symbol for assets in ASSET_UNIVERSE.values() for symbol in assets]:
+        return None
+    return {
+        label: _risk_frame(
+            [monitor.portfolio_check(result.weights, risk_budget, method) for method in RISK_METHODS.values()]
+        )
+        for label, result in allocations.items()
+    }
+
+
+def _risk_frame(checks: List[RiskCheck]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "VaR 1j": [check.var for check in checks],
+            "ES 1j": [check.es for check in checks],
+            "Limite VaR": [check.var_limit for check in checks],
+            "Utilisation": [check.utilisation for check in checks],
+            "Fenêtres hors limite": [check.var_breaches / check.windows for check in checks],
+            "Max drawdown": [check.max_drawdown for check in checks],
+            "Limite drawdown": [check.drawdown_limit for check in checks],
+        },
+        index=pd.Index(list(RISK_METHODS), name="Méthode"),
+    )
+
+
+def _universe_covariance() -> Tuple[str, np.ndarray]:
+    symbols = [symbol for assets in ASSET_UNIVERSE.values() for symbol in assets]
+    available, stats = _rolling_stats()
+    if stats is not None and available == symbols:
+        return "rolling", stats.cov * TRADING_DAYS
+    return "proxy", proxy_covariance(ASSET_UNIVERSE)
+
+
+@st.cache_resource
+def _allocation_engine() -> AllocationEngine:
+    return AllocationEngine()
+
+
+def _allocations(horizon: str, risk_budget: int, macro_weights: Tuple[float, ...]) -> Dict[str, AllocationResult]:
+    source, cov = _universe_covariance()
+    composite = score_universe(ASSET_UNIVERSE, [horizon], [risk_budget], macro_weights)["composite"].to_numpy()
+    mu = expected_returns(composite, cov)
+    engine = _allocation_engine()
+    return {
+        label: engine.allocate(cov, mu, risk_budget, horizon, method, universe_key=source)
+        for label, method in METHODS.items()
+    }
+
+
+@st.cache_resource
+def _pipeline_lock() -> threading.Lock:
+    return threading.Lock()
+
+
+@st.cache_resource
+def _analysis_pipeline() -> Pipeline:
+    # One graph per process, shared by every session. It only runs on a
+    # shared-cache miss, under _pipeline_lock(); consecutive misses still
+    # reuse whatever nodes their inputs have in common.
+    graph = scoring_pipeline(_live_risk, _reported_fundamentals, _curve_signals, _asset_risk)
+    graph.add("allocations", _allocations, ["horizon", "risk_budget", "macro_weights"])
+    graph.add("portfolio_risk", _portfolio_risk, ["allocations", "risk_budget"])
+    graph.add("macro_df", _macro_frame, ["macro_factors"])
+    graph.add("scenario_df", _scenario_frame, ["scenarios"])
+    graph.add(
+        "alloc_frames",
+        lambda results: {label: _allocation_frame(result) for label, result in results.items()},
+        ["allocations"],
+    )
+    graph.add("macro_fig", _macro_figure, ["macro_df"])
+    graph.add(
+        "alloc_figs",
+        lambda frames: {label: _allocation_figure(frame) for label, frame in frames.items()},
+        ["alloc_frames"],
+    )
+    graph.add("scenario_fig", _scenario_figure, ["scenario_df"])
+    return graph
+
+
+def _analysis_bundle(
+    asset_class: str,
+    asset: str,
+    horizon: str,
+    risk_budget: int,
+    macro_weights: Tuple[float, ...],
+) -> AnalysisBundle:
+    graph = _analysis_pipeline()
+    with _pipeline_lock():
+        graph.set(
+            asset_class=asset_class,
+            asset=asset,
+            horizon=horizon,
+            risk_budget=risk_budget,
+            macro_weights=macro_weights,
+        )
+        values = graph.run([item.name for item in fields(AnalysisBundle)])
+        for node in graph.stats():
+            if node.name in graph.recomputed:
+                PERF.add(f"pipeline.{node.name}", node.last_ms)
+    return AnalysisBundle(**values)
+
+
+def _pipeline_frame(graph: Pipeline) -> pd.DataFrame:
+    nodes = graph.stats()
+    return pd.DataFrame(
+        {
+            "Nœud": [node.name for node in nodes],
+            "Entrées": [", ".join(node.inputs) for node in nodes],
+            "État": [node.state for node in nodes],
+            "Calculs": [node.computations for node in nodes],
+            "Réutilisations": [node.reuses for node in nodes],
+            "Dernier (ms)": [round(node.last_ms, 2) for node in nodes],
+            "Total (ms)": [round(node.total_ms, 2) for node in nodes],
+        }
+    )
+
+
+def _layout_style() -> None:
+    st.set_page_config(page_title="Institutional Fundamental Command", layout="wide")
+    # Full reruns remove every element they do not re-send, so a <style>
+    # element would have to be re-sent on each of them; the injector puts
+    # the stylesheet in <head> once per session instead.
+    if not st.session_state.get("stylesheet_injected"):
+        with st.sidebar:
+            st.html(stylesheet_injector(THEME), unsafe_allow_javascript=True)
+        st.session_state["stylesheet_injected"] = True
+
+
+def _panels(*blocks: str) -> None:
+    # Consecutive panels go out as one element, hence one delta.
+    st.markdown("".join(blocks), unsafe_allow_html=True)
+
+
+def _kpis(composite_score: int, rating: str, decision: str, horizon: str) -> str:
+    return kpi_strip(
+        [
+            ("Score composite", f"{composite_score}/100"),
+            ("Notation interne", rating),
+            ("Décision", decision),
+            ("Horizon", horizon),
+        ]
+    )
+
+
+def _header_kpis(composite_score: int, rating: str, decision: str, horizon: str) -> None:
+    _panels(_kpis(composite_score, rating, decision, horizon))
+
+
+def _reference_prices(symbols: List[str]) -> Dict[str, float]:
+    store = OHLCVStore()
+    prices = {}
+    for symbol in symbols:
+        bars = store.read(symbol, "1d") if "1d" in store.timeframes(symbol) else None
+        prices[symbol] = float(bars.close[-1]) if bars is not None and len(bars) else 100.0
+    return prices
+
+
+@st.cache_resource
+def _tick_bus() -> TickBus:
+    # One bus and one feed per server: every session reads the same quotes.
+    config = _load_settings().get("live", {})
+    # Every pickable instrument, assets.json included; a symbol listed in two classes is quoted once.
+    symbols = list(dict.fromkeys(instrument.symbol for instrument in _load_instruments()))
+    time_scale = config.get("time_scale", 60.0)
+    bus = TickBus(symbols, max_refresh_hz=config.get("max_refresh_hz", 2.0), time_scale=time_scale)
+    feed = SimulatedFeed(
+        _reference_prices(symbols),
+        ticks_per_second=config.get("ticks_per_second", 500.0),
+        time_scale=time_scale,
+    )
+    bus.start(feed)
+    return bus
+
+
+def _live_header(bundle: AnalysisBundle) -> None:
+    bus = _tick_bus()
+    if "live_subscription" not in st.session_state:
+        st.session_state["live_subscription"] = Subscription(bus)
+    subscription = st.session_state["live_subscription"]
+    quote = subscription.latest().get(bundle.asset)
+    if quote is None:
+        _header_kpis(bundle.composite_score, bundle.rating, bundle.decision, bundle.horizon)
+        st.caption("Live : en attente du flux…")
+        return
+
+    market_score = _live_market_score(bundle.market_score, quote.momentum)
+    composite_score = _composite_score(
+        bundle.macro_score,
+        bundle.fundamental_score,
+        market_score,
+        bundle.portfolio_score,
+        bundle.hedge_score,
+    )
+    live = {**(bundle.live_risk or {}), "volatility": quote.volatility}
+    _panels(
+        _kpis(composite_score, _score_to_rating(composite_score), _score_to_decision(composite_score), bundle.horizon),
+        metric_grid(
+            {
+                "Dernier cours": f"{quote.price:,.2f}",
+                "Variation séance": f"{quote.change * 100:+.2f}%",
+                **_market_signals(bundle.seed, live, bundle.curve_signals),
+            }
+        ),
+    )
+    st.caption(
+        f"Live v{subscription.version} · {subscription.skipped} mise(s) à jour sautée(s) · "
+        f"{bus.max_refresh_hz:g} Hz max · {bus.stats.coalesced:,} ticks fusionnés".replace(",", " ")
+    )
+
+
+def _macro_tab(bundle: AnalysisBundle) -> None:
+    _panels(section("Analyse macroéconomique globale"))
+    st.dataframe(bundle.macro_df, width="stretch")
+    st.plotly_chart(bundle.macro_fig, width="stretch")
+    _panels(score_panel("Score macro pondéré", f"{bundle.macro_score}/100"))
+
+
+def _fundamentals_history(bundle: AnalysisBundle) -> None:
+    book = _fundamentals_book()
+    history = book.company_history(bundle.asset) if book is not None else None
+    if history is None:
+        st.caption("Ratios indicatifs : aucun état financier de cet actif dans le store fondamentaux.")
+        return
+    percent = [RATIOS[name] for name in ("roe", "operating_margin", "fcf_yield", "revenue_growth_3y")]
+    multiple = [RATIOS[name] for name in ("net_leverage", "ev_ebitda")]
+    st.caption(f"Ratios TTM au {history.index[-1]}, historique trimestriel :")
+    st.dataframe(
+        history.style.format("{:.1%}", subset=percent, na_rep="n.d.").format(
+            "{:.2f}x", subset=multiple, na_rep="n.d."
+        ),
+        width="stretch",
+    )
+
+
+def _fundamentals_tab(bundle: AnalysisBundle) -> None:
+    _panels(
+        section("Analyse fondamentale entreprises/actifs"),
+        metric_grid(bundle.fundamental_metrics),
+    )
+    _fundamentals_history(bundle)
+    _panels(
+        note(
+            "Diagnostic qualitatif",
+            items=[
+                "Moat : différenciation prix/qualité et leadership technologique.",
+                "Management : discipline capitalistique et amélioration du mix.",
+                "Risque : sensibilité aux conditions de financement globales.",
+            ],
+        ),
+    )
+
+
+def _curve_metrics(signals: Dict[str, float]) -> Dict[str, str]:
+    metrics = {
+        "Taux ajusté": f"{signals['yield']:.2f}%",
+        "Pente 2s10s": f"{signals['slope_2s10s']:+.1f} pb",
+        "Butterfly 2s5s10s": f"{signals['butterfly_2s5s10s']:+.1f} pb",
+    }
+    if "spread" in signals:
+        metrics[signals["spread_label"]] = f"{signals['spread']:+.1f} pb"
+    metrics["Erreur d'ajustement"] = f"{signals['rmse_bp']:.2f} pb"
+    return metrics
+
+
+def _markets_tab(bundle: AnalysisBundle) -> None:
+    _panels(section("Analyse des marchés financiers"), metric_grid(bundle.market_signals))
+    if bundle.asset in RATE_ASSETS and bundle.curve_signals:
+        _panels(metric_grid(_curve_metrics(bundle.curve_signals)))
+        st.caption(f"Courbe Nelson-Siegel-Svensson au {bundle.curve_signals['date']}.")
+    _price_history(bundle.asset)
+    _panels(
+        note(
+            "Lecture du régime de marché",
+            "La corrélation reste élevée, signal d'allocation prudente et d'arbitrages ciblés.",
+        )
+    )
+
+
+def _portfolio_tab(bundle: AnalysisBundle) -> None:
+    _panels(section("Gestion de portefeuille institutionnelle"), metric_grid(bundle.portfolio_metrics))
+    method = st.radio("Méthode d'allocation", list(bundle.alloc_figs), horizontal=True, key="allocation_method")
+    st.plotly_chart(bundle.alloc_figs[method], width="stretch")
+    if bundle.portfolio_risk is None:
+        st.caption("Risque du portefeuille : historique de prix insuffisant dans le store OHLCV.")
+        return
+    frame = bundle.portfolio_risk[method]
+    _panels(section(f"Risque du portefeuille alloué — budget {bundle.risk_budget}"))
+    st.dataframe(
+        frame.style.format("{:.2%}").format("{:.0%}", subset=["Utilisation", "Fenêtres hors limite"]),
+        width="stretch",
+    )
+    st.caption(
+        f"VaR/ES à {RISK_CONFIDENCE:.0%} sur fenêtres glissantes de {_risk_monitor()[1].window} jours ; "
+        "fenêtres hors limite : part de l'historique où l'allocation actuelle aurait dépassé la limite."
+    )
+
+
+def _hedge_tab(bundle: AnalysisBundle) -> None:
+    _panels(
+        section("Comportement hedge fund"),
+        metric_grid(bundle.hedge_signals),
+        note(
+            "Arbitrages et inefficiences",
+            items=[
+                "Relative value : dispersion extrême intra-secteur.",
+                "Macro : asymétrie favorable en cas de repli des taux réels.",
+                "Contrarian : consensus encore fragile sur la trajectoire de croissance.",
+            ],
+        ),
+    )
+
+
+@st.cache_resource
+def _simulation_pool() -> ProcessPoolExecutor:
+    return process_pool()
+
+
+def _simulation_frame(snapshot: SimulationSnapshot) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Rendement": bucket_labels(snapshot.edges) + [f"P{q}" for q in snapshot.percentiles],
+            "Valeur": [f"{p * 100:.2f}%" for p in snapshot.bucket_probabilities]
+            + [f"{v * 100:+.1f}%" for v in snapshot.percentiles.values()],
+        }
+    )
+
+
+def _monte_carlo_panel(bundle: AnalysisBundle) -> None:
+    spec = replace(bundle.simulation_spec, paths=FULL_PATHS)
+    placeholder = st.empty()
+    if st.button(f"Simulation Monte Carlo ({FULL_PATHS:,} trajectoires)".replace(",", " "), key="monte_carlo_run"):
+        progress = st.progress(0.0)
+        for snapshot in run_simulation(spec, _simulation_pool()):
+            progress.progress(snapshot.paths_done / snapshot.total_paths)
+            placeholder.dataframe(_simulation_frame(snapshot), width="stretch", hide_index=True)
+        progress.empty()
+        _shared_cache().put(("monte_carlo", spec), snapshot)
+
+    snapshot = _shared_cache().get(("monte_carlo", spec))
+    if snapshot is not None:
+        placeholder.dataframe(_simulation_frame(snapshot), width="stretch", hide_index=True)
+        st.caption(
+            f"Espérance {snapshot.mean * 100:+.1f}% · écart-type {snapshot.std * 100:.1f}% · "
+            f"pire {snapshot.worst * 100:+.1f}% · meilleur {snapshot.best * 100:+.1f}%"
+        )
+
+
+@st.cache_resource
+def _journal() -> DecisionJournal:
+    # One writer thread per server; sessions only enqueue.
+    config = _load_settings().get("journal", {})
+    return DecisionJournal(linger_ms=config.get("linger_ms", 5.0), max_batch=config.get("max_batch", 4096))
+
+
+def _record_decision(bundle: AnalysisBundle) -> None:
+    # Reruns on the same selection land on the same verdict: journal it once per session.
+    key = (bundle.asset, bundle.horizon, bundle.risk_budget, bundle.composite_score, bundle.decision)
+    if st.session_state.get("journal_last") == key:
+        return
+    ctx = get_script_run_ctx()
+    _journal().record(
+        DecisionEntry(
+            ts_ms=int(pd.Timestamp.now(tz="UTC").value // 1_000_000),
+            user=ctx.session_id if ctx is not None else "local",
+            asset=bundle.asset,
+            horizon=bundle.horizon,
+            risk_budget=bundle.risk_budget,
+            composite=bundle.composite_score,
+            rating=bundle.rating,
+            decision=bundle.decision,
+            macro=bundle.macro_score,
+            fundamental=bundle.fundamental_score,
+            market=bundle.market_score,
+            portfolio=bundle.portfolio_score,
+            hedge=bundle.hedge_score,
+        )
+    )
+    st.session_state["journal_last"] = key
+
+
+def _decision_history(bundle: AnalysisBundle) -> None:
+    quarter = pd.Period.now("Q")
+    changes = _journal().changes(bundle.asset, *period_bounds_ms(str(quarter)))
+    if changes.empty:
+        st.caption(f"Aucun changement de décision journalisé sur {bundle.asset} au {quarter}.")
+        return
+    st.caption(f"Changements de décision sur {bundle.asset} au {quarter} :")
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "Date": changes["ts"].dt.strftime("%Y-%m-%d %H:%M"),
+                "Horizon": changes["horizon"],
+                "Budget": changes["risk_budget"],
+                "Score": changes["composite"],
+                "Notation": changes["rating"],
+                "Avant": changes["previous_decision"],
+                "Décision": changes["decision"],
+            }
+        ).iloc[::-1],
+        width="stretch",
+        hide_index=True,
+    )
+
+
+def _decision_tab(bundle: AnalysisBundle) -> None:
+    _record_decision(bundle)
+    _panels(section("Thèse d'investissement structurée"))
+    st.plotly_chart(bundle.scenario_fig, width="stretch")
+    st.dataframe(bundle.scenario_df, width="stretch")
+    _monte_carlo_panel(bundle)
+    _panels(
+        thesis_row((block.title, block.content) for block in bundle.thesis_blocks),
+        verdict(bundle.rating, bundle.decision, THEME["accent"]),
+    )
+    _decision_history(bundle)
+
+
+@st.cache_resource
+def _score_index() -> ScoreIndex:
+    return ScoreIndex()
+
+
+@st.cache_resource(ttl=900)
+def _synced_index(macro_weights: Tuple[float, ...]) -> ScoreIndex:
+    # One sync per weights per TTL for the whole server; unchanged assets are skipped.
+    index = _score_index()
+    index.sync(_load_universe(), macro_weights=macro_weights)
+    return index
+
+
+def _screener_tab(bundle: AnalysisBundle) -> None:
+    index = _synced_index(bundle.macro_weights)
+    _panels(section(f"Screener — {bundle.horizon}, budget de risque {bundle.risk_budget}"))
+    controls = st.columns([2, 2, 1, 1, 1])
+    asset_class = controls[0].selectbox("Classe", ["Toutes"] + list(_load_universe()), key="screener_class")
+    by = controls[1].selectbox(
+        "Trier par",
+        list(SCREENER_COLUMNS),
+        format_func=SCREENER_COLUMNS.get,
+        key="screener_by",
+    )
+    ascending = controls[2].toggle("Croissant", key="screener_ascending")
+    page_size = controls[3].selectbox("Lignes", [25, 50, 100], key="screener_page_size")
+
+    filters = dict(
+        asset_class=None if asset_class == "Toutes" else asset_class,
+        horizon=bundle.horizon,
+        risk_budget=bundle.risk_budget,
+    )
+    total = index.count(**filters)
+    pages = max(1, -(-total // page_size))
+    # The key alone carries the page (seeded once, clamped when the filters shrink the list).
+    st.session_state.setdefault("screener_page", 1)
+    if st.session_state["screener_page"] > pages:
+        st.session_state["screener_page"] = pages
+    page = controls[4].number_input("Page", min_value=1, max_value=pages, key="screener_page")
+
+    rows = index.top(page_size, by=by, offset=(page - 1) * page_size, ascending=ascending, **filters)
+    table = rows[["asset_class", "asset"] + SCORE_COLUMNS + ["rating", "decision"]].rename(
+        columns={"asset_class": "Classe", "asset": "Actif", "rating": "Notation", "decision": "Décision", **SCREENER_COLUMNS}
+    )
+    table.index = np.arange((page - 1) * page_size + 1, (page - 1) * page_size + len(table) + 1)
+    event = st.dataframe(table, width="stretch", on_select="rerun", selection_mode="single-row", key="screener_table")
+    st.caption(f"Page {page} / {pages} · {total:,} lignes classées côté serveur".replace(",", " "))
+
+    selected = [position for position in event.selection.rows if position < len(rows)]
+    if selected:
+        row = rows.iloc[selected[0]]
+        _panels(
+            section(f"{row['asset']} — {row['asset_class']}"),
+            _kpis(int(row["composite"]), row["rating"], row["decision"], row["horizon"]),
+            metric_grid({SCREENER_COLUMNS[column]: f"{int(row[column])}/100" for column in SCORE_COLUMNS}),
+        )
+
+
+TAB_RENDERERS: Dict[str, Callable[[AnalysisBundle], None]] = {
+    "Vue macro": _macro_tab,
+    "Fondamentaux": _fundamentals_tab,
+    "Marchés": _markets_tab,
+    "Portefeuille": _portfolio_tab,
+    "Hedge fund": _hedge_tab,
+    "Décision": _decision_tab,
+    "Screener": _screener_tab,
+}
+
+
+TIMED_ELEMENTS = ("markdown", "plotly_chart", "dataframe")
+
+
+def _instrument_elements() -> None:
+    # st.markdown and friends are bound to the main DeltaGenerator when
+    # streamlit is imported, so wrap both the class (sidebar, columns, tabs)
+    # and the module-level aliases. Runs once per process.
+    if getattr(DeltaGenerator, "_perf_instrumented", False):
+        return
+    for name in TIMED_ELEMENTS:
+        setattr(DeltaGenerator, name, PERF.timed(f"st.{name}")(getattr(DeltaGenerator, name)))
+        setattr(st, name, PERF.timed(f"st.{name}")(getattr(st, name)))
+    DeltaGenerator._perf_instrumented = True
+
+
+@contextmanager
+def _perf_run(name: str) -> Iterator[None]:
+    with PERF.run(name) as owner:
+        ctx = get_script_run_ctx()
+        if not owner or ctx is None:
+            yield
+            return
+        enqueue = ctx.enqueue
+
+        def counting_enqueue(msg: Any) -> None:
+            if msg.WhichOneof("type") == "delta":
+                PERF.count("deltas")
+                PERF.count("delta_bytes", msg.ByteSize())
+            enqueue(msg)
+
+        ctx.enqueue = counting_enqueue
+        try:
+            yield
+        finally:
+            del ctx.enqueue
+
+
+def _measured(func: Callable[..., None]) -> Callable[..., None]:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> None:
+        with _perf_run(func.__name__):
+            func(*args, **kwargs)
+
+    return wrapper
+
+
+def _perf_frame() -> pd.DataFrame:
+    rows = sorted(PERF.summary(), key=lambda row: (row.kind, -row.p95))
+    return pd.DataFrame(
+        {
+            "Étape": [row.stage for row in rows],
+            "Unité": [row.kind for row in rows],
+            "Reruns": [row.runs for row in rows],
+            "p50": [round(row.p50, 2) for row in rows],
+            "p95": [round(row.p95, 2) for row in rows],
+            "Dernier": [round(row.last, 2) for row in rows],
+        }
+    )
+
+
+def _perf_panel() -> None:
+    # Hidden unless the page is opened with ?perf=1.
+    if st.query_params.get("perf") != "1":
+        return
+    with st.sidebar.expander("Perf"):
+        st.dataframe(_perf_frame(), width="stretch", hide_index=True)
+        if st.button("Écrire le dump", key="perf_dump"):
+            PERF.dump()
+        st.caption(f"Dump : {os.path.join(PERF_DIR, PROMETHEUS_FILE)} et {JSON_FILE}")
+
+
+@st.fragment
+def _tab_fragment(render: Callable[[AnalysisBundle], None], bundle: AnalysisBundle) -> None:
+    with _perf_run(render.__name__):
+        render(bundle)
+
+
+@st.cache_resource
+def _symbol_index() -> SymbolIndex:
+    # Built once per process from the instrument master; every keystroke of
+    # every session is a lookup in this trie.
+    return SymbolIndex(_load_instruments())
+
+
+def _instrument_label(instrument: Instrument) -> str:
+    details = " · ".join(part for part in (instrument.name, instrument.isin, instrument.asset_class) if part)
+    return f"{instrument.symbol} — {details}"
+
+
+def _asset_picker() -> None:
+    index = _symbol_index()
+    selected = st.session_state.setdefault("selected_asset", index.instruments[0])
+    query = st.text_input(
+        "Rechercher un actif",
+        key="asset_query",
+        type="search",
+        live="200ms",
+        placeholder="Ticker, nom ou ISIN",
+    )
+    limit = _load_settings().get("search", {}).get("max_results", 20)
+    with PERF.span("symbol_search"):
+        matches = index.search(query, limit=limit)
+    # Only the matches reach the browser; the current asset stays listed so
+    # the box keeps showing it while the user types.
+    if selected not in matches:
+        matches = [selected] + matches[: limit - 1]
+    choice = st.selectbox(
+        f"Actif ({len(index):,} instruments)".replace(",", " "),
+        matches,
+        index=matches.index(selected),
+        format_func=_instrument_label,
+    )
+    if choice != selected:
+        st.session_state["selected_asset"] = choice
+        st.rerun(scope="app")
+
+
+@st.cache_resource
+def _market_fetcher() -> MarketDataFetcher:
+    # One fetcher per server: refreshes from several sessions coalesce on its loop.
+    return default_fetcher()
+
+
+def _refresh_prices() -> None:
+    if st.sidebar.button("Rafraîchir les cours (1d)", key="refresh_prices"):
+        fetcher = _market_fetcher()
+        with st.sidebar, st.spinner("Téléchargement des barres manquantes…"):
+            results = fetcher.run(fetcher.refresh_store(OHLCVStore(), _load_universe()))
+        # Everything derived from the store is rebuilt on the next read.
+        for cached in (_universe_returns, _rolling_stats, _risk_monitor, _analysis_pipeline):
+            cached.clear()
+        _shared_cache().clear()
+        failed = [symbol for symbol, result in results.items() if isinstance(result, BaseException)]
+        appended = sum(result for result in results.values() if not isinstance(result, BaseException))
+        st.session_state["refresh_summary"] = (
+            f"Cours : +{appended:,} barres, {len(results) - len(failed)} symboles à jour".replace(",", " ")
+            + (f", échec pour {', '.join(failed)}" if failed else "")
+        )
+    if "refresh_summary" in st.session_state:
+        st.sidebar.caption(st.session_state["refresh_summary"])
+
+
+@st.cache_resource
+def _shared_cache() -> SharedCache:
+    # Process-wide: sessions on the same selection share one bundle, and
+    # concurrent first requests wait on a single computation.
+    config = _load_settings().get("analysis_cache", {})
+    return SharedCache(
+        max_bytes=int(config.get("max_megabytes", 256) * 1024 * 1024),
+        ttl_seconds=config.get("ttl_seconds"),
+    )
+
+
+def main() -> None:
+    _instrument_elements()
+    with _perf_run("main"):
+        _dashboard()
+    _perf_panel()
+    PERF.maybe_dump(_load_settings().get("perf", {}).get("dump_interval_seconds", 10))
+
+
+def _dashboard() -> None:
+    with PERF.span("layout_style"):
+        _layout_style()
+
+    st.sidebar.title("Allocation Intelligence")
+    with st.sidebar:
+        # Typing reruns the picker alone; picking an asset reruns the app.
+        st.fragment(_measured(_asset_picker))()
+    selected: Instrument = st.session_state["selected_asset"]
+    asset_class, asset = selected.asset_class, selected.symbol
+    horizon = st.sidebar.selectbox("Horizon", HORIZONS, index=1)
+    risk_budget = st.sidebar.slider("Budget de risque", 1, 10, 6)
+    live_mode = st.sidebar.toggle("Mode live (flux simulé)", key="live_mode")
+    _refresh_prices()
+
+    macro_weights = _macro_weights(_load_settings())
+    cache = _shared_cache()
+    with PERF.span("analysis"):
+        bundle = cache.get_or_compute(
+            ("analysis", asset_class, asset, horizon, risk_budget, macro_weights),
+            lambda: _analysis_bundle(asset_class, asset, horizon, risk_budget, macro_weights),
+        )
+    stats = cache.snapshot()
+    st.sidebar.caption(
+        f"Cache partagé : {stats['hits']} hits / {stats['misses']} misses / {stats['waits']} attentes "
+        f"({stats['entries']} entrées, {stats['bytes'] / 2**20:.1f} / {stats['max_bytes'] / 2**20:.0f} Mo)"
+    )
+    graph = _analysis_pipeline()
+    with _pipeline_lock():
+        recomputed, pipeline_frame = len(graph.recomputed), _pipeline_frame(graph)
+    with st.sidebar.expander(f"Pipeline (dernier calcul) : {recomputed} nœud(s) recalculé(s)"):
+        st.dataframe(pipeline_frame, width="stretch", hide_index=True)
+
+    header = banner(
+        "Fonds d'investissement — Tableau de commandement fondamental",
+        "Décisions structurées. Priorité à la préservation du capital.",
+    )
+    if live_mode:
+        _panels(header)
+        st.fragment(_measured(_live_header), run_every=1.0 / _tick_bus().max_refresh_hz)(bundle)
+    else:
+        with PERF.span("header_kpis"):
+            _panels(header, _kpis(bundle.composite_score, bundle.rating, bundle.decision, horizon))
+
+    tabs = st.tabs(list(TAB_RENDERERS), key="active_tab", on_change="rerun")
+    for tab, render in zip(tabs, TAB_RENDERERS.values()):
+        if tab.open:
+            with tab:
+                _tab_fragment(render, bundle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from montecarlo import process_pool
+from scoring import _DECISION_BOUNDS, _DECISION_LABELS, _RATING_BOUNDS, _RATING_LABELS
+
+TRADING_DAYS = 252
+SCORE_LEVELS = 101  # composite scores are integers in [0, 100]
+
+DECISION_POSITIONS = {
+    "Short": -1.0,
+    "Réduire": 0.0,
+    "Conserver": 0.5,
+    "Accumuler": 1.0,
+}
+
+RATING_POSITIONS = {
+    "D": -1.0,
+    "B": -0.5,
+    "BB": 0.0,
+    "BBB": 0.25,
+    "A": 0.5,
+    "AA": 0.75,
+    "AAA": 1.0,
+}
+
+
+@dataclass
+class BacktestResult:
+    assets: pd.DataFrame
+    portfolio: Dict[str, float]
+    equity: np.ndarray
+
+
+@dataclass
+class RuleStatistics:
+    """Sufficient statistics for any threshold rule on integer scores.
+
+    Row k describes holding from close k to close k + 1: `returns_by_score`
+    sums next-day returns per score held, `crossings[k, b]` counts positions
+    whose score moved across threshold value b between k - 1 and k."""
+
+    n_assets: int
+    returns_by_score: np.ndarray
+    crossings: np.ndarray
+    ups: np.ndarray
+    downs: np.ndarray
+    counts: np.ndarray
+
+    def __add__(self, other: "RuleStatistics") -> "RuleStatistics":
+        return RuleStatistics(
+            n_assets=self.n_assets + other.n_assets,
+            returns_by_score=self.returns_by_score + other.returns_by_score,
+            crossings=self.crossings + other.crossings,
+            ups=self.ups + other.ups,
+            downs=self.downs + other.downs,
+            counts=self.counts + other.counts,
+        )
+
+
+def _levels(positions: Dict[str, float], labels: Sequence[str]) -> np.ndarray:
+    levels = np.array([positions[label] for label in labels], dtype=float)
+    if np.any(np.diff(levels) < 0):
+        raise ValueError("Les positions doivent croître avec le score")
+    return levels
+
+
+def _validate(scores: np.ndarray, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    scores = np.asarray(scores)
+    prices = np.asarray(prices, dtype=float)
+    if scores.shape != prices.shape or scores.ndim != 2 or len(scores) < 2:
+        raise ValueError("Scores et prix doivent être deux matrices (jours, actifs) de même forme")
+    if not np.all(np.isfinite(prices)) or np.any(prices <= 0):
+        raise ValueError("Prix manquants ou non positifs")
+    return np.clip(np.rint(scores), 0, SCORE_LEVELS - 1).astype(np.int64), prices
+
+
+def _simple_returns(prices: np.ndarray) -> np.ndarray:
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def _drawdown(equity: np.ndarray) -> np.ndarray:
+    return np.min(equity / np.maximum.accumulate(equity, axis=0) - 1.0, axis=0)
+
+
+def _sharpe(pnl: np.ndarray) -> np.ndarray:
+    std = pnl.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, pnl.mean(axis=0) / std * np.sqrt(TRADING_DAYS), 0.0)
+
+
+def backtest(
+    scores: np.ndarray,
+    prices: np.ndarray,
+    bounds: Sequence[int] = _DECISION_BOUNDS,
+    positions: Dict[str, float] = DECISION_POSITIONS,
+    labels: Sequence[str] = _DECISION_LABELS,
+    cost_bps: float = 5.0,
+) -> BacktestResult:
+    """Trades each asset on its daily score: the position implied by the
+    score at close t is held over t → t + 1 and every change of position
+    pays `cost_bps` on the traded notional. Positions are assumed to be in
+    place before the first day. The portfolio is equal-weighted."""
+    scores, prices = _validate(scores, prices)
+    levels = _levels(positions, labels)
+    held = levels[np.searchsorted(bounds, scores, side="right")]
+    returns = _simple_returns(prices)
+
+    traded = np.zeros_like(returns)
+    traded[1:] = np.abs(np.diff(held[:-1], axis=0))
+    pnl = held[:-1] * returns - cost_bps * 1e-4 * traded
+
+    equity = np.cumprod(1.0 + pnl, axis=0)
+    active = held[:-1] != 0
+    hits = (held[:-1] * returns > 0).sum(axis=0)
+    assets = pd.DataFrame(
+        {
+            "hit_rate": np.divide(hits, active.sum(axis=0), out=np.zeros(len(hits)), where=active.any(axis=0)),
+            "turnover": traded.mean(axis=0) * TRADING_DAYS,
+            "sharpe": _sharpe(pnl),
+            "max_drawdown": _drawdown(equity),
+            "total_return": equity[-1] - 1.0,
+        }
+    )
+
+    book = pnl.mean(axis=1)
+    book_equity = np.cumprod(1.0 + book)
+    portfolio = {
+        "hit_rate": float(hits.sum() / max(active.sum(), 1)),
+        "turnover": float(traded.mean() * TRADING_DAYS),
+        "sharpe": float(_sharpe(book)),
+        "max_drawdown": float(_drawdown(book_equity)),
+        "annual_return": float(book_equity[-1] ** (TRADING_DAYS / len(book)) - 1.0),
+    }
+    return BacktestResult(assets=assets, portfolio=portfolio, equity=book_equity)
+
+
+def rule_statistics(scores: np.ndarray, prices: np.ndarray) -> RuleStatistics:
+    scores, prices = _validate(scores, prices)
+    returns = _simple_returns(prices)
+    held = scores[:-1]
+    rows = np.arange(len(held))[:, None]
+
+    returns_by_score = np.bincount(
+        (rows * SCORE_LEVELS + held).ravel(),
+        weights=returns.ravel(),
+        minlength=len(held) * SCORE_LEVELS,
+    ).reshape(len(held), SCORE_LEVELS)
+
+    # A move from a to b crosses every threshold value in (min, max]: mark
+    # +1 at min + 1 and -1 at max + 1, then a cumulative sum per row fills it.
+    width = SCORE_LEVELS + 1
+    low = np.minimum(held[1:], held[:-1]) + 1
+    high = np.maximum(held[1:], held[:-1]) + 1
+    moved = low <= high - 1
+    marks = np.bincount(
+        np.concatenate(((rows[1:] * width + low)[moved], (rows[1:] * width + high)[moved])),
+        weights=np.concatenate((np.ones(moved.sum()), -np.ones(moved.sum()))),
+        minlength=len(held) * width,
+    ).reshape(len(held), width)
+    crossings = np.cumsum(marks, axis=1)
+
+    return RuleStatistics(
+        n_assets=scores.shape[1],
+        returns_by_score=returns_by_score,
+        crossings=crossings,
+        ups=np.bincount(held[returns > 0], minlength=SCORE_LEVELS),
+        downs=np.bincount(held[returns < 0], minlength=SCORE_LEVELS),
+        counts=np.bincount(held.ravel(), minlength=SCORE_LEVELS),
+    )
+
+
+def collect_statistics(
+    scores: np.ndarray,
+    prices: np.ndarray,
+    chunk_assets: int = 128,
+    executor: Optional[Executor] = None,
+) -> RuleStatistics:
+    """rule_statistics() over asset chunks; the per-chunk results simply add."""
+    chunks = [slice(start, start + chunk_assets) for start in range(0, np.shape(scores)[1], chunk_assets)]
+    if executor is None:
+        parts = [rule_statistics(scores[:, chunk], prices[:, chunk]) for chunk in chunks]
+    else:
+        futures = [executor.submit(rule_statistics, scores[:, chunk], prices[:, chunk]) for chunk in chunks]
+        parts = [future.result() for future in futures]
+    total = parts[0]
+    for part in parts[1:]:
+        total = total + part
+    return total
+
+
+def threshold_grid(
+    low: int = 30,
+    high: int = 90,
+    step: int = 5,
+    n_bounds: int = len(_DECISION_BOUNDS),
+) -> List[Tuple[int, ...]]:
+    return list(itertools.combinations(range(low, high + 1, step), n_bounds))
+
+
+def evaluate_grid(
+    stats: RuleStatistics,
+    grid: Sequence[Sequence[int]],
+    positions: Dict[str, float] = DECISION_POSITIONS,
+    labels: Sequence[str] = _DECISION_LABELS,
+    cost_bps: float = 5.0,
+) -> pd.DataFrame:
+    """Portfolio metrics of every threshold set in `grid` from the statistics
+    alone: O(days × grid × score levels), independent of the asset count."""
+    levels = _levels(positions, labels)
+    bounds = np.asarray(grid, dtype=np.int64)
+    if bounds.ndim != 2 or bounds.shape[1] != len(levels) - 1:
+        raise ValueError(f"Chaque jeu de seuils doit contenir {len(levels) - 1} bornes")
+    table = levels[np.stack([np.searchsorted(row, np.arange(SCORE_LEVELS), side="right") for row in bounds])]
+
+    steps = np.diff(levels)
+    # Column 0 and column SCORE_LEVELS are never crossed: bounds outside the
+    # score range clip onto them and cost nothing, as they should.
+    traded = stats.crossings[:, np.clip(bounds, 0, SCORE_LEVELS)] @ steps / stats.n_assets
+    book = stats.returns_by_score @ table.T / stats.n_assets - cost_bps * 1e-4 * traded
+    equity = np.cumprod(1.0 + book, axis=0)
+
+    hits = np.where(table > 0, stats.ups, 0).sum(axis=1) + np.where(table < 0, stats.downs, 0).sum(axis=1)
+    active = np.where(table != 0, stats.counts, 0).sum(axis=1)
+    frame = pd.DataFrame(
+        {
+            "bounds": [tuple(int(bound) for bound in row) for row in bounds],
+            "sharpe": _sharpe(book),
+            "annual_return": equity[-1] ** (TRADING_DAYS / len(book)) - 1.0,
+            "max_drawdown": _drawdown(equity),
+            "hit_rate": np.divide(hits, active, out=np.zeros(len(hits)), where=active > 0),
+            "turnover": traded.mean(axis=0) * TRADING_DAYS,
+        }
+    )
+    return frame.sort_values("sharpe", ascending=False, ignore_index=True)
+
+
+def sweep_thresholds(
+    scores: np.ndarray,
+    prices: np.ndarray,
+    grid: Optional[Sequence[Sequence[int]]] = None,
+    positions: Dict[str, float] = DECISION_POSITIONS,
+    labels: Sequence[str] = _DECISION_LABELS,
+    cost_bps: float = 5.0,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    grid = threshold_grid(n_bounds=len(labels) - 1) if grid is None else grid
+    if workers == 1:
+        stats = collect_statistics(scores, prices)
+    else:
+        with process_pool(workers) as executor:
+            stats = collect_statistics(scores, prices, executor=executor)
+    return evaluate_grid(stats, grid, positions, labels, cost_bps)
+
+
+def sweep_rating_thresholds(
+    scores: np.ndarray,
+    prices: np.ndarray,
+    grid: Optional[Sequence[Sequence[int]]] = None,
+    cost_bps: float = 5.0,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    grid = threshold_grid(n_bounds=len(_RATING_BOUNDS)) if grid is None else grid
+    return sweep_thresholds(scores, prices, grid, RATING_POSITIONS, _RATING_LABELS, cost_bps, workers)
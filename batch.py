@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from scoring import (
+    ASSETS_FILE,
+    HORIZONS,
+    RISK_BUDGETS,
+    SETTINGS_FILE,
+    _load_settings,
+    _load_universe,
+    _macro_weights,
+    score_universe,
+)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="batch",
+        description="Score tout l'univers sans Streamlit ni Plotly (jobs de nuit).",
+    )
+    parser.add_argument("--out", help="Fichier de sortie (.parquet ou .csv)")
+    parser.add_argument("--assets", default=ASSETS_FILE, help="Fichier assets.json à fusionner avec l'univers")
+    parser.add_argument("--horizon", action="append", choices=HORIZONS, help="Restreint les horizons (répétable)")
+    parser.add_argument(
+        "--risk-budget",
+        action="append",
+        type=int,
+        choices=RISK_BUDGETS,
+        help="Restreint les budgets de risque (répétable)",
+    )
+    parser.add_argument("--index", help="Met aussi à jour l'index SQLite des scores (incrémental)")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Complète d'abord le store OHLCV avec les barres 1d manquantes (yfinance/ccxt)",
+    )
+    args = parser.parse_args(argv)
+    if not args.out and not args.refresh:
+        parser.error("--out est requis, sauf avec --refresh seul")
+    return args
+
+
+def refresh_prices(universe: Dict[str, List[str]], timeframe: str = "1d") -> Dict[str, Any]:
+    """Appends the bars each symbol is missing to the local OHLCV store;
+    per symbol, the number of new bars or the fetch error."""
+    # Imported lazily: the providers pull in yfinance and ccxt.
+    from fetcher import default_fetcher
+    from store import OHLCVStore
+
+    fetcher = default_fetcher()
+    try:
+        return fetcher.run(fetcher.refresh_store(OHLCVStore(), universe, timeframe))
+    finally:
+        fetcher.run(fetcher.close())
+
+
+def write_scores(scores: pd.DataFrame, path: str) -> None:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        scores.to_parquet(path, index=False)
+    elif extension == ".csv":
+        scores.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Format de sortie non supporté : {extension or path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    universe = _load_universe(args.assets)
+    if args.refresh:
+        start = time.perf_counter()
+        results = refresh_prices(universe)
+        failed = {symbol: result for symbol, result in results.items() if isinstance(result, BaseException)}
+        appended = sum(result for result in results.values() if not isinstance(result, BaseException))
+        print(
+            f"Store OHLCV : +{appended} barres pour {len(results) - len(failed)} symboles "
+            f"en {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        for symbol, error in failed.items():
+            print(f"  {symbol} : {error}")
+        if not args.out:
+            return 1 if failed and len(failed) == len(results) else 0
+
+    start = time.perf_counter()
+    horizons = args.horizon or HORIZONS
+    risk_budgets = args.risk_budget or RISK_BUDGETS
+    macro_weights = _macro_weights(_load_settings(SETTINGS_FILE))
+    scores = score_universe(universe, horizons=horizons, risk_budgets=risk_budgets, macro_weights=macro_weights)
+    write_scores(scores, args.out)
+    elapsed = time.perf_counter() - start
+    print(f"{len(scores)} lignes écrites dans {args.out} en {elapsed * 1000:.1f} ms")
+
+    if args.index:
+        # Imported lazily: sqlite3 is only needed when an index is requested.
+        from score_index import ScoreIndex
+
+        index = ScoreIndex(args.index)
+        stats = index.sync(universe, horizons, risk_budgets, macro_weights)
+        index.close()
+        print(
+            f"Index {args.index} : +{stats.inserted} / -{stats.deleted} lignes, "
+            f"{stats.rows} au total en {stats.elapsed_ms:.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from allocation import AllocationEngine  # noqa: E402
+
+
+def synthetic_covariance(n_assets: int, factors: int = 5, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0.0, 0.1, (n_assets, factors))
+    loadings[:, 0] += 0.15
+    idiosyncratic = rng.uniform(0.1, 0.5, n_assets) ** 2 * 0.5
+    return loadings @ loadings.T + np.diag(idiosyncratic)
+
+
+def _timed(engine: AllocationEngine, cov: np.ndarray, mu: np.ndarray, risk_budget: int, method: str):
+    start = time.perf_counter()
+    result = engine.allocate(cov, mu, risk_budget, "Moyen terme", method, universe_key="bench")
+    return (time.perf_counter() - start) * 1000, result.iterations
+
+
+def main(argv: List[str]) -> int:
+    sizes = [int(arg) for arg in argv] or [30, 300, 1000, 3000]
+    print(f"{'actifs':>7}  {'méthode':<14}{'froid ms':>10}{'it':>6}{'tiède ms':>10}{'it':>6}")
+    for n_assets in sizes:
+        cov = synthetic_covariance(n_assets)
+        mu = np.random.default_rng(1).normal(0.05, 0.05, n_assets)
+        for method in ("risk_parity", "mean_variance"):
+            engine = AllocationEngine()
+            cold_ms, cold_it = _timed(engine, cov, mu, 6, method)
+            # Slider move plus a small market update: re-solve from the previous weights.
+            shock = np.random.default_rng(2).normal(0.0, 0.01, (n_assets, 1))
+            warm_ms, warm_it = _timed(engine, cov + shock @ shock.T, mu * 1.02, 7, method)
+            print(f"{n_assets:>7}  {method:<14}{cold_ms:>10.1f}{cold_it:>6}{warm_ms:>10.1f}{warm_it:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import backtest, collect_statistics, evaluate_grid, threshold_grid  # noqa: E402
+from fixtures import synthetic_score_history  # noqa: E402
+from montecarlo import process_pool  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    n_assets = int(argv[0]) if argv else 1_000
+    n_days = int(argv[1]) if len(argv) > 1 else 2_520
+    data = synthetic_score_history(n_days, n_assets, seed=3)
+    scores, prices = data["scores"], data["close"]
+    grid = threshold_grid(low=30, high=90, step=2)
+    print(f"{n_assets:,} actifs × {n_days:,} jours, grille de {len(grid):,} jeux de seuils")
+
+    start = time.perf_counter()
+    result = backtest(scores, prices)
+    print(f"backtest règles actuelles           : {time.perf_counter() - start:7.2f} s  {result.portfolio}")
+
+    start = time.perf_counter()
+    for bounds in grid[:20]:
+        backtest(scores, prices, bounds=bounds)
+    naive_s = (time.perf_counter() - start) / 20 * len(grid)
+    print(f"balayage naïf (extrapolé)           : {naive_s:7.1f} s")
+
+    start = time.perf_counter()
+    stats = collect_statistics(scores, prices)
+    stats_s = time.perf_counter() - start
+    start = time.perf_counter()
+    sweep = evaluate_grid(stats, grid)
+    grid_s = time.perf_counter() - start
+    print(f"statistiques en processus           : {stats_s:7.2f} s")
+    print(f"évaluation de la grille             : {grid_s:7.2f} s")
+
+    workers = os.cpu_count() or 1
+    with process_pool(workers) as executor:
+        executor.submit(int).result()
+        start = time.perf_counter()
+        collect_statistics(scores, prices, executor=executor)
+        print(f"statistiques, pool {workers} worker(s)       : {time.perf_counter() - start:7.2f} s")
+
+    print("\nmeilleurs seuils (Sharpe) :")
+    print(sweep.head(5).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ("streamlit", "plotly")
+IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+\d+ \|(\s*)(\S+)$")
+
+
+def _commands(out_path: str) -> Dict[str, List[str]]:
+    return {
+        "import scoring": [sys.executable, "-c", "import scoring"],
+        "python -m batch": [sys.executable, "-m", "batch", "--out", out_path],
+        "python app.py --batch": [sys.executable, "app.py", "--batch", "--out", out_path],
+        "import app (UI)": [sys.executable, "-c", "import app"],
+    }
+
+
+def _imported_modules(command: List[str]) -> List[str]:
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules.append(match.group(2))
+    return modules
+
+
+def _wall_clock(command: List[str], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main(argv: List[str]) -> int:
+    repeat = int(argv[0]) if argv else 5
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "scores.csv")
+        print(f"{'commande':<24}{'médiane ms':>12}{'min ms':>10}  imports interdits")
+        for name, command in _commands(out_path).items():
+            samples = _wall_clock(command, repeat)
+            leaked = sorted(
+                {module.split(".")[0] for module in _imported_modules(command)} & set(FORBIDDEN)
+            )
+            if leaked and name != "import app (UI)":
+                failures += 1
+            print(
+                f"{name:<24}{statistics.median(samples):>12.1f}{min(samples):>10.1f}  {', '.join(leaked) or '-'}"
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import synthetic_decisions  # noqa: E402
+from journal import DecisionJournal, period_bounds_ms  # noqa: E402
+
+
+def _concurrent_writes(root: str, sessions: int, per_session: int) -> int:
+    """`sessions` threads record at once; every entry must come back intact,
+    in each session's own order. Returns the number of integrity failures."""
+    entries = synthetic_decisions(sessions * per_session, seed=1)
+    journal = DecisionJournal(root)
+    latencies = np.empty(len(entries))
+    barrier = threading.Barrier(sessions + 1)
+
+    def session(index: int) -> None:
+        barrier.wait()
+        for i in range(index, len(entries), sessions):
+            start = time.perf_counter()
+            journal.record(entries[i])
+            latencies[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(sessions)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    journal.flush()
+    elapsed = time.perf_counter() - start
+    journal.close()
+    stats = journal.stats
+    print(
+        f"{sessions} sessions × {per_session:,} décisions : {len(entries) / elapsed:,.0f} écritures durables/s, "
+        f"record() p50 {np.percentile(latencies, 50) * 1e6:.1f} µs / p99 {np.percentile(latencies, 99) * 1e6:.1f} µs"
+    )
+    print(
+        f"{stats.batches:,} lots fsyncés (moyenne {stats.records / stats.batches:,.0f}, max {stats.largest_batch:,}), "
+        f"{stats.write_ms / stats.batches:.2f} ms par lot"
+    )
+
+    # Reopen from disk: every row present, sessions' entries in their order.
+    reopened = DecisionJournal(root)
+    frame = reopened.query()
+    ts_ms = (frame["ts"] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+    failures = 0
+    if len(frame) != len(entries):
+        print(f"ÉCHEC : {len(frame):,} lignes relues pour {len(entries):,} écrites")
+        failures += 1
+    expected = {(entry.ts_ms, entry.user, entry.asset, entry.composite, entry.decision) for entry in entries}
+    found = set(
+        zip(
+            ts_ms,
+            frame["user"],
+            frame["asset"],
+            frame["composite"],
+            frame["decision"],
+        )
+    )
+    if found != expected:
+        print(f"ÉCHEC : {len(expected ^ found):,} entrées divergentes après relecture")
+        failures += 1
+    positions = {key: row for row, key in enumerate(zip(ts_ms, frame["asset"]))}
+    for index in range(sessions):
+        rows = [positions.get((entries[i].ts_ms, entries[i].asset), -1) for i in range(index, len(entries), sessions)]
+        if rows != sorted(rows):
+            print(f"ÉCHEC : ordre des écritures perdu pour la session {index}")
+            failures += 1
+            break
+    return failures
+
+
+def main(argv: List[str]) -> int:
+    sessions = int(argv[0]) if argv else 16
+    per_session = int(argv[1]) if len(argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as root:
+        failures = _concurrent_writes(os.path.join(root, "concurrent"), sessions, per_session)
+
+        journal = DecisionJournal(os.path.join(root, "history"), max_batch=65_536)
+        entries = synthetic_decisions(1_000_000, seed=2)
+        start = time.perf_counter()
+        for entry in entries:
+            journal.record(entry)
+        journal.flush()
+        print(f"historique de {len(journal):,} décisions écrit en {time.perf_counter() - start:.1f} s")
+        journal.close()
+
+        journal = DecisionJournal(os.path.join(root, "history"))
+        quarter = period_bounds_ms("2026Q3")
+        for label, query in (
+            ("requête SYM00042 (index à construire)", lambda: journal.changes("SYM00042", *quarter)),
+            ("changements SYM00042 ce trimestre", lambda: journal.changes("SYM00042", *quarter)),
+            ("toutes les décisions SYM00042", lambda: journal.query("SYM00042")),
+            ("une session ce trimestre", lambda: journal.query(start_ms=quarter[0], user="session-0007")),
+        ):
+            start = time.perf_counter()
+            rows = len(query())
+            print(f"{label:<38} {rows:>7,} lignes : {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+        full = journal.query("SYM00042")
+        brute = [
+            entry
+            for entry in entries
+            if entry.asset == "SYM00042" and quarter[0] <= entry.ts_ms <= quarter[1]
+        ]
+        previous = {}
+        expected = 0
+        for entry in brute:
+            key = (entry.horizon, entry.risk_budget)
+            if previous.get(key, entry.decision) != entry.decision:
+                expected += 1
+            previous[key] = entry.decision
+        if len(full) != sum(entry.asset == "SYM00042" for entry in entries) or len(
+            journal.changes("SYM00042", *quarter)
+        ) != expected:
+            print("ÉCHEC : les requêtes indexées divergent du parcours complet")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
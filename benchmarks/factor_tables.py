@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import (  # noqa: E402
+    _MACRO_BASE_SCORES,
+    _MACRO_LABELS,
+    _MACRO_SIGNALS,
+    _MACRO_WEIGHTS,
+    _SCENARIO_NAMES,
+    _SCENARIO_NARRATIVES,
+    _macro_factor_table,
+    _scenario_table,
+    _stable_seed,
+)
+
+
+# The list-of-dataclasses representation the tables replace.
+@dataclass
+class _MacroFactorRecord:
+    label: str
+    signal: str
+    weight: float
+    score: int
+
+
+@dataclass
+class _ScenarioRecord:
+    name: str
+    probability: float
+    narrative: str
+
+
+def _records(seeds: List[int]) -> Tuple[List[List[_MacroFactorRecord]], List[List[_ScenarioRecord]]]:
+    factors, scenarios = [], []
+    columns = list(zip(_MACRO_LABELS, _MACRO_SIGNALS, _MACRO_WEIGHTS, _MACRO_BASE_SCORES))
+    for seed in seeds:
+        adjustment = (seed % 11) - 5
+        factors.append(
+            [
+                _MacroFactorRecord(label, signal, weight, max(35, min(90, base + adjustment)))
+                for label, signal, weight, base in columns
+            ]
+        )
+        base = seed % 10
+        central, bull = 55 + (base - 5), 25 - (base - 5) // 2
+        probabilities = (float(central), float(bull), float(100 - central - bull))
+        scenarios.append(
+            [
+                _ScenarioRecord(name, probability, narrative)
+                for name, probability, narrative in zip(_SCENARIO_NAMES, probabilities, _SCENARIO_NARRATIVES)
+            ]
+        )
+    return factors, scenarios
+
+
+def _tables(seeds: List[int]) -> Tuple[Any, Any]:
+    seeds_array = np.asarray(seeds, dtype=np.int64)
+    return _macro_factor_table(seeds_array), _scenario_table(seeds_array)
+
+
+def _measure(build: Callable[[], Any]) -> Tuple[Any, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main(argv: List[str]) -> int:
+    n_assets = int(argv[0]) if argv else 10_000
+    seeds = [_stable_seed(f"asset-{i}") for i in range(n_assets)]
+    print(f"{n_assets:,} actifs × {len(_MACRO_LABELS)} facteurs + {len(_SCENARIO_NAMES)} scénarios")
+
+    (factors, scenarios), record_bytes, record_s = _measure(lambda: _records(seeds))
+    print(f"listes de dataclasses : {record_bytes / n_assets:8.0f} o/actif  {record_s * 1000:8.1f} ms")
+    (factor_table, scenario_table), table_bytes, table_s = _measure(lambda: _tables(seeds))
+    print(f"tables colonnaires    : {table_bytes / n_assets:8.1f} o/actif  {table_s * 1000:8.1f} ms")
+    print(f"réduction mémoire     : × {record_bytes / table_bytes:.0f}")
+
+    start = time.perf_counter()
+    macro = np.array([int(sum(f.weight * f.score for f in row)) for row in factors])
+    record_score_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    vectorised = factor_table.weighted_scores()
+    table_score_ms = (time.perf_counter() - start) * 1000
+    assert np.array_equal(macro, vectorised)
+    print(f"score macro           : {record_score_ms:8.1f} ms (objets)  {table_score_ms:8.2f} ms (table)")
+
+    frame = factor_table.to_frame()
+    scenario_frame = scenario_table.to_frame()
+    print(
+        "vers pandas sans copie : "
+        f"{np.shares_memory(frame.to_numpy(), factor_table.scores)} / "
+        f"{np.shares_memory(scenario_frame.to_numpy(), scenario_table.probabilities)}"
+    )
+    record = factor_table.row(0)[0]
+    print(f"vue sur une ligne     : {sys.getsizeof(record)} o, {record}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
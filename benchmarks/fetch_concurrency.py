@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import offline_fetcher  # noqa: E402
+from fixtures import synthetic_ohlcv  # noqa: E402
+from store import TIMEFRAMES, OHLCVStore  # noqa: E402
+
+START_MS = 1_420_070_400_000  # 2015-01-01
+
+
+def _universe(count: int) -> dict:
+    return {"Synthétique": [f"SYM{index:03d}" for index in range(count)]}
+
+
+def main(argv: List[str]) -> int:
+    count = int(argv[0]) if argv else 30
+    latency_s = float(argv[1]) if len(argv) > 1 else 0.05
+    universe = _universe(count)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root)
+        for symbol in universe["Synthétique"]:
+            store.append(symbol, "1d", synthetic_ohlcv(symbol, START_MS, 2_500, TIMEFRAMES["1d"]))
+
+        fetcher = offline_fetcher(store, latency_s)
+        start = time.perf_counter()
+        for symbol in universe["Synthétique"]:
+            fetcher.run(fetcher.fetch(symbol, "1d"))
+        serial_s = time.perf_counter() - start
+
+        fetcher = offline_fetcher(store, latency_s)
+        start = time.perf_counter()
+        fetcher.run(fetcher.fetch_universe(universe, "1d"))
+        concurrent_s = time.perf_counter() - start
+
+        fetcher = offline_fetcher(store, latency_s)
+
+        async def two_sessions():
+            return await asyncio.gather(fetcher.fetch_universe(universe, "1d"), fetcher.fetch_universe(universe, "1d"))
+
+        fetcher.run(two_sessions())
+        stats = fetcher.stats
+
+    print(f"{count} symboles, latence simulée {latency_s * 1000:.0f} ms/appel")
+    print(f"séquentiel  : {serial_s * 1000:8.1f} ms")
+    print(f"concurrent  : {concurrent_s * 1000:8.1f} ms")
+    print(f"2 sessions simultanées : {stats.requests} requêtes, {stats.upstream_calls} appels amont, {stats.coalesced} fusionnées")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import synthetic_statements  # noqa: E402
+from fundamentals import FundamentalsBook, FundamentalsStore, ingest  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    companies = int(argv[0]) if argv else 5_000
+    quarters = int(argv[1]) if len(argv) > 1 else 20
+    statements = synthetic_statements(companies, quarters)
+
+    with tempfile.TemporaryDirectory() as root:
+        # The same dump split across the three formats, a third of the companies each.
+        symbols = statements["symbol"].unique()
+        thirds = [symbols[i::3] for i in range(3)]
+        paths = []
+        for extension, part in zip((".csv", ".json", ".jsonl"), thirds):
+            path = os.path.join(root, f"statements{extension}")
+            rows = statements[statements["symbol"].isin(part)]
+            if extension == ".csv":
+                rows.to_csv(path, index=False)
+            else:
+                rows.to_json(path, orient="records", lines=extension == ".jsonl")
+            paths.append(path)
+
+        start = time.perf_counter()
+        ingest(paths, os.path.join(root, "store"))
+        ingest_s = time.perf_counter() - start
+        print(f"chargement {companies:,} sociétés × {quarters} trimestres (csv/json/jsonl) : {ingest_s:.2f} s")
+
+        start = time.perf_counter()
+        book = FundamentalsBook(FundamentalsStore(os.path.join(root, "store")))
+        book.history
+        ratios_ms = (time.perf_counter() - start) * 1000
+        print(f"6 ratios × {companies * quarters:,} (société, trimestre) : {ratios_ms:.1f} ms")
+
+        start = time.perf_counter()
+        for symbol in symbols:
+            book.latest(symbol)
+        lookup_us = (time.perf_counter() - start) * 1e6 / len(symbols)
+        print(f"lecture onglet Fondamentaux (latest) : {lookup_us:.1f} µs par société")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
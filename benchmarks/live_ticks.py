@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live import SimulatedFeed, Subscription, TickBus  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    n_symbols = int(argv[0]) if argv else 1_000
+    ticks_per_second = float(argv[1]) if len(argv) > 1 else 50_000
+    sessions = int(argv[2]) if len(argv) > 2 else 200
+    refresh_hz = 4.0
+    seconds = 10
+    symbols = [f"SYM{i:05d}" for i in range(n_symbols)]
+    bus = TickBus(symbols, max_refresh_hz=refresh_hz)
+    feed = SimulatedFeed({symbol: 100.0 for symbol in symbols}, ticks_per_second=ticks_per_second, batch_s=0.01)
+    subscriptions = [Subscription(bus) for _ in range(sessions)]
+    print(f"{n_symbols:,} symboles, {ticks_per_second:,.0f} ticks/s, {sessions} sessions, {refresh_hz:g} Hz")
+
+    # Replays `seconds` of feed without sleeping: 1 / batch_s batches per second,
+    # one bus step per refresh period, sessions polling at twice that rate.
+    batches_per_step = int(1 / feed.batch_s / refresh_hz)
+    publish_s = poll_s = 0.0
+    ts_ms = 0
+    for _ in range(int(seconds * refresh_hz)):
+        start = time.perf_counter()
+        for _ in range(batches_per_step):
+            ts_ms += int(feed.batch_s * 1000)
+            for tick in feed.next_ticks(ts_ms):
+                bus.publish(tick)
+        publish_s += time.perf_counter() - start
+        bus.step()
+        start = time.perf_counter()
+        for _ in range(2):
+            for subscription in subscriptions:
+                subscription.poll()
+        poll_s += time.perf_counter() - start
+
+    stats = bus.stats
+    print(f"ticks reçus                 : {stats.received:12,}")
+    print(f"ticks fusionnés             : {stats.coalesced:12,}  ({stats.coalesced / max(stats.received, 1):.0%})")
+    print(f"calculs (pas du bus)        : {stats.computations:12,}")
+    print(f"cotations publiées          : {stats.quotes:12,}")
+    print(f"calcul par pas              : {stats.compute_ms / max(stats.computations, 1):9.2f} ms")
+    print(f"publication par tick        : {publish_s / max(stats.received, 1) * 1e6:9.2f} µs")
+    print(f"lecture par session et poll : {poll_s / (sessions * 2 * seconds * refresh_hz) * 1e6:9.2f} µs")
+    print(f"calculs par session         : {stats.computations / sessions:12.2f}  (une seule fois, partagés)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from montecarlo import process_pool, run_simulation, scenario_spec  # noqa: E402
+
+
+def _run(label: str, spec, executor=None) -> None:
+    start = time.perf_counter()
+    first_ms = None
+    for snapshot in run_simulation(spec, executor):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+    total_s = time.perf_counter() - start
+    buckets = " / ".join(f"{p * 100:.2f}%" for p in snapshot.bucket_probabilities)
+    print(
+        f"{label:<22} {snapshot.paths_done:,} trajectoires : {total_s:6.2f} s "
+        f"(premier résultat {first_ms:.0f} ms) · buckets {buckets} · P50 {snapshot.percentiles[50] * 100:+.2f}%"
+    )
+
+
+def main(argv: List[str]) -> int:
+    paths = int(argv[0]) if argv else 1_000_000
+    spec = scenario_spec(drift=0.06, volatility=0.25, horizon="Moyen terme", seed=7, paths=paths)
+    _run("en processus", spec)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        with process_pool(workers) as executor:
+            executor.submit(np.zeros, 1).result()  # spawn cost is not part of the run
+            _run(f"pool {workers} worker(s)", spec, executor)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
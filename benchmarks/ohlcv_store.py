@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import synthetic_ohlcv  # noqa: E402
+from store import TIMEFRAMES, OHLCVStore  # noqa: E402
+
+YEAR_MS = 365 * 86_400_000
+START_MS = 1_420_070_400_000  # 2015-01-01
+
+
+def main(argv: List[str]) -> int:
+    years = int(argv[0]) if argv else 5
+    step = TIMEFRAMES["1m"]
+    periods = years * YEAR_MS // step
+    bars = synthetic_ohlcv("BTC", START_MS, periods, step, price=30_000.0, annual_vol=0.6)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root)
+        start = time.perf_counter()
+        chunk = 30 * 24 * 60
+        for offset in range(0, periods, chunk):
+            store.append("BTC", "1m", {column: values[offset:offset + chunk] for column, values in bars.items()})
+        write_s = time.perf_counter() - start
+        print(f"écriture {periods:,} barres 1m en {len(range(0, periods, chunk))} appends : {write_s:.2f} s")
+
+        for label, span in [("1 jour", 86_400_000), ("1 an", YEAR_MS), (f"{years} ans", years * YEAR_MS)]:
+            begin = START_MS + (years * YEAR_MS - span) // 2
+            start = time.perf_counter()
+            window = store.read("BTC", "1m", begin, begin + span)
+            mean_close = float(np.mean(window.close))
+            read_ms = (time.perf_counter() - start) * 1000
+            print(f"lecture {label:<8} {len(window):>10,} barres : {read_ms:8.1f} ms (close moyen {mean_close:,.0f})")
+
+        start = time.perf_counter()
+        frame = store.read_frame("BTC", "1m", START_MS, START_MS + YEAR_MS)
+        print(f"DataFrame 1 an {len(frame):,} lignes : {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
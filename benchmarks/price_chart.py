@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import _price_figure  # noqa: E402
+from charts import chart_series  # noqa: E402
+from fixtures import synthetic_ohlcv  # noqa: E402
+from store import TIMEFRAMES, OHLCVStore  # noqa: E402
+
+YEAR_MS = 365 * 86_400_000
+START_MS = 1_420_070_400_000  # 2015-01-01
+
+
+def main(argv: List[str]) -> int:
+    years = int(argv[0]) if argv else 10
+    step = TIMEFRAMES["1m"]
+    periods = years * YEAR_MS // step
+    bars = synthetic_ohlcv("BTC", START_MS, periods, step, price=30_000.0, annual_vol=0.6)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root)
+        store.append("BTC", "1m", bars)
+        print(f"{periods:,} barres 1m sur {years} ans")
+
+        # Full resolution, extrapolated from a 100k-point slice.
+        sample = 100_000
+        full = go.Figure(go.Scatter(x=bars["ts"][:sample], y=bars["close"][:sample], mode="lines"))
+        start = time.perf_counter()
+        full_bytes = len(full.to_json()) * periods / sample
+        full_s = (time.perf_counter() - start) * periods / sample
+        print(f"pleine résolution (extrapolé)        : {full_bytes / 1e6:8.1f} Mo  {full_s:6.2f} s de sérialisation")
+
+        for method in ("lttb", "minmax"):
+            for resolution in (1_000, 2_000):
+                start = time.perf_counter()
+                series = chart_series(store, "BTC", "Max", resolution, method)
+                spec = _price_figure(series).to_json()
+                elapsed = time.perf_counter() - start
+                trace = json.loads(spec)["data"][0]["type"]
+                print(
+                    f"{method:6s} {resolution:5,} pts ({trace:9s})      : {len(spec) / 1e3:8.1f} Ko  "
+                    f"{elapsed:6.2f} s  {len(series):,} points"
+                )
+
+        start = time.perf_counter()
+        series = chart_series(store, "BTC", "1 mois", 1_000, "lttb")
+        print(f"1 mois, lttb 1 000 pts               :            {time.perf_counter() - start:6.2f} s  "
+              f"{series.source_points:,} barres lues")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+class PayloadMeter:
+    def __init__(self) -> None:
+        self.messages = 0
+        self.deltas = 0
+        self.bytes = 0
+
+    def __call__(self, msg) -> None:
+        self.messages += 1
+        self.bytes += msg.ByteSize()
+        if msg.WhichOneof("type") == "delta":
+            self.deltas += 1
+
+    def reset(self) -> None:
+        self.messages = self.deltas = self.bytes = 0
+
+
+def _select_tab(label: str) -> Callable[[AppTest], AppTest]:
+    def step(at: AppTest) -> AppTest:
+        at.session_state["active_tab"] = label
+        return at.run()
+
+    return step
+
+
+STEPS: List[Tuple[str, Callable[[AppTest], AppTest]]] = [
+    ("premier affichage", lambda at: at.run()),
+    ("rerun identique", lambda at: at.run()),
+    ("budget de risque", lambda at: at.sidebar.slider[0].set_value(3).run()),
+    ("onglet Fondamentaux", _select_tab("Fondamentaux")),
+    ("onglet Décision", _select_tab("Décision")),
+    ("onglet Portefeuille", _select_tab("Portefeuille")),
+]
+
+
+def measure(app_path: str = APP_PATH) -> List[Dict[str, float]]:
+    meter = PayloadMeter()
+    ForwardMsgQueue.on_before_enqueue_msg(meter)
+    try:
+        at = AppTest.from_file(app_path, default_timeout=60)
+        rows = []
+        for name, step in STEPS:
+            meter.reset()
+            start = time.perf_counter()
+            at = step(at)
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"{name}: {at.exception[0].message}")
+            rows.append(
+                {
+                    "step": name,
+                    "messages": meter.messages,
+                    "deltas": meter.deltas,
+                    "bytes": meter.bytes,
+                    "ms": round(elapsed * 1000, 1),
+                }
+            )
+        return rows
+    finally:
+        ForwardMsgQueue.on_before_enqueue_msg(None)
+
+
+def main(argv: List[str]) -> int:
+    rows = measure(argv[0] if argv else APP_PATH)
+    print(f"{'étape':<22}{'messages':>10}{'deltas':>8}{'octets':>10}{'ms':>9}")
+    for row in rows:
+        print(f"{row['step']:<22}{row['messages']:>10}{row['deltas']:>8}{row['bytes']:>10}{row['ms']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from allocation import risk_parity  # noqa: E402
+from fixtures import synthetic_score_history  # noqa: E402
+from risk import RISK_METHODS, RiskMonitor  # noqa: E402
+from scoring import RISK_BUDGETS  # noqa: E402
+
+WINDOW = 250
+
+
+def _loop_ms_per_column(returns: np.ndarray, columns: int = 5) -> float:
+    # The per-window baseline: historical VaR/ES and drawdown, one window at a time.
+    count = int(np.ceil(0.01 * WINDOW))
+    start = time.perf_counter()
+    for column in range(columns):
+        series = returns[:, column]
+        for end in range(WINDOW, len(series) + 1):
+            window = np.sort(series[end - WINDOW : end])
+            window[:count].mean()
+            path = np.concatenate([[0.0], np.cumsum(series[end - WINDOW : end])])
+            (np.maximum.accumulate(path) - path).max()
+    return (time.perf_counter() - start) * 1000 / columns
+
+
+def main(argv: List[str]) -> int:
+    days = int(argv[0]) if argv else 10_000
+    instruments = int(argv[1]) if len(argv) > 1 else 1_000
+    close = synthetic_score_history(days + 1, instruments, seed=3)["close"]
+    returns = np.diff(np.log(close), axis=0)
+
+    monitor = RiskMonitor(returns, WINDOW)
+    start = time.perf_counter()
+    profile = monitor.assets
+    vectorised_s = time.perf_counter() - start
+    print(
+        f"{days:,} jours × {instruments:,} instruments, {len(profile):,} fenêtres de {WINDOW} j, "
+        f"VaR/ES {len(RISK_METHODS)} méthodes + drawdown : {vectorised_s:.2f} s"
+    )
+    loop_ms = _loop_ms_per_column(returns)
+    print(
+        f"boucle par fenêtre (historique + drawdown seulement) : {loop_ms:.0f} ms par instrument, "
+        f"soit ~{loop_ms * instruments / 1000:.0f} s pour l'univers"
+    )
+
+    cov = np.cov(returns[-WINDOW:], rowvar=False) * 252
+    weights = risk_parity(cov)[0] * 0.8
+    start = time.perf_counter()
+    monitor.portfolio_check(weights, 6)
+    print(f"portefeuille {instruments:,} lignes, premier contrôle : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Slider moves: new limits and a rescaled exposure on the same direction.
+    moves = [(budget, weights * (0.5 + budget / 20)) for budget in RISK_BUDGETS] * 10
+    start = time.perf_counter()
+    for budget, exposure in moves:
+        monitor.portfolio_check(exposure, budget)
+        monitor.asset_check(0, budget)
+    move_us = (time.perf_counter() - start) * 1e6 / len(moves)
+    print(f"déplacement du curseur (portefeuille + actif) : {move_us:.0f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
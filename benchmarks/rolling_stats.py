@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rolling import EWMCovariance, RollingCovariance  # noqa: E402
+
+WINDOW = 60
+
+
+def _per_tick_ms(engine, returns: np.ndarray) -> float:
+    start = time.perf_counter()
+    for row in returns:
+        engine.update(row)
+    return (time.perf_counter() - start) * 1000 / len(returns)
+
+
+def _full_recompute_ms(history: np.ndarray, returns: np.ndarray) -> float:
+    start = time.perf_counter()
+    for index in range(len(returns)):
+        window = np.concatenate([history[index + 1:], returns[: index + 1]])[-WINDOW:]
+        np.cov(window, rowvar=False)
+    return (time.perf_counter() - start) * 1000 / len(returns)
+
+
+def main(argv: List[str]) -> int:
+    sizes = [int(arg) for arg in argv] or [30, 300, 3000]
+    rng = np.random.default_rng(7)
+    print(f"{'actifs':>7}{'ticks':>7}{'EWMA ms/tick':>15}{'fenêtre ms/tick':>18}{'np.cov ms/tick':>17}")
+    for n_assets in sizes:
+        ticks = max(5, 20_000 // n_assets)
+        history = rng.normal(0, 0.01, (WINDOW, n_assets))
+        returns = rng.normal(0, 0.01, (ticks, n_assets))
+
+        ewma = EWMCovariance(n_assets, halflife=WINDOW / 2)
+        ewma.update_many(history)
+        rolling = RollingCovariance.from_history(history, WINDOW)
+        print(
+            f"{n_assets:>7}{ticks:>7}"
+            f"{_per_tick_ms(ewma, returns):>15.3f}"
+            f"{_per_tick_ms(rolling, returns):>18.3f}"
+            f"{_full_recompute_ms(history, returns):>17.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score_index import ScoreIndex  # noqa: E402
+from scoring import ASSET_UNIVERSE, score_universe  # noqa: E402
+
+
+def _synthetic_universe(per_class: int, offset: int = 0) -> Dict[str, List[str]]:
+    return {
+        asset_class: [f"{asset_class[:3].upper()}{i:06d}" for i in range(offset, offset + per_class)]
+        for asset_class in ASSET_UNIVERSE
+    }
+
+
+def _timed(label: str, func, repeat: int = 20) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"{label:<42} {elapsed_ms:8.2f} ms ({len(result)} lignes)")
+
+
+def main(argv: List[str]) -> int:
+    per_class = int(argv[0]) if argv else 2_000
+    universe = _synthetic_universe(per_class)
+    with tempfile.TemporaryDirectory() as root:
+        index = ScoreIndex(os.path.join(root, "scores.sqlite"))
+        stats = index.sync(universe)
+        print(f"construction : {stats.rows:,} lignes en {stats.elapsed_ms:.0f} ms")
+        grown = {asset_class: assets + [f"NEW{i}" for i in range(20)] for asset_class, assets in universe.items()}
+        stats = index.sync(grown)
+        print(f"incrémental +{stats.inserted} lignes : {stats.elapsed_ms:.0f} ms")
+        stats = index.sync(grown)
+        print(f"incrémental sans changement : {stats.elapsed_ms:.0f} ms")
+        print()
+
+        view = dict(horizon="Moyen terme", risk_budget=6)
+        _timed("top 10 Crypto (Moyen terme, budget 6)", lambda: index.top(10, asset_class="Crypto", **view))
+        _timed("top 10 hedge, tout l'univers", lambda: index.top(10, by="hedge"))
+        _timed("notés >= BBB et Conserver, 50 premiers", lambda: index.screen("BBB", "Conserver", limit=50))
+        _timed("notés >= BBB et Conserver, budget 6, tout", lambda: index.screen("BBB", "Conserver", risk_budget=6))
+        _timed("notés >= A et Accumuler", lambda: index.screen("A", "Accumuler"))
+
+        start = time.perf_counter()
+        scores = score_universe(grown)
+        selected = (scores["asset_class"] == "Crypto") & (scores["horizon"] == "Moyen terme") & (scores["risk_budget"] == 6)
+        scores[selected].nlargest(10, "composite")
+        print(f"{'recalcul complet + top 10 (référence)':<42} {(time.perf_counter() - start) * 1000:8.2f} ms")
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
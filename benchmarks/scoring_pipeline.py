@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import scoring_pipeline  # noqa: E402
+from scoring import _MACRO_WEIGHTS  # noqa: E402
+
+
+def main(argv: List[str]) -> int:
+    graph = scoring_pipeline()
+    initial = dict(
+        asset_class="Crypto",
+        asset="BTC",
+        horizon="Moyen terme",
+        risk_budget=6,
+        macro_weights=tuple(_MACRO_WEIGHTS),
+    )
+    steps = [
+        ("premier calcul", initial),
+        ("aucun changement", {}),
+        ("actif", dict(asset="ETH")),
+        ("budget de risque", dict(risk_budget=7)),
+        ("poids macro", dict(macro_weights=(0.3, 0.1, 0.15, 0.15, 0.15, 0.15))),
+    ]
+    for label, changes in steps:
+        graph.set(**changes)
+        start = time.perf_counter()
+        graph.run()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<18} {len(graph.recomputed):>2}/{len(graph.names)} nœuds recalculés en {elapsed_ms:7.2f} ms")
+
+    print()
+    for node in sorted(graph.stats(), key=lambda node: -node.total_ms)[:5]:
+        print(f"{node.name:<20} {node.computations} calculs, {node.total_ms:8.2f} ms cumulés")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.score_index import _synthetic_universe  # noqa: E402
+from score_index import ScoreIndex  # noqa: E402
+
+
+def _arrow_bytes(frame) -> int:
+    # Streamlit ships dataframes to the browser as Arrow IPC.
+    table = pa.Table.from_pandas(frame)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def main(argv: List[str]) -> int:
+    per_class = int(argv[0]) if argv else 5_000
+    page_size = 50
+    view = dict(horizon="Moyen terme", risk_budget=6)
+    with tempfile.TemporaryDirectory() as root:
+        index = ScoreIndex(os.path.join(root, "scores.sqlite"))
+        index.sync(_synthetic_universe(per_class))
+        total = index.count(**view)
+        print(f"univers : {total:,} actifs par (horizon, budget)")
+
+        for by in ("composite", "hedge"):
+            for page in (1, 10, total // page_size):
+                for ascending in (False, True):
+                    start = time.perf_counter()
+                    rows = index.top(page_size, by=by, offset=(page - 1) * page_size, ascending=ascending, **view)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    order = "croissant" if ascending else "décroissant"
+                    print(f"{by:<10} page {page:>5} {order:<12} {elapsed_ms:7.2f} ms")
+
+        page_bytes = _arrow_bytes(rows)
+        full = index.top(total, **view)
+        print(f"\ncharge utile page {page_size} lignes : {page_bytes / 1024:.1f} Ko")
+        print(f"charge utile table complète     : {_arrow_bytes(full) / 1024:.1f} Ko")
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
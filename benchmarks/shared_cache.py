@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import SharedCache, estimate_size  # noqa: E402
+from pipeline import scoring_pipeline  # noqa: E402
+from scoring import _MACRO_WEIGHTS  # noqa: E402
+
+SELECTION = ("Actions", "NVDA", "Moyen terme", 6)
+
+
+class _SessionCache:
+    """The per-session LRU the shared cache replaces: one per session, no
+    locking, no single-flight."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        value = self._entries[key] = compute()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+
+def _compute(asset_class: str, asset: str, horizon: str, risk_budget: int) -> Dict[str, Any]:
+    graph = scoring_pipeline()
+    graph.set(
+        asset_class=asset_class,
+        asset=asset,
+        horizon=horizon,
+        risk_budget=risk_budget,
+        macro_weights=_MACRO_WEIGHTS,
+    )
+    return graph.run()
+
+
+def _sessions(count: int, lookup: Callable[[int], Any]) -> float:
+    barrier = threading.Barrier(count)
+
+    def session(index: int) -> None:
+        barrier.wait()  # every session opens the page at the same moment
+        lookup(index)
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(count)]
+    start = time.process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.process_time() - start
+
+
+def main(argv: List[str]) -> int:
+    counts = [int(arg) for arg in argv] or [1, 10, 50]
+    print(f"{'sessions':>8}  {'mode':<12}{'calculs':>9}{'CPU s':>9}{'mémoire cache':>16}")
+    for count in counts:
+        calls = []
+
+        def compute() -> Dict[str, Any]:
+            calls.append(1)
+            return _compute(*SELECTION)
+
+        per_session = [_SessionCache(max_entries=32) for _ in range(count)]
+        cpu_s = _sessions(count, lambda index: per_session[index].get_or_compute(SELECTION, compute))
+        memory = sum(estimate_size(cache._entries) for cache in per_session)
+        print(f"{count:>8}  {'par session':<12}{len(calls):>9}{cpu_s:>9.2f}{memory / 1e6:>13.2f} Mo")
+
+        calls.clear()
+        shared = SharedCache(max_bytes=256 * 2**20)
+        cpu_s = _sessions(count, lambda index: shared.get_or_compute(SELECTION, compute))
+        stats = shared.snapshot()
+        print(
+            f"{count:>8}  {'partagé':<12}{len(calls):>9}{cpu_s:>9.2f}{stats['bytes'] / 1e6:>13.2f} Mo"
+            f"  ({stats['waits']} attentes)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curves import CurveBook, curve_histories, fit_nss  # noqa: E402
+from fixtures import (  # noqa: E402
+    synthetic_decisions,
+    synthetic_instruments,
+    synthetic_score_history,
+    synthetic_statements,
+    synthetic_yield_curves,
+)
+from fundamentals import FIELDS, compute_ratios  # noqa: E402
+from journal import DecisionJournal, period_bounds_ms  # noqa: E402
+from rerun_payload import APP_PATH  # noqa: E402
+from risk import RiskMonitor, rolling_risk  # noqa: E402
+from scoring import (  # noqa: E402
+    ASSET_UNIVERSE,
+    _fundamental_metrics,
+    _hedge_signals,
+    _make_macro_factors,
+    _market_signals,
+    _portfolio_metrics,
+    _scenarios,
+    _stable_seed,
+    _weighted_score,
+    score_universe,
+)
+from search import SymbolIndex  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], Any]
+    # Calls per sample, so sub-microsecond functions are timed over a batch.
+    number: int = 1
+    repeat: int = 7
+    # Overrides --tolerance for noisier cases.
+    tolerance: Optional[float] = None
+
+
+def _seeds(count: int) -> List[int]:
+    return [_stable_seed(f"bench-{i}") for i in range(count)]
+
+
+def _universe(assets: int) -> Dict[str, List[str]]:
+    per_class = max(assets // len(ASSET_UNIVERSE), 1)
+    return {
+        asset_class: [f"{asset_class[:3].upper()}{i:06d}" for i in range(per_class)] for asset_class in ASSET_UNIVERSE
+    }
+
+
+def _pure_cases() -> List[Case]:
+    seeds = _seeds(1_000)
+    factors = _make_macro_factors(seeds[0])
+    live = {"volatility": 0.42, "correlation": 0.61, "diversification": 1.37}
+    return [
+        Case("pure._stable_seed", lambda: [_stable_seed(f"Actions-AAPL-Moyen terme-{i}") for i in range(1_000)]),
+        Case("pure._make_macro_factors", lambda: [_make_macro_factors(seed) for seed in seeds]),
+        Case("pure._weighted_score", lambda: _weighted_score(factors), number=1_000),
+        Case("pure._fundamental_metrics", lambda: [_fundamental_metrics(seed) for seed in seeds]),
+        Case("pure._market_signals", lambda: [_market_signals(seed, live) for seed in seeds]),
+        Case("pure._portfolio_metrics", lambda: [_portfolio_metrics(seed, live) for seed in seeds]),
+        Case("pure._hedge_signals", lambda: [_hedge_signals(seed) for seed in seeds]),
+        Case("pure._scenarios", lambda: [_scenarios(seed) for seed in seeds]),
+    ]
+
+
+def _batch_cases() -> List[Case]:
+    cases = []
+    for assets, repeat in ((100, 7), (10_000, 3), (100_000, 1)):
+        universe = _universe(assets)
+        cases.append(
+            Case(f"batch.score_universe.{assets}", lambda universe=universe: score_universe(universe), repeat=repeat)
+        )
+    return cases
+
+
+def _search_cases() -> List[Case]:
+    instruments = synthetic_instruments(10_000)
+    index = SymbolIndex(instruments)
+    # Typing a name, a ticker and a mistyped name, one keystroke at a time.
+    typed = [instruments[0].name, instruments[1].symbol, "Atlsa Fods"]
+    keystrokes = [text[:end] for text in typed for end in range(1, len(text) + 1)]
+    return [
+        Case("search.build.10000", lambda: SymbolIndex(instruments), repeat=3),
+        Case("search.keystrokes.10000", lambda: [index.search(query) for query in keystrokes], number=10),
+    ]
+
+
+def _fundamentals_cases() -> List[Case]:
+    statements = synthetic_statements(5_000, 20)
+    columns = {field: statements[field].to_numpy().reshape(5_000, 20) for field in FIELDS}
+    return [Case("fundamentals.compute_ratios.5000x20", lambda: compute_ratios(columns), repeat=5)]
+
+
+def _curve_cases() -> List[Case]:
+    histories = curve_histories(synthetic_yield_curves(["US", "DE", "FR"], 5_200))
+    history = histories["US"]
+    book = CurveBook(histories)
+    for country in histories:
+        book.nss(country)
+    return [
+        Case("curves.fit_nss.1300", lambda: fit_nss(history.tenors, history.yields[-1_300:]), repeat=3),
+        Case("curves.slope.5200", lambda: book.slope("US", 2, 10), number=10),
+        Case("curves.spread.5200", lambda: book.spread("FR", "DE", 10), number=10),
+    ]
+
+
+def _risk_cases() -> List[Case]:
+    returns = np.diff(np.log(synthetic_score_history(2_501, 100, seed=3)["close"]), axis=0)
+    monitor = RiskMonitor(returns)
+    weights = np.full(100, 0.008)
+    monitor.portfolio_check(weights, 6)
+    return [
+        Case("risk.rolling_risk.2500x100", lambda: rolling_risk(returns), repeat=3),
+        Case(
+            "risk.budget_check",
+            lambda: [monitor.portfolio_check(weights * budget / 6, budget) for budget in range(1, 11)],
+            number=10,
+        ),
+    ]
+
+
+def _journal_cases() -> List[Case]:
+    # The directory lives as long as the cases that read it.
+    root = tempfile.TemporaryDirectory()
+    journal = DecisionJournal(root.name, max_batch=65_536)
+    for entry in synthetic_decisions(200_000, seed=2):
+        journal.record(entry)
+    journal.flush()
+    quarter = period_bounds_ms("2026Q3")
+    return [
+        Case("journal.query.200000", lambda root=root: journal.query("SYM00042"), number=10),
+        Case("journal.changes.200000", lambda root=root: journal.changes("SYM00042", *quarter), number=10),
+    ]
+
+
+class _AppSession:
+    """One AppTest kept across samples, so reruns hit the warm caches the
+    way a browser session does after its first page load."""
+
+    def __init__(self) -> None:
+        self.at: Optional[AppTest] = None
+
+    def _run(self, at: AppTest) -> AppTest:
+        at = at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at
+
+    def first_render(self) -> None:
+        self.at = self._run(AppTest.from_file(APP_PATH, default_timeout=120))
+
+    def rerun(self) -> None:
+        if self.at is None:
+            self.first_render()
+        self.at = self._run(self.at)
+
+    def risk_budget(self) -> None:
+        if self.at is None:
+            self.first_render()
+        slider = self.at.sidebar.slider[0]
+        slider.set_value(3 if slider.value != 3 else 7)
+        self.at = self._run(self.at)
+
+
+def _app_cases() -> List[Case]:
+    session = _AppSession()
+    return [
+        Case("app.main.first_render", session.first_render, repeat=5, tolerance=0.5),
+        Case("app.main.rerun", session.rerun, repeat=5, tolerance=0.5),
+        Case("app.main.risk_budget", session.risk_budget, repeat=5, tolerance=0.5),
+    ]
+
+
+def _measure(case: Case) -> Dict[str, float]:
+    case.func()  # warm-up: imports, caches, first allocation
+    samples = []
+    for _ in range(case.repeat):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            case.func()
+        samples.append((time.perf_counter() - start) * 1000 / case.number)
+    # The minimum is the least noisy estimate of the cost; the median is reported.
+    return {
+        "min_ms": round(min(samples), 6),
+        "median_ms": round(statistics.median(samples), 6),
+        "repeat": case.repeat,
+    }
+
+
+def _environment() -> Dict[str, str]:
+    return {"python": platform.python_version(), "machine": platform.machine(), "cpus": str(os.cpu_count())}
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks avec détection de régressions.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Fichier JSON des références")
+    parser.add_argument("--update", action="store_true", help="Réécrit les références avec les mesures")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Hausse relative tolérée (0.3 = +30 %%)")
+    parser.add_argument("--only", action="append", help="Motif de cas à exécuter (répétable, ex. 'pure.*')")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    cases = (
+        _pure_cases()
+        + _batch_cases()
+        + _search_cases()
+        + _fundamentals_cases()
+        + _curve_cases()
+        + _risk_cases()
+        + _journal_cases()
+        + _app_cases()
+    )
+    if args.only:
+        cases = [case for case in cases if any(fnmatch.fnmatch(case.name, pattern) for pattern in args.only)]
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    if baseline and baseline.get("environment") != _environment():
+        print(f"attention : références mesurées sur {baseline.get('environment')}, ici {_environment()}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    print(f"{'cas':<34}{'min ms':>12}{'médiane ms':>12}{'référence':>12}{'écart':>9}")
+    for case in cases:
+        result = results[case.name] = _measure(case)
+        reference = baseline.get("cases", {}).get(case.name)
+        verdict = ""
+        if reference:
+            ratio = result["min_ms"] / reference["min_ms"] - 1.0
+            tolerance = args.tolerance if case.tolerance is None else case.tolerance
+            verdict = f"{ratio:+8.0%}"
+            if ratio > tolerance:
+                regressions.append(case.name)
+                verdict += " RÉGRESSION"
+        print(
+            f"{case.name:<34}{result['min_ms']:>12.4f}{result['median_ms']:>12.4f}"
+            f"{reference['min_ms'] if reference else float('nan'):>12.4f}{verdict}"
+        )
+
+    if args.update:
+        merged = dict(baseline.get("cases", {}), **results)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"environment": _environment(), "cases": merged}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"références écrites : {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} régression(s) au-delà de la tolérance : {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
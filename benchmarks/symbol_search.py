@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import synthetic_instruments  # noqa: E402
+from search import SymbolIndex  # noqa: E402
+
+
+def _keystrokes(instruments: list, count: int, seed: int = 1) -> List[str]:
+    """Every prefix of what a user would type: tickers, ISINs, names, and
+    names with one swapped pair of letters."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in rng.integers(0, len(instruments), count):
+        instrument = instruments[i]
+        kind = rng.integers(4)
+        if kind == 0:
+            text = instrument.symbol
+        elif kind == 1:
+            text = instrument.isin[:8]
+        else:
+            text = instrument.name.split()[0] + " " + instrument.name.split()[1][:4]
+            if kind == 3 and len(text) > 4:
+                text = _transposed(text, int(rng.integers(1, len(text) - 2)))
+        queries.extend(text[:end] for end in range(1, len(text) + 1))
+    return queries
+
+
+def _transposed(text: str, at: int) -> str:
+    return text[:at] + text[at + 1] + text[at] + text[at + 2 :]
+
+
+def main(argv: List[str]) -> int:
+    n_instruments = int(argv[0]) if argv else 10_000
+    limit = 20
+    instruments = synthetic_instruments(n_instruments)
+    print(f"{n_instruments:,} instruments, {limit} résultats par frappe")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SymbolIndex(instruments)
+    build_s = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"construction de l'index       : {build_s * 1000:9.0f} ms  ({index.nodes:,} nœuds, {memory / 2**20:.1f} Mo)")
+
+    queries = _keystrokes(instruments, 2_000)
+    timings = np.empty(len(queries))
+    empty = 0
+    for position, query in enumerate(queries):
+        start = time.perf_counter()
+        found = index.search(query, limit=limit)
+        timings[position] = (time.perf_counter() - start) * 1000
+        empty += not found
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    print(f"frappes simulées              : {len(queries):9,}  ({empty} sans résultat)")
+    print(f"latence par frappe            : p50 {p50:.3f} ms · p95 {p95:.3f} ms · p99 {p99:.3f} ms · max {timings.max():.1f} ms")
+
+    # What the sidebar sends: every label of the universe before, the matches now.
+    def label(instrument):
+        return f"{instrument.symbol} — {instrument.name} · {instrument.isin} · {instrument.asset_class}"
+
+    full = len(json.dumps([label(instrument) for instrument in instruments]).encode("utf-8"))
+    matches = len(json.dumps([label(instrument) for instrument in index.search("atlas", limit=limit)]).encode("utf-8"))
+    print(f"options envoyées au navigateur : {full / 1024:9.0f} Ko → {matches / 1024:.1f} Ko")
+
+    checks = {
+        "ticker exact": index.search(instruments[42].symbol)[0] == instruments[42],
+        "ISIN complet": index.search(instruments[7].isin)[0] == instruments[7],
+        "ISIN avec faute": index.search(_transposed(instruments[3].isin, 6))[0] == instruments[3],
+    }
+    print("contrôles                     :", ", ".join(f"{name} {'ok' if ok else 'ÉCHEC'}" for name, ok in checks.items()))
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
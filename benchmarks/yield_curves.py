@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curves import CurveBook, curve_histories, fit_nss, ingest  # noqa: E402
+from fixtures import synthetic_yield_curves  # noqa: E402
+
+COUNTRIES = ["US", "DE", "FR"]
+
+
+def main(argv: List[str]) -> int:
+    years = int(argv[0]) if argv else 20
+    days = years * 260
+    quotes = synthetic_yield_curves(COUNTRIES, days)
+    histories = curve_histories(quotes)
+
+    history = histories["US"]
+    start = time.perf_counter()
+    _, rmse = fit_nss(history.tenors, history.yields)
+    cold_s = time.perf_counter() - start
+    print(f"NSS à froid (grille), {days:,} dates US : {cold_s:.2f} s, RMSE médiane {np.nanmedian(rmse) * 100:.2f} pb")
+
+    with tempfile.TemporaryDirectory() as root:
+        last = quotes["date"].max()
+        quotes[quotes["date"] < last].to_csv(os.path.join(root, "history.csv"), index=False)
+        quotes[quotes["date"] == last].to_csv(os.path.join(root, "today.csv"), index=False)
+
+        book = ingest([os.path.join(root, "history.csv")], os.path.join(root, "store"))
+        start = time.perf_counter()
+        for country in COUNTRIES:
+            book.nss(country)
+        full_s = time.perf_counter() - start
+        print(f"NSS {len(COUNTRIES)} pays × {days - 1:,} dates (ancres + départs à chaud) : {full_s:.2f} s")
+
+        book = ingest([os.path.join(root, "today.csv")], os.path.join(root, "store"))
+        start = time.perf_counter()
+        for country in COUNTRIES:
+            book.nss(country)
+        print(f"nouvelle journée, à chaud depuis la veille : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        book = CurveBook.load(os.path.join(root, "store"))
+        start = time.perf_counter()
+        for country in COUNTRIES:
+            book.nss(country)
+        print(f"relecture des paramètres en cache : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        for label, analytic in (
+            ("pente 2s10s", lambda: book.slope("US", 2, 10)),
+            ("butterfly 2s5s10s", lambda: book.butterfly("US", 2, 5, 10)),
+            ("spread OAT/Bund 10a", lambda: book.spread("FR", "DE", 10)),
+            ("pente 5s30s spline", lambda: book.slope("DE", 5, 30, method="spline")),
+        ):
+            analytic()  # the spline knots are filled on first use
+            start = time.perf_counter()
+            series = analytic()
+            print(f"{label:<22} {len(series):>6,} dates : {(time.perf_counter() - start) * 1000:6.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import dataclasses
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    waits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def estimate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """Approximate deep size in bytes: arrays and frames report their
+    buffers, Plotly figures their JSON-able dict, containers and dataclasses
+    are walked; shared objects are counted once."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "memory_usage") and hasattr(value, "index"):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):
+        return int(value.nbytes)
+    if hasattr(value, "to_plotly_json"):
+        return estimate_size(value.to_plotly_json(), seen)
+    size = sys.getsizeof(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        size += sum(estimate_size(getattr(value, item.name), seen) for item in dataclasses.fields(value))
+    elif isinstance(value, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in value)
+    return size
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedCache:
+    """Thread-safe LRU shared by every session, bounded by an estimated byte
+    budget, with an optional time-to-live.
+
+    get_or_compute() is single-flight: callers asking for a key that is
+    already being computed wait for that computation instead of repeating
+    it, and get its value (or its exception)."""
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self.bytes = 0
+        self._sizeof = sizeof
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[float, Any, int]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl_seconds is not None and self._clock() - entry[0] > self.ttl_seconds:
+            self._discard(key)
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _discard(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _insert(self, key: Hashable, value: Any, size: int) -> None:
+        if key in self._entries:
+            self._discard(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (self._clock(), value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._lookup(key)
+        return None if entry is None else entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            self._insert(key, value, size)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.stats.hits += 1
+                return entry[1]
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = _Flight()
+                self.stats.misses += 1
+            else:
+                self.stats.waits += 1
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            size = self._sizeof(flight.value)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._insert(key, flight.value, size)
+                del self._inflight[key]
+            flight.done.set()
+        return flight.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "waits": self.stats.waits,
+                "evictions": self.stats.evictions,
+                "expirations": self.stats.expirations,
+                "hit_rate": round(self.stats.hit_rate, 3),
+            }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from store import TIMEFRAMES, OHLCVStore
+
+_DAY_MS = 86_400_000
+
+CHART_RANGES: Dict[str, Optional[int]] = {
+    "1 mois": 30,
+    "6 mois": 182,
+    "1 an": 365,
+    "5 ans": 5 * 365,
+    "10 ans": 10 * 365,
+    "Max": None,
+}
+
+DOWNSAMPLERS = ("lttb", "minmax")
+
+# Past this many drawn points SVG traces get sluggish in the browser.
+WEBGL_MIN_POINTS = 1_000
+
+
+@dataclass
+class ChartSeries:
+    ts: np.ndarray
+    close: np.ndarray
+    timeframe: str
+    source_points: int
+    method: str
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket. The per-bucket work is vectorised, the loop runs
+    n_out times whatever the input length."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # n_out - 2 buckets over points 1 .. n - 2, each at least one point wide.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[: n - 1], edges[:-1]) / counts
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[anchor], y[anchor]
+        area = np.abs((ax - mean_x[bucket]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[bucket] - ay))
+        anchor = lo + int(np.argmax(area))
+        kept[bucket + 1] = anchor
+    return kept
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of n_out // 2 equal buckets, plus
+    both ends: every spike of the original series stays visible."""
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    size = -(-n // buckets)
+    padded = np.full(size * buckets, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+    filled = ~np.all(np.isnan(blocks), axis=1)
+    offsets = np.arange(buckets)[filled] * size
+    lows = np.nanargmin(blocks[filled], axis=1) + offsets
+    highs = np.nanargmax(blocks[filled], axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = "lttb") -> np.ndarray:
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmax":
+        return minmax(y, n_out)
+    raise ValueError(f"Méthode de sous-échantillonnage inconnue : {method}")
+
+
+def _span_points(store: OHLCVStore, symbol: str, timeframe: str, days: Optional[int]) -> int:
+    rows = store.rows(symbol, timeframe)
+    if days is None:
+        return rows
+    return min(rows, days * _DAY_MS // TIMEFRAMES[timeframe])
+
+
+def chart_series(
+    store: OHLCVStore,
+    symbol: str,
+    range_label: str,
+    resolution: int,
+    method: str = "lttb",
+) -> Optional[ChartSeries]:
+    """Close prices of `symbol` over `range_label`, reduced to about
+    `resolution` points (twice that for minmax).
+
+    Reads the coarsest stored timeframe that still has `resolution` bars in
+    the range, so a 10-year view does not scan 1-minute bars when daily ones
+    are enough; the store is memory-mapped, so only that range is paged in."""
+    available = store.timeframes(symbol)
+    if not available:
+        return None
+    days = CHART_RANGES[range_label]
+    dense = [tf for tf in available if _span_points(store, symbol, tf, days) >= resolution]
+    timeframe = dense[-1] if dense else available[0]
+
+    last_ts = store.last_ts(symbol, timeframe)
+    start_ms = None if days is None else last_ts - days * _DAY_MS
+    bars = store.read(symbol, timeframe, start_ms=start_ms)
+    if len(bars) == 0:
+        return None
+    kept = downsample(bars.ts, bars.close, resolution, method)
+    return ChartSeries(
+        ts=np.asarray(bars.ts[kept]),
+        close=np.asarray(bars.close[kept]),
+        timeframe=timeframe,
+        source_points=len(bars),
+        method=method,
+    )
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Hashable, List, Mapping, Optional, Tuple, Type
+
+import numpy as np
+
+from store import COLUMNS, TIMEFRAMES, OHLCVStore
+
+Bars = Dict[str, np.ndarray]
+
+DEFAULT_ROUTES = {
+    "Crypto": "ccxt",
+}
+
+YF_TICKERS = {
+    "LVMH.PA": "MC.PA",
+    "SPX": "^GSPC",
+    "NDX": "^NDX",
+    "EUROSTOXX50": "^STOXX50E",
+    "STOXX50E": "^STOXX50E",
+    "NIKKEI225": "^N225",
+    "FTSE": "^FTSE",
+    "US10Y": "^TNX",
+    "US2Y": "2YY=F",
+    "BUND10Y": "DE10YT=RR",
+    "DE10Y": "DE10YT=RR",
+    "OAT10Y": "FR10YT=RR",
+    "FR10Y": "FR10YT=RR",
+    "EUR/USD": "EURUSD=X",
+    "USD/JPY": "JPY=X",
+    "GBP/USD": "GBPUSD=X",
+    "USD/CNH": "CNH=X",
+    "USD/CHF": "CHF=X",
+    "Brent": "BZ=F",
+    "WTI": "CL=F",
+    "Gold": "GC=F",
+    "Copper": "HG=F",
+}
+
+YF_INTERVALS = {"1m": "1m", "5m": "5m", "15m": "15m", "1h": "1h", "1d": "1d"}
+
+
+class FetchError(Exception):
+    pass
+
+
+class TransientFetchError(FetchError):
+    pass
+
+
+def _bars_from_rows(rows: np.ndarray) -> Bars:
+    rows = np.asarray(rows, dtype=float).reshape(-1, len(COLUMNS))
+    return {
+        column: np.ascontiguousarray(rows[:, index], dtype=dtype)
+        for index, (column, dtype) in enumerate(COLUMNS.items())
+    }
+
+
+class RateLimiter:
+    """Async token bucket: `rate` requests per second with bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class MarketDataProvider(ABC):
+    name = "base"
+    rate_limit = 5.0
+    burst = 1
+    max_concurrency = 4
+    retryable: Tuple[Type[BaseException], ...] = (OSError, asyncio.TimeoutError, TransientFetchError)
+
+    @abstractmethod
+    async def fetch_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Bars:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class CcxtProvider(MarketDataProvider):
+    name = "ccxt"
+    rate_limit = 10.0
+    burst = 5
+    max_concurrency = 8
+
+    def __init__(self, exchange_id: str = "binance", quote: str = "USDT") -> None:
+        import ccxt.async_support as ccxt_async
+
+        # One exchange instance means one aiohttp session reused for every call;
+        # throttling is done by the fetcher, so ccxt's own limiter is disabled.
+        self._exchange = getattr(ccxt_async, exchange_id)({"enableRateLimit": False})
+        self.quote = quote
+        self.retryable = MarketDataProvider.retryable + (ccxt_async.NetworkError,)
+
+    async def fetch_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Bars:
+        market = symbol if "/" in symbol else f"{symbol}/{self.quote}"
+        if since_ms is None and limit is not None:
+            # The latest `limit` bars: one call.
+            return _bars_from_rows(np.asarray(await self._exchange.fetch_ohlcv(market, timeframe, limit=limit)))
+        # One call returns a page (~500 bars on most exchanges): walk `since`
+        # forward until the exchange has nothing newer. Without a start the
+        # exchange serves its latest page, so a full history starts at the epoch.
+        since = 0 if since_ms is None else since_ms
+        pages: List[np.ndarray] = []
+        fetched = 0
+        while limit is None or fetched < limit:
+            if pages:
+                await asyncio.sleep(1 / self.rate_limit)
+            rows = np.asarray(await self._exchange.fetch_ohlcv(market, timeframe, since=since, limit=limit))
+            if not len(rows) or rows[-1][0] < since:
+                break
+            pages.append(rows)
+            fetched += len(rows)
+            since = int(rows[-1][0]) + 1
+        rows = np.concatenate(pages) if pages else np.empty((0, len(COLUMNS)))
+        return _bars_from_rows(rows[:limit])
+
+    async def close(self) -> None:
+        await self._exchange.close()
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+    rate_limit = 4.0
+    burst = 4
+    max_concurrency = 4
+
+    def __init__(self) -> None:
+        import yfinance as yf
+
+        self._yf = yf
+
+    def _history(self, ticker: str, interval: str, since_ms: Optional[int]) -> Bars:
+        options: Dict[str, Any] = {"interval": interval, "auto_adjust": False}
+        if since_ms is None:
+            options["period"] = "max"
+        else:
+            options["start"] = np.datetime64(since_ms, "ms").astype("datetime64[s]").item()
+        frame = self._yf.Ticker(ticker).history(**options)
+        return {
+            "ts": frame.index.as_unit("ms").asi8.astype(COLUMNS["ts"]),
+            "open": frame["Open"].to_numpy(dtype=float),
+            "high": frame["High"].to_numpy(dtype=float),
+            "low": frame["Low"].to_numpy(dtype=float),
+            "close": frame["Close"].to_numpy(dtype=float),
+            "volume": frame["Volume"].to_numpy(dtype=float),
+        }
+
+    async def fetch_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Bars:
+        if timeframe not in YF_INTERVALS:
+            raise FetchError(f"Timeframe non supporté par yfinance : {timeframe}")
+        # yfinance is blocking; it keeps its own shared HTTP session across threads.
+        bars = await asyncio.to_thread(self._history, YF_TICKERS.get(symbol, symbol), YF_INTERVALS[timeframe], since_ms)
+        if limit is not None:
+            bars = {column: values[:limit] for column, values in bars.items()}
+        return bars
+
+
+class FileProvider(MarketDataProvider):
+    """Offline stand-in serving bars from a local OHLCVStore."""
+
+    name = "file"
+    rate_limit = 1000.0
+    burst = 100
+    max_concurrency = 64
+
+    def __init__(self, store: OHLCVStore, latency_s: float = 0.0) -> None:
+        self.store = store
+        self.latency_s = latency_s
+
+    async def fetch_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Bars:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if timeframe not in self.store.timeframes(symbol):
+            raise FetchError(f"Aucune donnée locale pour {symbol} {timeframe}")
+        bars = self.store.read(symbol, timeframe, since_ms)
+        stop = len(bars) if limit is None else limit
+        return {column: np.array(getattr(bars, column)[:stop]) for column in COLUMNS}
+
+
+@dataclass
+class FetchStats:
+    requests: int = 0
+    upstream_calls: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+class MarketDataFetcher:
+    def __init__(
+        self,
+        providers: Mapping[str, MarketDataProvider],
+        routes: Optional[Mapping[str, str]] = None,
+        default_provider: Optional[str] = None,
+        max_retries: int = 3,
+        backoff_s: float = 0.25,
+        max_backoff_s: float = 4.0,
+        timeout_s: float = 15.0,
+    ) -> None:
+        if not providers:
+            raise ValueError("Au moins un fournisseur est requis")
+        self.providers = dict(providers)
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+        self.default_provider = default_provider or next(iter(self.providers))
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.timeout_s = timeout_s
+        self.stats = FetchStats()
+        self._inflight: Dict[Hashable, "asyncio.Future[Bars]"] = {}
+        self._throttles: Dict[str, Tuple[asyncio.Semaphore, RateLimiter]] = {}
+        self._throttle_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def provider_for(self, asset_class: Optional[str]) -> MarketDataProvider:
+        name = self.routes.get(asset_class, self.default_provider)
+        return self.providers.get(name, self.providers[self.default_provider])
+
+    def _throttle(self, provider: MarketDataProvider) -> Tuple[asyncio.Semaphore, RateLimiter]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._throttle_loop:
+            self._throttles.clear()
+            self._throttle_loop = loop
+        if provider.name not in self._throttles:
+            self._throttles[provider.name] = (
+                asyncio.Semaphore(provider.max_concurrency),
+                RateLimiter(provider.rate_limit, provider.burst),
+            )
+        return self._throttles[provider.name]
+
+    async def _fetch_upstream(
+        self,
+        provider: MarketDataProvider,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int],
+        limit: Optional[int],
+    ) -> Bars:
+        semaphore, limiter = self._throttle(provider)
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                await limiter.acquire()
+                self.stats.upstream_calls += 1
+                try:
+                    return await asyncio.wait_for(
+                        provider.fetch_bars(symbol, timeframe, since_ms, limit), self.timeout_s
+                    )
+                except provider.retryable as exc:
+                    error = exc
+            if attempt == self.max_retries:
+                break
+            self.stats.retries += 1
+            delay = min(self.max_backoff_s, self.backoff_s * 2**attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        self.stats.failures += 1
+        raise FetchError(f"{provider.name}: échec pour {symbol} après {self.max_retries + 1} tentatives") from error
+
+    async def fetch(
+        self,
+        symbol: str,
+        timeframe: str = "1d",
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+        asset_class: Optional[str] = None,
+    ) -> Bars:
+        provider = self.provider_for(asset_class)
+        key = (provider.name, symbol, timeframe, since_ms, limit)
+        self.stats.requests += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_upstream(provider, symbol, timeframe, since_ms, limit))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        # Shielded so one caller's cancellation does not cancel the shared call.
+        return await asyncio.shield(task)
+
+    async def fetch_universe(
+        self,
+        universe: Mapping[str, List[str]],
+        timeframe: str = "1d",
+        since_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        requests = [(asset_class, symbol) for asset_class, symbols in universe.items() for symbol in symbols]
+        results = await asyncio.gather(
+            *(self.fetch(symbol, timeframe, since_ms, limit, asset_class) for asset_class, symbol in requests),
+            return_exceptions=True,
+        )
+        return {symbol: result for (_, symbol), result in zip(requests, results)}
+
+    async def refresh_store(
+        self,
+        store: OHLCVStore,
+        universe: Mapping[str, List[str]],
+        timeframe: str = "1d",
+        now_ms: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        # Only bars whose period has closed are stored: the next refresh starts
+        # after the last stored bar, so a provisional close would never be corrected.
+        closed_before = (int(time.time() * 1000) if now_ms is None else now_ms) - TIMEFRAMES[timeframe]
+
+        async def refresh(asset_class: str, symbol: str) -> int:
+            last_ts = store.last_ts(symbol, timeframe)
+            since_ms = None if last_ts is None else last_ts + 1
+            bars = await self.fetch(symbol, timeframe, since_ms, asset_class=asset_class)
+            closed = int(np.searchsorted(bars["ts"], closed_before, side="right"))
+            if not closed:
+                return 0
+            return store.append(symbol, timeframe, {column: values[:closed] for column, values in bars.items()})
+
+        # A symbol listed under several classes is appended once, routed by its first class.
+        first_class = {}
+        for asset_class, symbols in universe.items():
+            for symbol in symbols:
+                first_class.setdefault(symbol, asset_class)
+        requests = [(asset_class, symbol) for symbol, asset_class in first_class.items()]
+        results = await asyncio.gather(*(refresh(*request) for request in requests), return_exceptions=True)
+        return {symbol: result for (_, symbol), result in zip(requests, results)}
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run `coro` on the fetcher's shared background loop and wait for it.
+
+        Every Streamlit session thread goes through this loop, so identical
+        concurrent requests from different sessions coalesce into one call."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="market-data", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def close(self) -> None:
+        for provider in self.providers.values():
+            await provider.close()
+
+
+def default_fetcher() -> MarketDataFetcher:
+    return MarketDataFetcher(
+        {"yfinance": YFinanceProvider(), "ccxt": CcxtProvider()},
+        routes=DEFAULT_ROUTES,
+        default_provider="yfinance",
+    )
+
+
+def offline_fetcher(store: OHLCVStore, latency_s: float = 0.0) -> MarketDataFetcher:
+    return MarketDataFetcher({"file": FileProvider(store, latency_s)}, routes={}, default_provider="file")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from journal import DecisionEntry
+from scoring import HORIZONS, Instrument, _score_to_decision, _score_to_rating, _stable_seed
+
+_ANNUAL_MS = 365 * 24 * 3600 * 1000
+
+_NAME_STEMS = [
+    "Atlas", "Boréal", "Cobalt", "Delta", "Émeraude", "Fjord", "Granit", "Helios", "Iris", "Jade",
+    "Kappa", "Lumen", "Meridian", "Nordic", "Orion", "Polaris", "Quartz", "Rivage", "Sierra", "Titan",
+    "Ulysse", "Vertex", "Wesley", "Xenon", "Yukon", "Zenith",
+]
+_NAME_SECTORS = [
+    "Energy", "Capital", "Pharma", "Logistics", "Semiconductors", "Foods", "Telecom", "Mining",
+    "Insurance", "Retail", "Software", "Utilities", "Chemicals", "Aerospace", "Banque", "Immobilier",
+]
+_NAME_SUFFIXES = ["Inc.", "Corp.", "SA", "AG", "plc", "NV", "SE", "Holdings"]
+_LISTINGS = [("US", ""), ("FR", ".PA"), ("DE", ".DE"), ("GB", ".L"), ("CH", ".SW"), ("NL", ".AS"), ("JP", ".T")]
+_ALNUM = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def synthetic_ohlcv(
+    symbol: str,
+    start_ms: int,
+    periods: int,
+    step_ms: int,
+    price: float = 100.0,
+    annual_vol: float = 0.25,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(_stable_seed(symbol) if seed is None else seed)
+    sigma = annual_vol * np.sqrt(step_ms / _ANNUAL_MS)
+    log_returns = rng.normal(-0.5 * sigma * sigma, sigma, periods)
+    close = price * np.exp(np.cumsum(log_returns))
+    open_ = np.empty(periods)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.normal(0.0, sigma, (2, periods)))
+    return {
+        "ts": start_ms + step_ms * np.arange(periods, dtype=np.int64),
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + wick[0]),
+        "low": np.minimum(open_, close) * (1 - wick[1]),
+        "close": close,
+        "volume": rng.lognormal(10.0, 1.0, periods),
+    }
+
+
+def synthetic_score_history(
+    n_days: int,
+    n_assets: int,
+    annual_vol: float = 0.25,
+    skill: float = 0.03,
+    persistence: float = 0.97,
+    correlation: float = 0.3,
+    seed: int = 0,
+) -> Dict[str, np.ndarray]:
+    """Daily close prices and integer composite scores for backtests.
+
+    Returns share one market factor (pairwise `correlation`). Scores follow
+    a persistent AR(1) signal that also drives the next day's drift with
+    strength `skill`, so the rules have something to find."""
+    rng = np.random.default_rng(seed)
+    sigma = annual_vol / np.sqrt(252)
+    signal = np.empty((n_days, n_assets))
+    signal[0] = rng.normal(size=n_assets)
+    shocks = rng.normal(size=(n_days, n_assets)) * np.sqrt(1 - persistence**2)
+    for day in range(1, n_days):
+        signal[day] = persistence * signal[day - 1] + shocks[day]
+    market = rng.normal(size=(n_days, 1))
+    noise = np.sqrt(correlation) * market + np.sqrt(1 - correlation) * rng.normal(size=(n_days, n_assets))
+    log_returns = -0.5 * sigma * sigma + sigma * noise
+    log_returns[1:] += skill * sigma * signal[:-1]
+    return {
+        "close": 100.0 * np.exp(np.cumsum(log_returns, axis=0)),
+        "scores": np.clip(np.rint(60 + 12 * signal), 0, 100).astype(np.int64),
+    }
+
+
+def synthetic_statements(companies: int, quarters: int, first_period: str = "2020Q1", seed: int = 0) -> pd.DataFrame:
+    """Quarterly statements in the long layout of fundamentals dumps: a row
+    per (symbol, period). Revenue compounds with a per-company growth rate;
+    the other fields follow from per-company margins, with noise."""
+    rng = np.random.default_rng(seed)
+    growth = rng.normal(0.015, 0.02, (companies, 1))
+    revenue = rng.lognormal(6.0, 1.2, (companies, 1)) * np.exp(
+        np.cumsum(rng.normal(growth, 0.04, (companies, quarters)), axis=1)
+    )
+    margin = rng.uniform(0.02, 0.35, (companies, 1)) + rng.normal(0, 0.02, (companies, quarters))
+    operating_income = revenue * margin
+    ebitda = operating_income + revenue * rng.uniform(0.02, 0.08, (companies, 1))
+    net_income = operating_income * rng.uniform(0.55, 0.8, (companies, 1))
+    market_cap = 4 * revenue * rng.lognormal(0.5, 0.5, (companies, 1))
+    periods = pd.period_range(first_period, periods=quarters, freq="Q").astype(str)
+    columns = {
+        "revenue": revenue,
+        "operating_income": operating_income,
+        "net_income": net_income,
+        "ebitda": ebitda,
+        "operating_cash_flow": ebitda * rng.uniform(0.6, 0.95, (companies, 1)),
+        "capex": revenue * rng.uniform(0.02, 0.12, (companies, 1)),
+        "equity": revenue * rng.uniform(2.0, 8.0, (companies, 1)),
+        "net_debt": ebitda * rng.uniform(-0.5, 3.0, (companies, 1)),
+        "market_cap": market_cap,
+    }
+    frame = pd.DataFrame({name: values.ravel() for name, values in columns.items()})
+    frame.insert(0, "period", np.tile(periods, companies))
+    frame.insert(0, "symbol", np.repeat([f"EQ{i:05d}" for i in range(companies)], quarters))
+    return frame
+
+
+def synthetic_yield_curves(
+    countries: List[str],
+    days: int,
+    tenors: Tuple[float, ...] = (0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30),
+    start: str = "2005-01-03",
+    missing: float = 0.02,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Daily government yields (percent) in the long layout of rates dumps:
+    a row per (date, country, tenor). Each country follows its own NSS
+    factors as persistent random walks around a shared level, plus 1.5 bp
+    quote noise; a fraction `missing` of quotes is dropped."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days)
+    tenors_ = np.asarray(tenors, dtype=float)
+    level = 3.0 + np.cumsum(rng.normal(0, 0.04, days))
+    frames = []
+    for offset, country in enumerate(countries):
+        walk = np.cumsum(rng.normal(0, [0.003, 0.01, 0.015, 0.015], (days, 4)), axis=0)
+        betas = np.array([0.4 * offset, -1.5, -0.5, 1.0]) + walk
+        betas[:, 0] += level
+        tau1 = 1.5 + 0.5 * np.sin(np.arange(days) / 500 + offset)
+        tau2 = 8.0 + 2.0 * np.cos(np.arange(days) / 700 + offset)
+        x1 = tenors_ / tau1[:, None]
+        x2 = tenors_ / tau2[:, None]
+        slope = (1 - np.exp(-x1)) / x1
+        curves = (
+            betas[:, [0]]
+            + betas[:, [1]] * slope
+            + betas[:, [2]] * (slope - np.exp(-x1))
+            + betas[:, [3]] * ((1 - np.exp(-x2)) / x2 - np.exp(-x2))
+        )
+        curves += rng.normal(0, 0.015, curves.shape)
+        curves[rng.random(curves.shape) < missing] = np.nan
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": np.repeat(dates.strftime("%Y-%m-%d"), len(tenors_)),
+                    "country": country,
+                    "tenor": np.tile(tenors_, days),
+                    "yield": curves.ravel(),
+                }
+            ).dropna()
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _isin_check_digit(body: str) -> str:
+    # Letters expand to two digits (A=10 … Z=35), then Luhn over the digit string.
+    digits = "".join(str(int(char, 36)) for char in body)
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = int(digit) * (2 if position % 2 == 0 else 1)
+        total += value // 10 + value % 10
+    return str((10 - total % 10) % 10)
+
+
+def synthetic_instruments(count: int, seed: int = 0) -> List[Instrument]:
+    """An instrument master of `count` equities with unique tickers, varied
+    names and valid ISINs, for search and loading benchmarks."""
+    rng = np.random.default_rng(seed)
+    instruments = []
+    tickers = set()
+    while len(instruments) < count:
+        country, suffix = _LISTINGS[rng.integers(len(_LISTINGS))]
+        letters = "".join(chr(ord("A") + int(i)) for i in rng.integers(0, 26, rng.integers(2, 6)))
+        ticker = letters + suffix
+        if ticker in tickers:
+            continue
+        tickers.add(ticker)
+        name = " ".join(
+            (
+                _NAME_STEMS[rng.integers(len(_NAME_STEMS))],
+                _NAME_SECTORS[rng.integers(len(_NAME_SECTORS))],
+                _NAME_SUFFIXES[rng.integers(len(_NAME_SUFFIXES))],
+            )
+        )
+        body = country + "".join(_ALNUM[int(i)] for i in rng.integers(0, 36, 9))
+        instruments.append(Instrument(ticker, "Actions", name, body + _isin_check_digit(body)))
+    return instruments
+
+
+def synthetic_decisions(
+    count: int, assets: int = 200, users: int = 50, start: str = "2026-07-01", seed: int = 0
+) -> List[DecisionEntry]:
+    """`count` journal entries a few seconds apart, as sessions revisiting
+    `assets` assets would leave them: composites drift per asset so
+    decisions change now and then."""
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp(start, tz="UTC").value // 1_000_000 + np.cumsum(rng.integers(1, 5_000, count))
+    asset = rng.integers(0, assets, count)
+    user = rng.integers(0, users, count)
+    drift = np.cumsum(rng.normal(0, 2.0, (count // assets + 2, assets)), axis=0)
+    composite = np.clip(60 + drift[np.arange(count) // assets, asset], 0, 100).astype(int)
+    subscores = np.clip(composite[:, None] + rng.normal(0, 8, (count, 5)), 0, 100).astype(int)
+    return [
+        DecisionEntry(
+            int(ts[i]),
+            f"session-{user[i]:04d}",
+            f"SYM{asset[i]:05d}",
+            HORIZONS[i % len(HORIZONS)],
+            int(i % 10 + 1),
+            int(composite[i]),
+            _score_to_rating(int(composite[i])),
+            _score_to_decision(int(composite[i])),
+            *(int(value) for value in subscores[i]),
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from scoring import BASE_DIR
+
+FUNDAMENTALS_DIR = os.path.join(BASE_DIR, "data", "fundamentals")
+
+# Quarterly flows, summed over the trailing four quarters (TTM). Capex is an
+# outflow reported as a positive amount.
+FLOW_FIELDS = ("revenue", "operating_income", "net_income", "ebitda", "operating_cash_flow", "capex")
+# Balances and market data, taken at the end of the quarter.
+STOCK_FIELDS = ("equity", "net_debt", "market_cap")
+FIELDS = FLOW_FIELDS + STOCK_FIELDS
+
+RATIOS = {
+    "roe": "ROE",
+    "operating_margin": "Marge opérationnelle",
+    "fcf_yield": "FCF yield",
+    "net_leverage": "Levier net",
+    "revenue_growth_3y": "Croissance CA 3a",
+    "ev_ebitda": "EV/EBITDA",
+}
+
+_META_FILE = "meta.json"
+_READERS = {
+    ".csv": lambda path: pd.read_csv(path),
+    ".json": lambda path: pd.read_json(path, orient="records"),
+    ".jsonl": lambda path: pd.read_json(path, orient="records", lines=True),
+    ".parquet": lambda path: pd.read_parquet(path),
+}
+
+
+def read_statements(path: str) -> pd.DataFrame:
+    """One dump as a long frame: a row per (symbol, period) with the
+    statement fields it reports; missing fields stay NaN."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _READERS:
+        raise ValueError(f"Format de fichier non supporté : {extension or path}")
+    frame = _READERS[extension](path)
+    missing = {"symbol", "period"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"{path} : colonnes manquantes {sorted(missing)}")
+    return frame.reindex(columns=["symbol", "period", *FIELDS])
+
+
+def _quarter_ordinals(periods: pd.Series) -> np.ndarray:
+    # "2024Q3" and quarter-end dates both land on the same quarter. Dumps
+    # repeat a few dozen labels over many rows, so only distinct ones are parsed.
+    codes, labels = pd.factorize(periods.astype(str))
+    return pd.PeriodIndex(labels, freq="Q").asi8[codes]
+
+
+class FundamentalsStore:
+    """Quarterly statements as dense companies × quarters float64 matrices,
+    one .npy file per field, read back through np.memmap.
+
+    Quarters are contiguous from the first one ingested, so a column is a
+    quarter and trailing windows are plain slices. Each ingest writes a new
+    generation of files and meta.json names the one to read, so a reader
+    never mixes shapes from two ingests."""
+
+    def __init__(self, root: str = FUNDAMENTALS_DIR) -> None:
+        self.root = root
+        meta = self._read_meta()
+        self.symbols: List[str] = meta["symbols"]
+        self.first_quarter: Optional[int] = meta["first_quarter"]
+        self.version: int = meta["version"]
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.columns: Dict[str, np.ndarray] = {}
+        if self.symbols:
+            # Stores written before versioned files keep one unversioned file per field.
+            files = meta.get("files") or {field: f"{field}.npy" for field in FIELDS}
+            self.columns = {field: np.load(os.path.join(self.root, files[field]), mmap_mode="r") for field in FIELDS}
+
+    def _read_meta(self) -> Dict:
+        path = os.path.join(self.root, _META_FILE)
+        if not os.path.exists(path):
+            return {"symbols": [], "first_quarter": None, "version": 0}
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def quarters(self) -> int:
+        return self.columns["revenue"].shape[1] if self.columns else 0
+
+    @property
+    def periods(self) -> List[str]:
+        if self.first_quarter is None:
+            return []
+        return [str(pd.Period(ordinal=self.first_quarter + q, freq="Q")) for q in range(self.quarters)]
+
+    def index(self, symbol: str) -> Optional[int]:
+        return self._index.get(symbol)
+
+    def ingest(self, frames: Iterable[pd.DataFrame]) -> int:
+        """Merge statement rows into the store; a (symbol, period) already
+        present is overwritten field by field (restatements). Returns the
+        number of rows read."""
+        rows = pd.concat(list(frames), ignore_index=True)
+        if rows.empty:
+            return 0
+        quarters = _quarter_ordinals(rows["period"])
+        codes, new_symbols = pd.factorize(rows["symbol"].astype(str))
+
+        symbols = self.symbols + [symbol for symbol in new_symbols if symbol not in self._index]
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        first = int(quarters.min()) if self.first_quarter is None else min(self.first_quarter, int(quarters.min()))
+        last = int(quarters.max()) if self.first_quarter is None else max(
+            self.first_quarter + self.quarters - 1, int(quarters.max())
+        )
+        row_index = np.array([index[symbol] for symbol in new_symbols], dtype=np.int64)[codes]
+        column_index = quarters - first
+
+        os.makedirs(self.root, exist_ok=True)
+        version = self.version + 1
+        files = {field: _column_file(field, version) for field in FIELDS}
+        columns = {}
+        for field in FIELDS:
+            matrix = np.full((len(symbols), last - first + 1), np.nan)
+            if self.columns:
+                offset = self.first_quarter - first
+                matrix[: len(self.symbols), offset : offset + self.quarters] = self.columns[field]
+            values = pd.to_numeric(rows[field], errors="coerce").to_numpy(dtype=float)
+            reported = ~np.isnan(values)
+            matrix[row_index[reported], column_index[reported]] = values[reported]
+            with open(os.path.join(self.root, files[field]), "wb") as handle:
+                np.save(handle, matrix)
+                handle.flush()
+                os.fsync(handle.fileno())
+            columns[field] = matrix
+
+        meta = {"symbols": symbols, "first_quarter": first, "version": version, "files": files}
+        tmp_path = os.path.join(self.root, _META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        # The meta file is replaced last: readers see old or new columns, never a mix of shapes.
+        os.replace(tmp_path, os.path.join(self.root, _META_FILE))
+        self._prune(keep={version, version - 1})
+        self.symbols, self.first_quarter, self.version = symbols, first, meta["version"]
+        self._index = index
+        self.columns = columns
+        return len(rows)
+
+    def _prune(self, keep: Set[int]) -> None:
+        # The previous generation stays for readers that loaded the old meta
+        # but have not opened its files yet; older ones (and unversioned
+        # files from earlier stores) go.
+        kept = {_column_file(field, version) for field in FIELDS for version in keep}
+        for name in os.listdir(self.root):
+            if name.endswith(".npy") and name not in kept:
+                os.remove(os.path.join(self.root, name))
+
+
+def _column_file(field: str, version: int) -> str:
+    return f"{field}.v{version}.npy"
+
+
+def _trailing_sum(values: np.ndarray, window: int = 4) -> np.ndarray:
+    """Sum over the last `window` quarters for every company at once; NaN
+    until `window` consecutive quarters are reported."""
+    n, quarters = values.shape
+    filled = np.zeros((n, quarters + 1))
+    np.cumsum(np.nan_to_num(values), axis=1, out=filled[:, 1:])
+    counts = np.zeros((n, quarters + 1))
+    np.cumsum(~np.isnan(values), axis=1, out=counts[:, 1:])
+    out = np.full((n, quarters), np.nan)
+    if quarters >= window:
+        complete = counts[:, window:] - counts[:, :-window] == window
+        out[:, window - 1 :] = np.where(complete, filled[:, window:] - filled[:, :-window], np.nan)
+    return out
+
+
+def _lagged(values: np.ndarray, quarters: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if quarters < values.shape[1]:
+        out[:, quarters:] = values[:, :-quarters]
+    return out
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # A ratio over a zero or negative base (equity, EBITDA, market cap) is not meaningful.
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def compute_ratios(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """The six ratios for every company and quarter, as companies × quarters
+    matrices: one vectorised pass per ratio, no loop over companies."""
+    ttm = {field: _trailing_sum(np.asarray(columns[field])) for field in FLOW_FIELDS}
+    equity = np.asarray(columns["equity"])
+    net_debt = np.asarray(columns["net_debt"])
+    market_cap = np.asarray(columns["market_cap"])
+
+    equity_year_ago = _lagged(equity, 4)
+    average_equity = np.where(np.isnan(equity_year_ago), equity, (equity + equity_year_ago) / 2)
+    revenue_3y_ago = _lagged(ttm["revenue"], 12)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = np.power(_ratio(ttm["revenue"], revenue_3y_ago), 1 / 3) - 1
+    growth[~(revenue_3y_ago > 0)] = np.nan
+    return {
+        "roe": _ratio(ttm["net_income"], average_equity),
+        "operating_margin": _ratio(ttm["operating_income"], ttm["revenue"]),
+        "fcf_yield": _ratio(ttm["operating_cash_flow"] - ttm["capex"], market_cap),
+        "net_leverage": _ratio(net_debt, ttm["ebitda"]),
+        "revenue_growth_3y": growth,
+        "ev_ebitda": _ratio(market_cap + net_debt, ttm["ebitda"]),
+    }
+
+
+class FundamentalsBook:
+    """Ratios of a store, computed once for all companies and quarters and
+    served per reporting period from a cache, so showing a company is a
+    dictionary lookup and a row read."""
+
+    def __init__(self, store: FundamentalsStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        self._history: Optional[Dict[str, np.ndarray]] = None
+        self._last_reported: Optional[np.ndarray] = None
+        self._periods: Dict[int, pd.DataFrame] = {}
+
+    @property
+    def history(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if self._history is None:
+                self._history = compute_ratios(self.store.columns)
+                reported = ~np.isnan(np.asarray(self.store.columns["revenue"]))
+                # Last quarter with a reported revenue, -1 for none.
+                quarters = self.store.quarters
+                self._last_reported = np.where(
+                    reported.any(axis=1), quarters - 1 - np.argmax(reported[:, ::-1], axis=1), -1
+                )
+            return self._history
+
+    def period(self, quarter: int) -> pd.DataFrame:
+        """Companies × ratios for one quarter (column index), cached."""
+        table = self._periods.get(quarter)
+        if table is None:
+            history = self.history
+            table = pd.DataFrame(
+                {name: history[name][:, quarter] for name in RATIOS},
+                index=pd.Index(self.store.symbols, name="symbol"),
+            )
+            self._periods[quarter] = table
+        return table
+
+    def latest(self, symbol: str) -> Optional[Dict[str, float]]:
+        """The ratios of `symbol` at its last reported quarter, with that
+        quarter under "period"; None when the store does not cover it."""
+        row = self.store.index(symbol)
+        if row is None:
+            return None
+        self.history
+        quarter = int(self._last_reported[row])
+        if quarter < 0:
+            return None
+        # One float block per period table: a row read, not six column lookups.
+        values = self.period(quarter).to_numpy()[row]
+        period = str(pd.Period(ordinal=self.store.first_quarter + quarter, freq="Q"))
+        return {"period": period, **{name: float(value) for name, value in zip(RATIOS, values)}}
+
+    def company_history(self, symbol: str, quarters: int = 8) -> Optional[pd.DataFrame]:
+        """The last `quarters` reported quarters of `symbol`, ratios as columns."""
+        row = self.store.index(symbol)
+        if row is None:
+            return None
+        history = self.history
+        frame = pd.DataFrame(
+            {label: history[name][row] for name, label in RATIOS.items()},
+            index=pd.Index(self.store.periods, name="Trimestre"),
+        )
+        frame = frame.dropna(how="all")
+        return frame.tail(quarters) if len(frame) else None
+
+
+def ingest(paths: Sequence[str], root: str = FUNDAMENTALS_DIR) -> FundamentalsStore:
+    store = FundamentalsStore(root)
+    store.ingest(read_statements(path) for path in paths)
+    return store
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Charge des états financiers (CSV/JSON/Parquet) dans le store.")
+    parser.add_argument("paths", nargs="+", help="Fichiers .csv, .json, .jsonl ou .parquet")
+    parser.add_argument("--root", default=FUNDAMENTALS_DIR, help="Répertoire du store")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    start = time.perf_counter()
+    store = ingest(args.paths, args.root)
+    elapsed = time.perf_counter() - start
+    periods = store.periods
+    print(
+        f"{len(store)} sociétés × {store.quarters} trimestres ({periods[0]} → {periods[-1]}) "
+        f"dans {store.root} en {elapsed:.2f} s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scoring import BASE_DIR
+
+JOURNAL_DIR = os.path.join(BASE_DIR, "data", "journal")
+
+# One fixed-width record per decision, 26 bytes; strings are dictionary codes.
+RECORD = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("user", "<u4"),
+        ("asset", "<u4"),
+        ("horizon", "u1"),
+        ("risk_budget", "u1"),
+        ("rating", "u1"),
+        ("decision", "u1"),
+        ("macro", "u1"),
+        ("fundamental", "u1"),
+        ("market", "u1"),
+        ("portfolio", "u1"),
+        ("hedge", "u1"),
+        ("composite", "u1"),
+    ]
+)
+STRING_FIELDS = ("user", "asset", "horizon", "rating", "decision")
+
+_RECORDS_FILE = "records.bin"
+_DICTIONARY_FILE = "dictionary.jsonl"
+_META_FILE = "meta.json"
+# Rows appended since the last index build are scanned; past this, the index is rebuilt.
+_REINDEX_ROWS = 65_536
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class DecisionEntry:
+    ts_ms: int
+    user: str
+    asset: str
+    horizon: str
+    risk_budget: int
+    composite: int
+    rating: str
+    decision: str
+    macro: int
+    fundamental: int
+    market: int
+    portfolio: int
+    hedge: int
+
+
+@dataclass
+class JournalStats:
+    records: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    write_ms: float = 0.0
+
+
+class DecisionJournal:
+    """Append-only decision journal with a background group-commit writer.
+
+    record() only enqueues, so a session never waits on disk. The writer
+    drains the queue in batches (up to `max_batch`, lingering `linger_ms`
+    for stragglers) and makes each batch durable with one fsync of the
+    records file, then of the meta file, which is replaced last: a crash
+    loses at most the batch in flight, never a half-written row. Both data
+    files are truncated back to their committed length before an append.
+
+    Queries go through an asset → rows index built from the memory-mapped
+    records; rows appended since the last build are scanned until there
+    are enough of them to rebuild."""
+
+    def __init__(self, root: str = JOURNAL_DIR, linger_ms: float = 5.0, max_batch: int = 4096) -> None:
+        self.root = root
+        self.linger_ms = linger_ms
+        self.max_batch = max_batch
+        self.stats = JournalStats()
+        # The last write error, cleared once a later batch commits.
+        self.error: Optional[BaseException] = None
+        os.makedirs(root, exist_ok=True)
+
+        meta = self._read_meta()
+        self._rows: int = meta["rows"]
+        self._last_ts: Optional[int] = meta["last_ts"]
+        # Whether ts never decreases along the file, so time ranges can be bisected.
+        self._monotonic: bool = meta["monotonic"]
+        self._dictionary_lines: int = meta["dictionary_lines"]
+        self._dictionary_bytes: int = meta["dictionary_bytes"]
+        self._values: Dict[str, List[str]] = {field: [] for field in STRING_FIELDS}
+        self._codes: Dict[str, Dict[str, int]] = {field: {} for field in STRING_FIELDS}
+        self._load_dictionary()
+
+        self._read_lock = threading.Lock()
+        self._records: np.ndarray = np.empty(0, dtype=RECORD)
+        self._mapped_rows = -1
+        self._index: Tuple[int, np.ndarray, np.ndarray] = (0, np.empty(0, dtype=np.int64), np.zeros(1, np.int64))
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._submitted = 0
+        self._submit_lock = threading.Lock()
+        self._durable = 0
+        self._durable_changed = threading.Condition()
+        # (first, end, error) queue positions of failed batches not yet raised by flush().
+        self._failures: List[Tuple[int, int, BaseException]] = []
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def _read_meta(self) -> Dict:
+        path = os.path.join(self.root, _META_FILE)
+        if not os.path.exists(path):
+            return {"rows": 0, "last_ts": None, "monotonic": True, "dictionary_lines": 0, "dictionary_bytes": 0}
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _write_meta(self) -> None:
+        meta = {
+            "rows": self._rows,
+            "last_ts": self._last_ts,
+            "monotonic": self._monotonic,
+            "dictionary_lines": self._dictionary_lines,
+            "dictionary_bytes": self._dictionary_bytes,
+        }
+        tmp_path = os.path.join(self.root, _META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, os.path.join(self.root, _META_FILE))
+
+    def _load_dictionary(self) -> None:
+        path = os.path.join(self.root, _DICTIONARY_FILE)
+        if not self._dictionary_lines:
+            return
+        with open(path, "rb") as handle:
+            # Bytes past the meta length belong to a batch that never committed.
+            committed = handle.read(self._dictionary_bytes).decode("utf-8")
+        for line in committed.splitlines()[: self._dictionary_lines]:
+            field, value = json.loads(line)
+            self._codes[field][value] = len(self._values[field])
+            self._values[field].append(value)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    # -- writing --------------------------------------------------------
+
+    def record(self, entry: DecisionEntry) -> None:
+        """Queue an entry for the writer; never touches the disk."""
+        if self._writer is None:
+            self._start_writer()
+        # Counted under the lock so flush() waits for exactly what precedes it.
+        with self._submit_lock:
+            self._submitted += 1
+            self._queue.put(entry)
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="decision-journal", daemon=True)
+                self._writer.start()
+                # The writer is a daemon thread: drain what is queued before the interpreter exits.
+                atexit.register(self.close)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every entry queued so far is durable. Returns False on
+        timeout; re-raises the error of a failed batch among those entries,
+        once: a later flush only reports later failures."""
+        target = self._submitted
+        with self._durable_changed:
+            done = self._durable_changed.wait_for(lambda: self._durable >= target, timeout)
+            failed = [error for first, _, error in self._failures if first < target]
+            self._failures = [failure for failure in self._failures if failure[0] >= target]
+        if failed:
+            raise RuntimeError("Écriture du journal des décisions en échec") from failed[-1]
+        return done
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.linger_ms / 1000
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            error: Optional[BaseException] = None
+            try:
+                self._write_batch(batch)
+            except BaseException as exc:  # surfaced to callers through flush()
+                error = exc
+            with self._durable_changed:
+                if error is not None:
+                    self._failures.append((self._durable, self._durable + len(batch), error))
+                self.error = error
+                self._durable += len(batch)
+                self._durable_changed.notify_all()
+
+    def _encode(self, field: str, values: Sequence[str], new_lines: List[str]) -> np.ndarray:
+        codes = self._codes[field]
+        out = np.empty(len(values), dtype=np.int64)
+        for position, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self._values[field])
+                self._values[field].append(value)
+                new_lines.append(json.dumps([field, value], ensure_ascii=False))
+            out[position] = code
+        return out
+
+    def _write_batch(self, batch: List[DecisionEntry]) -> None:
+        sizes = {field: len(values) for field, values in self._values.items()}
+        committed = (self._rows, self._dictionary_lines, self._dictionary_bytes, self._monotonic, self._last_ts)
+        try:
+            self._append(batch)
+        except BaseException:
+            # Back to the last committed state, and forget the codes this batch
+            # assigned: their dictionary lines were never committed.
+            self._rows, self._dictionary_lines, self._dictionary_bytes, self._monotonic, self._last_ts = committed
+            for field, size in sizes.items():
+                for value in self._values[field][size:]:
+                    del self._codes[field][value]
+                del self._values[field][size:]
+            raise
+
+    def _append(self, batch: List[DecisionEntry]) -> None:
+        start = time.perf_counter()
+        records = np.empty(len(batch), dtype=RECORD)
+        new_lines: List[str] = []
+        for field in RECORD.names:
+            name = "ts_ms" if field == "ts" else field
+            values = [getattr(entry, name) for entry in batch]
+            records[field] = self._encode(field, values, new_lines) if field in STRING_FIELDS else values
+        ts = records["ts"]
+        monotonic = bool(np.all(ts[1:] >= ts[:-1])) and (self._last_ts is None or int(ts[0]) >= self._last_ts)
+
+        # Drop bytes from a batch that crashed before its meta update.
+        dictionary = "".join(line + "\n" for line in new_lines).encode("utf-8")
+        if dictionary:
+            with open(os.path.join(self.root, _DICTIONARY_FILE), "ab") as handle:
+                handle.truncate(self._dictionary_bytes)
+                handle.write(dictionary)
+                handle.flush()
+                os.fsync(handle.fileno())
+        with open(os.path.join(self.root, _RECORDS_FILE), "ab") as handle:
+            handle.truncate(self._rows * RECORD.itemsize)
+            handle.write(records.tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        self._rows += len(batch)
+        self._dictionary_lines += len(new_lines)
+        self._dictionary_bytes += len(dictionary)
+        self._monotonic = self._monotonic and monotonic
+        self._last_ts = int(ts.max()) if self._last_ts is None else max(self._last_ts, int(ts.max()))
+        self._write_meta()
+        self.stats.records += len(batch)
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        self.stats.write_ms += (time.perf_counter() - start) * 1000
+
+    # -- reading --------------------------------------------------------
+
+    def _snapshot(self) -> np.ndarray:
+        rows = self._rows
+        with self._read_lock:
+            if rows != self._mapped_rows:
+                self._records = (
+                    np.memmap(os.path.join(self.root, _RECORDS_FILE), dtype=RECORD, mode="r", shape=(rows,))
+                    if rows
+                    else np.empty(0, dtype=RECORD)
+                )
+                self._mapped_rows = rows
+            return self._records
+
+    def _asset_rows(self, records: np.ndarray, code: int) -> np.ndarray:
+        with self._read_lock:
+            indexed, order, starts = self._index
+            if len(records) - indexed > _REINDEX_ROWS:
+                assets = np.asarray(records["asset"])
+                order = np.argsort(assets, kind="stable")
+                starts = np.searchsorted(assets[order], np.arange(len(self._values["asset"]) + 1))
+                indexed = len(records)
+                self._index = (indexed, order, starts)
+        rows = order[starts[code] : starts[code + 1]] if code + 1 < len(starts) else order[:0]
+        tail = np.flatnonzero(records["asset"][indexed:] == code) + indexed
+        return np.concatenate([rows, tail])
+
+    def _frame(self, records: np.ndarray) -> pd.DataFrame:
+        columns = {"ts": pd.to_datetime(records["ts"], unit="ms", utc=True)}
+        for field in RECORD.names[1:]:
+            values = np.asarray(records[field])
+            if field in STRING_FIELDS:
+                columns[field] = np.asarray(self._values[field], dtype=object)[values]
+            else:
+                columns[field] = values.astype(np.int64)
+        return pd.DataFrame(columns)
+
+    def query(
+        self,
+        asset: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        user: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Entries in append order, filtered by asset, [start_ms, end_ms] and user."""
+        records = self._snapshot()
+        if asset is not None:
+            code = self._codes["asset"].get(asset)
+            rows = self._asset_rows(records, code) if code is not None else np.empty(0, dtype=np.int64)
+            selected = records[rows]
+        elif self._monotonic and (start_ms is not None or end_ms is not None):
+            lo = 0 if start_ms is None else int(np.searchsorted(records["ts"], start_ms, side="left"))
+            hi = len(records) if end_ms is None else int(np.searchsorted(records["ts"], end_ms, side="right"))
+            selected = records[lo:hi]
+            start_ms = end_ms = None
+        else:
+            selected = np.asarray(records)
+        mask = np.ones(len(selected), dtype=bool)
+        if start_ms is not None:
+            mask &= selected["ts"] >= start_ms
+        if end_ms is not None:
+            mask &= selected["ts"] <= end_ms
+        if user is not None:
+            code = self._codes["user"].get(user)
+            mask &= selected["user"] == (code if code is not None else -1)
+        return self._frame(selected[mask])
+
+    def changes(
+        self, asset: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Entries of `asset` whose decision differs from the previous entry
+        on the same horizon and risk budget, with that decision under
+        "previous_decision". Sessions are not part of the key: the decision
+        is the same whoever looks at it. The previous entry may predate
+        `start_ms`; a first entry is not a change."""
+        records = self._snapshot()
+        code = self._codes["asset"].get(asset)
+        rows = self._asset_rows(records, code) if code is not None else np.empty(0, dtype=np.int64)
+        selected = records[rows]
+        # Stable sort by (horizon, risk budget) keeps append order within each pair.
+        key = selected["horizon"].astype(np.uint16) << 8 | selected["risk_budget"]
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        decision = selected["decision"][order]
+        changed = np.zeros(len(order), dtype=bool)
+        changed[1:] = (key[1:] == key[:-1]) & (decision[1:] != decision[:-1])
+        previous = np.zeros(len(order), dtype=decision.dtype)
+        previous[1:] = decision[:-1]
+        keep = order[changed]
+        frame = self._frame(selected[keep])
+        frame["previous_decision"] = np.asarray(self._values["decision"], dtype=object)[previous[changed]]
+        frame = frame.iloc[np.argsort(keep, kind="stable")].reset_index(drop=True)
+        mask = np.ones(len(frame), dtype=bool)
+        if start_ms is not None:
+            mask &= frame["ts"] >= pd.Timestamp(start_ms, unit="ms", tz="UTC")
+        if end_ms is not None:
+            mask &= frame["ts"] <= pd.Timestamp(end_ms, unit="ms", tz="UTC")
+        return frame[mask].reset_index(drop=True)
+
+
+def period_bounds_ms(period: str) -> Tuple[int, int]:
+    """First and last millisecond of a period such as "2026Q4" or "2026-10"."""
+    span = pd.Period(period)
+    return span.start_time.value // 1_000_000, span.end_time.value // 1_000_000
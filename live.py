@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+_SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class Tick:
+    symbol: str
+    ts_ms: int
+    price: float
+
+
+@dataclass(frozen=True)
+class LiveQuote:
+    symbol: str
+    ts_ms: int
+    price: float
+    change: float
+    volatility: float
+    momentum: float
+    ticks: int
+
+
+@dataclass
+class BusStats:
+    received: int = 0
+    coalesced: int = 0
+    computations: int = 0
+    quotes: int = 0
+    compute_ms: float = 0.0
+
+
+class TickBus:
+    """Process-wide tick fan-in/fan-out.
+
+    publish() keeps only the latest tick per symbol. At most `max_refresh_hz`
+    times a second the pending ticks are folded into per-symbol state in one
+    vectorised pass and published as an immutable {symbol: LiveQuote} map
+    with a new version; sessions read that map, nothing is computed per
+    session and nothing is queued per session."""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        max_refresh_hz: float = 2.0,
+        halflife_s: float = 60.0,
+        time_scale: float = 1.0,
+    ) -> None:
+        self.symbols = list(symbols)
+        self.max_refresh_hz = max_refresh_hz
+        self.stats = BusStats()
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._halflife_s = halflife_s
+        # Market seconds per wall-clock second, so a simulated feed can run faster than real time.
+        self._time_scale = time_scale
+        n_symbols = len(self.symbols)
+        self._price = np.full(n_symbols, np.nan)
+        self._open = np.full(n_symbols, np.nan)
+        self._ts = np.zeros(n_symbols, dtype=np.int64)
+        self._variance = np.zeros(n_symbols)
+        self._ticks = np.zeros(n_symbols, dtype=np.int64)
+
+        self._pending: Dict[str, Tick] = {}
+        self._pending_lock = threading.Lock()
+        self._published: Tuple[int, Mapping[str, LiveQuote]] = (0, {})
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[Future] = []
+
+    def publish(self, tick: Tick) -> None:
+        if tick.symbol not in self._index:
+            return
+        with self._pending_lock:
+            self.stats.received += 1
+            if tick.symbol in self._pending:
+                self.stats.coalesced += 1
+            self._pending[tick.symbol] = tick
+
+    def step(self) -> int:
+        """Fold the pending ticks into the published quotes; returns their count."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        start = time.perf_counter()
+        index = np.fromiter((self._index[symbol] for symbol in pending), dtype=np.int64, count=len(pending))
+        prices = np.fromiter((tick.price for tick in pending.values()), dtype=float, count=len(pending))
+        ts = np.fromiter((tick.ts_ms for tick in pending.values()), dtype=np.int64, count=len(pending))
+
+        seen = self._ticks[index] > 0
+        first = index[~seen]
+        self._open[first] = prices[~seen]
+        # Coalesced ticks are sampled prices: scale each squared log return by
+        # the market time it spans to get a per-year variance, then blend it
+        # in with a time-based half-life.
+        known = index[seen]
+        elapsed_s = np.maximum((ts[seen] - self._ts[known]) / 1000.0, 1e-3) * self._time_scale
+        log_return = np.log(prices[seen] / self._price[known])
+        decay = 0.5 ** (elapsed_s / self._halflife_s)
+        instant = log_return**2 / (elapsed_s / _SECONDS_PER_YEAR)
+        started = self._ticks[known] > 1
+        self._variance[known] = np.where(started, decay * self._variance[known] + (1 - decay) * instant, instant)
+
+        self._price[index] = prices
+        self._ts[index] = ts
+        self._ticks[index] += 1
+        change = self._price[index] / self._open[index] - 1.0
+        volatility = np.sqrt(self._variance[index])
+        # Session move in units of the volatility expected over a trading day.
+        momentum = np.divide(np.log1p(change), volatility / np.sqrt(252), out=np.zeros(len(index)), where=volatility > 0)
+
+        version, quotes = self._published
+        quotes = dict(quotes)
+        for position, symbol in enumerate(pending):
+            i = index[position]
+            quotes[symbol] = LiveQuote(
+                symbol=symbol,
+                ts_ms=int(self._ts[i]),
+                price=float(self._price[i]),
+                change=float(change[position]),
+                volatility=float(volatility[position]),
+                momentum=float(momentum[position]),
+                ticks=int(self._ticks[i]),
+            )
+        self._published = (version + 1, quotes)
+        self.stats.computations += 1
+        self.stats.quotes += len(pending)
+        self.stats.compute_ms += (time.perf_counter() - start) * 1000
+        return len(pending)
+
+    def snapshot(self) -> Tuple[int, Mapping[str, LiveQuote]]:
+        # Replaced wholesale on each step, so readers never see a partial update.
+        return self._published
+
+    async def run(self) -> None:
+        interval = 1.0 / self.max_refresh_hz
+        while True:
+            await asyncio.sleep(interval)
+            self.step()
+
+    def start(self, *feeds: "SimulatedFeed") -> None:
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="live-ticks", daemon=True).start()
+        coros = [self.run()] + [feed.run(self) for feed in feeds]
+        self._tasks = [asyncio.run_coroutine_threadsafe(coro, self._loop) for coro in coros]
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        for task in self._tasks:
+            task.cancel()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop, self._tasks = None, []
+
+
+class Subscription:
+    """A session's cursor on the bus. A session that renders slower than the
+    bus publishes just jumps to the newest version; the gap is counted."""
+
+    def __init__(self, bus: TickBus) -> None:
+        self.bus = bus
+        self.version = 0
+        self.skipped = 0
+
+    def _advance(self, version: int) -> None:
+        if self.version and version > self.version:
+            self.skipped += version - self.version - 1
+        self.version = version
+
+    def poll(self) -> Optional[Mapping[str, LiveQuote]]:
+        """The newest quotes, or None when nothing was published since the last call."""
+        version, quotes = self.bus.snapshot()
+        if version == self.version:
+            return None
+        self._advance(version)
+        return quotes
+
+    def latest(self) -> Mapping[str, LiveQuote]:
+        version, quotes = self.bus.snapshot()
+        self._advance(version)
+        return quotes
+
+
+class SimulatedFeed:
+    """Offline random-walk ticks for every symbol, `ticks_per_second` in total."""
+
+    def __init__(
+        self,
+        prices: Mapping[str, float],
+        ticks_per_second: float = 200.0,
+        annual_vol: float = 0.25,
+        time_scale: float = 1.0,
+        seed: int = 0,
+        batch_s: float = 0.01,
+    ) -> None:
+        self.symbols = list(prices)
+        self.prices = np.array([prices[symbol] for symbol in self.symbols], dtype=float)
+        self.ticks_per_second = ticks_per_second
+        self.annual_vol = annual_vol
+        self.time_scale = time_scale
+        self.batch_s = batch_s
+        self._rng = np.random.default_rng(seed)
+
+    def next_ticks(self, ts_ms: int) -> List[Tick]:
+        count = self._rng.poisson(self.ticks_per_second * self.batch_s)
+        if count == 0 or not self.symbols:
+            return []
+        chosen = self._rng.integers(0, len(self.symbols), count)
+        # Each symbol is touched ~count / n times per batch; scale steps so the
+        # walk keeps `annual_vol` in market time.
+        per_tick_s = len(self.symbols) / self.ticks_per_second * self.time_scale
+        sigma = self.annual_vol * np.sqrt(per_tick_s / _SECONDS_PER_YEAR)
+        steps = self._rng.normal(-0.5 * sigma * sigma, sigma, count)
+        np.multiply.at(self.prices, chosen, np.exp(steps))
+        return [Tick(self.symbols[i], ts_ms, float(self.prices[i])) for i in chosen]
+
+    async def run(self, bus: TickBus) -> None:
+        while True:
+            for tick in self.next_ticks(int(time.time() * 1000)):
+                bus.publish(tick)
+            await asyncio.sleep(self.batch_s)
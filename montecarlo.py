@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring import Scenario, _scenarios
+
+HORIZON_DAYS = {
+    "Court terme": 21,
+    "Moyen terme": 126,
+    "Long terme": 252,
+}
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_TRADING_DAYS = 252
+_STEP_BLOCK = 32
+_HISTOGRAM_BINS = 4000
+_HISTOGRAM_SIGMAS = 8.0
+
+
+@dataclass(frozen=True)
+class SimulationSpec:
+    drift: float
+    volatility: float
+    horizon_days: int
+    edges: Tuple[float, ...]
+    paths: int = 1_000_000
+    chunk_size: int = 50_000
+    seed: int = 0
+    df: float = 4.0
+
+    @property
+    def log_range(self) -> Tuple[float, float]:
+        spread = _HISTOGRAM_SIGMAS * self.volatility * np.sqrt(self.horizon_days / _TRADING_DAYS)
+        center = (self.drift - 0.5 * self.volatility**2) * self.horizon_days / _TRADING_DAYS
+        return center - spread, center + spread
+
+
+@dataclass
+class ChunkResult:
+    paths: int
+    bucket_counts: np.ndarray
+    histogram: np.ndarray
+    total: float
+    total_sq: float
+    minimum: float
+    maximum: float
+
+
+@dataclass
+class SimulationSnapshot:
+    paths_done: int
+    total_paths: int
+    edges: Tuple[float, ...]
+    bucket_probabilities: np.ndarray
+    percentiles: Dict[int, float]
+    mean: float
+    std: float
+    worst: float
+    best: float
+
+    @property
+    def done(self) -> bool:
+        return self.paths_done >= self.total_paths
+
+
+def simulate_chunk(spec: SimulationSpec, seed: np.random.SeedSequence, size: int) -> ChunkResult:
+    """Simulate `size` fat-tailed daily paths and reduce them to fixed-size stats.
+
+    Steps are drawn in blocks so memory is O(size × block), never
+    O(size × horizon_days), and only the aggregates leave the worker."""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / _TRADING_DAYS
+    scale = spec.volatility * np.sqrt(dt) * np.sqrt((spec.df - 2.0) / spec.df)
+    log_return = np.full(size, (spec.drift - 0.5 * spec.volatility**2) * dt * spec.horizon_days)
+    for start in range(0, spec.horizon_days, _STEP_BLOCK):
+        steps = min(_STEP_BLOCK, spec.horizon_days - start)
+        log_return += scale * rng.standard_t(spec.df, size=(size, steps)).sum(axis=1)
+
+    pnl = np.expm1(log_return)
+    bucket_counts = np.bincount(np.searchsorted(spec.edges, pnl, side="right"), minlength=len(spec.edges) + 1)
+    lo, hi = spec.log_range
+    bins = np.clip(((log_return - lo) / (hi - lo) * _HISTOGRAM_BINS).astype(np.int64), -1, _HISTOGRAM_BINS)
+    histogram = np.bincount(bins + 1, minlength=_HISTOGRAM_BINS + 2)
+    return ChunkResult(
+        paths=size,
+        bucket_counts=bucket_counts,
+        histogram=histogram,
+        total=float(pnl.sum()),
+        total_sq=float(np.square(pnl).sum()),
+        minimum=float(pnl.min()),
+        maximum=float(pnl.max()),
+    )
+
+
+@dataclass
+class StreamingAggregator:
+    spec: SimulationSpec
+    paths: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+    bucket_counts: np.ndarray = field(init=False)
+    histogram: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.bucket_counts = np.zeros(len(self.spec.edges) + 1, dtype=np.int64)
+        self.histogram = np.zeros(_HISTOGRAM_BINS + 2, dtype=np.int64)
+
+    def add(self, chunk: ChunkResult) -> None:
+        self.paths += chunk.paths
+        self.bucket_counts += chunk.bucket_counts
+        self.histogram += chunk.histogram
+        self.total += chunk.total
+        self.total_sq += chunk.total_sq
+        self.minimum = min(self.minimum, chunk.minimum)
+        self.maximum = max(self.maximum, chunk.maximum)
+
+    def _percentile(self, cumulative: np.ndarray, q: float) -> float:
+        rank = q / 100.0 * self.paths
+        index = int(np.searchsorted(cumulative, rank, side="left"))
+        lo, hi = self.spec.log_range
+        width = (hi - lo) / _HISTOGRAM_BINS
+        if index == 0:
+            return self.minimum
+        if index > _HISTOGRAM_BINS:
+            return self.maximum
+        below = cumulative[index - 1]
+        inside = max(cumulative[index] - below, 1)
+        log_value = lo + (index - 1 + (rank - below) / inside) * width
+        return float(np.expm1(log_value))
+
+    def snapshot(self) -> SimulationSnapshot:
+        cumulative = np.cumsum(self.histogram)
+        mean = self.total / self.paths if self.paths else 0.0
+        variance = self.total_sq / self.paths - mean**2 if self.paths else 0.0
+        return SimulationSnapshot(
+            paths_done=self.paths,
+            total_paths=self.spec.paths,
+            edges=self.spec.edges,
+            bucket_probabilities=self.bucket_counts / max(self.paths, 1),
+            percentiles={q: self._percentile(cumulative, q) for q in PERCENTILES},
+            mean=mean,
+            std=float(np.sqrt(max(variance, 0.0))),
+            worst=self.minimum,
+            best=self.maximum,
+        )
+
+
+def _chunks(spec: SimulationSpec) -> List[Tuple[np.random.SeedSequence, int]]:
+    sizes = [min(spec.chunk_size, spec.paths - start) for start in range(0, spec.paths, spec.chunk_size)]
+    # One child seed per chunk: results depend on `seed` only, not on worker count or ordering.
+    return list(zip(np.random.SeedSequence(spec.seed).spawn(len(sizes)), sizes))
+
+
+def run_simulation(spec: SimulationSpec, executor: Optional[Executor] = None) -> Iterator[SimulationSnapshot]:
+    aggregator = StreamingAggregator(spec)
+    chunks = _chunks(spec)
+    if executor is None:
+        for seed, size in chunks:
+            aggregator.add(simulate_chunk(spec, seed, size))
+            yield aggregator.snapshot()
+        return
+
+    futures = [executor.submit(simulate_chunk, spec, seed, size) for seed, size in chunks]
+    for future in as_completed(futures):
+        aggregator.add(future.result())
+        yield aggregator.snapshot()
+
+
+def simulate(spec: SimulationSpec, executor: Optional[Executor] = None) -> SimulationSnapshot:
+    snapshot = None
+    for snapshot in run_simulation(spec, executor):
+        pass
+    return snapshot
+
+
+def process_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    # spawn, not fork: the Streamlit server is multi-threaded.
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def scenario_spec(
+    drift: float,
+    volatility: float,
+    horizon: str,
+    seed: int,
+    paths: int = 1_000_000,
+    band: float = 0.75,
+) -> SimulationSpec:
+    horizon_days = HORIZON_DAYS.get(horizon, HORIZON_DAYS["Moyen terme"])
+    horizon_vol = volatility * np.sqrt(horizon_days / _TRADING_DAYS)
+    center = float(np.expm1(drift * horizon_days / _TRADING_DAYS))
+    edges = (center - band * horizon_vol, center + band * horizon_vol)
+    return SimulationSpec(
+        drift=drift,
+        volatility=volatility,
+        horizon_days=horizon_days,
+        edges=edges,
+        paths=paths,
+        seed=seed,
+    )
+
+
+def snapshot_scenarios(seed: int, snapshot: SimulationSnapshot) -> List[Scenario]:
+    bear, central, bull = (round(float(p) * 100, 1) for p in snapshot.bucket_probabilities)
+    return _scenarios(seed, probabilities=(central, bull, bear))
+
+
+def bucket_labels(edges: Sequence[float]) -> List[str]:
+    bounds = [f"{edge * 100:+.1f}%" for edge in edges]
+    return [f"< {bounds[0]}"] + [f"{a} → {b}" for a, b in zip(bounds, bounds[1:])] + [f"≥ {bounds[-1]}"]
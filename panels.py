@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import html
+import json
+import re
+import textwrap
+from string import Formatter
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+STYLESHEET_ID = "panel-styles"
+
+
+class Markup(str):
+    """Already-rendered HTML: inserted into a template as is, not escaped."""
+
+    __slots__ = ()
+
+
+class Template:
+    """An HTML template parsed once, at import.
+
+    Rendering joins precomputed literals with the escaped field values; no
+    format string is parsed per call. Whitespace between tags is dropped so
+    the output is one line, which st.markdown passes through untouched."""
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, source: str) -> None:
+        compact = re.sub(r">\s+<", "><", textwrap.dedent(source).strip())
+        self._parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in Formatter().parse(compact)
+        ]
+
+    def render(self, **values: object) -> Markup:
+        out = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                value = values[field]
+                out.append(value if isinstance(value, Markup) else html.escape(str(value)))
+        return Markup("".join(out))
+
+
+_GRID = Template('<div class="panel-grid" style="grid-template-columns:repeat({columns},minmax(0,1fr));">{items}</div>')
+_METRIC = Template(
+    """
+    <div class="metric-pill">
+        <div class="muted" style="font-size:12px;">{label}</div>
+        <div style="font-size:18px; font-weight:600;">{value}</div>
+    </div>
+    """
+)
+_KPI = Template(
+    """
+    <div class="panel">
+        <div class="muted" style="font-size:12px;">{label}</div>
+        <div style="font-size:22px; font-weight:700;">{value}</div>
+    </div>
+    """
+)
+_THESIS = Template(
+    """
+    <div class="panel">
+        <h4>{title}</h4>
+        <p class="muted">{content}</p>
+    </div>
+    """
+)
+_BANNER = Template(
+    """
+    <div class="panel">
+        <h2>{title}</h2>
+        <div class="muted">{subtitle}</div>
+    </div>
+    """
+)
+_SECTION = Template("<div class='panel'><h3>{title}</h3></div>")
+_NOTE = Template('<div class="panel"><h4>{title}</h4>{body}</div>')
+_PARAGRAPH = Template("<p>{text}</p>")
+_ITEM = Template("<li>{text}</li>")
+_LIST = Template("<ul>{items}</ul>")
+_SCORE = Template(
+    "<div class='panel'><div class='muted'>{label}</div><div style='font-size:20px;font-weight:600;'>{value}</div></div>"
+)
+_VERDICT = Template(
+    """
+    <div class="panel">
+        <div class="rating">Notation interne : {rating}</div>
+        <div class="decision" style="color:{color};">Décision : {decision}</div>
+    </div>
+    """
+)
+
+_STYLESHEET = """
+body, .stApp {{
+    background-color: {bg};
+    color: {text};
+    font-family: "Inter", "Segoe UI", sans-serif;
+}}
+.block-container {{
+    padding-top: 2rem;
+}}
+.panel {{
+    background: {panel};
+    border: 1px solid #1F2937;
+    border-radius: 16px;
+    padding: 16px;
+    margin-bottom: 16px;
+}}
+.panel h3 {{
+    margin: 0 0 10px 0;
+    color: {text};
+}}
+.metric-pill {{
+    background: {panel_alt};
+    border-radius: 10px;
+    padding: 12px;
+    border: 1px solid #1F2937;
+}}
+.panel-grid {{
+    display: grid;
+    gap: 1rem;
+    margin-bottom: 16px;
+}}
+.panel-grid > .panel {{
+    margin-bottom: 0;
+}}
+@media (max-width: 640px) {{
+    .panel-grid {{
+        grid-template-columns: minmax(0, 1fr) !important;
+    }}
+}}
+.muted {{
+    color: {muted};
+}}
+.decision {{
+    font-size: 20px;
+    font-weight: 700;
+}}
+.rating {{
+    font-size: 24px;
+    font-weight: 700;
+}}
+.sidebar .sidebar-content {{
+    background-color: {panel};
+}}
+"""
+
+# Appends the stylesheet to <head> once: it outlives the element that
+# carried it, which Streamlit removes on the next full rerun.
+_INJECTOR = """<script>
+(() => {{
+    if (document.getElementById({id})) return;
+    const style = document.createElement("style");
+    style.id = {id};
+    style.textContent = {css};
+    document.head.appendChild(style);
+}})();
+</script>"""
+
+
+def stylesheet(theme: Mapping[str, str]) -> str:
+    return _STYLESHEET.format(**theme).strip()
+
+
+def stylesheet_injector(theme: Mapping[str, str]) -> str:
+    return _INJECTOR.format(id=json.dumps(STYLESHEET_ID), css=json.dumps(stylesheet(theme)))
+
+
+def _grid(cells: Sequence[Markup]) -> Markup:
+    return _GRID.render(columns=max(len(cells), 1), items=Markup("".join(cells)))
+
+
+def metric_grid(metrics: Mapping[str, str]) -> Markup:
+    return _grid([_METRIC.render(label=label, value=value) for label, value in metrics.items()])
+
+
+def kpi_strip(kpis: Iterable[Tuple[str, str]]) -> Markup:
+    return _grid([_KPI.render(label=label, value=value) for label, value in kpis])
+
+
+def thesis_row(blocks: Iterable[Tuple[str, str]]) -> Markup:
+    return _grid([_THESIS.render(title=title, content=content) for title, content in blocks])
+
+
+def banner(title: str, subtitle: str) -> Markup:
+    return _BANNER.render(title=title, subtitle=subtitle)
+
+
+def section(title: str) -> Markup:
+    return _SECTION.render(title=title)
+
+
+def note(title: str, text: Optional[str] = None, items: Sequence[str] = ()) -> Markup:
+    if text:
+        body = _PARAGRAPH.render(text=text)
+    else:
+        body = _LIST.render(items=Markup("".join(_ITEM.render(text=item) for item in items)))
+    return _NOTE.render(title=title, body=body)
+
+
+def score_panel(label: str, value: str) -> Markup:
+    return _SCORE.render(label=label, value=value)
+
+
+def verdict(rating: str, decision: str, color: str) -> Markup:
+    return _VERDICT.render(rating=rating, decision=decision, color=color)
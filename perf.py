@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List
+
+import numpy as np
+
+from scoring import BASE_DIR
+
+PERF_DIR = os.path.join(BASE_DIR, "data")
+PROMETHEUS_FILE = "perf.prom"
+JSON_FILE = "perf.json"
+
+
+@dataclass
+class StageSummary:
+    stage: str
+    kind: str
+    runs: int
+    p50: float
+    p95: float
+    last: float
+    total: float
+
+
+@dataclass
+class _Series:
+    samples: Deque[float]
+    runs: int = 0
+    total: float = 0.0
+
+
+class _Run:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+
+
+class PerfRecorder:
+    """Process-wide stage timings and counters, aggregated per rerun.
+
+    Spans opened on a thread while a run is active add up into that run; when
+    the outermost run closes, each stage contributes one sample (its total
+    for the run) to a bounded history, from which p50/p95 are derived."""
+
+    def __init__(self, history: int = 200) -> None:
+        self.history = history
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._durations: Dict[str, _Series] = {}
+        self._counts: Dict[str, _Series] = {}
+        self._last_dump = 0.0
+        # Serialises dumps: every session thread may call maybe_dump().
+        self._dump_lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return getattr(self._local, "run", None) is not None
+
+    @contextmanager
+    def run(self, name: str) -> Iterator[bool]:
+        """Opens a run, or a plain span when one is already active on this
+        thread (a fragment rendered inline by the main script). Yields whether
+        this call owns the run."""
+        if self.active:
+            with self.span(name):
+                yield False
+            return
+        current = self._local.run = _Run(name)
+        start = time.perf_counter()
+        try:
+            yield True
+        finally:
+            current.durations[name] = (time.perf_counter() - start) * 1000
+            self._local.run = None
+            self._flush(current)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000)
+
+    def timed(self, stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(stage):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def add(self, stage: str, ms: float) -> None:
+        current = getattr(self._local, "run", None)
+        if current is None:
+            # Outside any run (a helper thread): a one-stage run of its own.
+            current = _Run(stage)
+            current.durations[stage] = ms
+            self._flush(current)
+            return
+        current.durations[stage] = current.durations.get(stage, 0.0) + ms
+
+    def count(self, name: str, value: float = 1) -> None:
+        current = getattr(self._local, "run", None)
+        if current is not None:
+            current.counts[name] = current.counts.get(name, 0) + value
+
+    def _record(self, target: Dict[str, _Series], key: str, value: float) -> None:
+        series = target.get(key)
+        if series is None:
+            series = target[key] = _Series(deque(maxlen=self.history))
+        series.samples.append(value)
+        series.runs += 1
+        series.total += value
+
+    def _flush(self, current: _Run) -> None:
+        with self._lock:
+            for stage, ms in current.durations.items():
+                self._record(self._durations, stage, ms)
+            for name, value in current.counts.items():
+                self._record(self._counts, f"{current.name}.{name}", value)
+
+    def summary(self) -> List[StageSummary]:
+        rows = []
+        with self._lock:
+            for kind, target in (("ms", self._durations), ("count", self._counts)):
+                for stage, series in target.items():
+                    p50, p95 = np.percentile(np.fromiter(series.samples, dtype=float), [50, 95])
+                    rows.append(
+                        StageSummary(
+                            stage=stage,
+                            kind=kind,
+                            runs=series.runs,
+                            p50=float(p50),
+                            p95=float(p95),
+                            last=series.samples[-1],
+                            total=series.total,
+                        )
+                    )
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+
+    def to_prometheus(self, prefix: str = "app") -> str:
+        rows = self.summary()
+        lines = []
+        families = (
+            ("ms", f"{prefix}_stage_seconds", "Durée par rerun de chaque étape", 1e-3),
+            ("count", f"{prefix}_run_events", "Événements par rerun (deltas, octets)", 1.0),
+        )
+        for kind, metric, help_text, scale in families:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            for row in rows:
+                if row.kind != kind:
+                    continue
+                label = row.stage.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{metric}{{stage="{label}",quantile="0.5"}} {row.p50 * scale:.6g}')
+                lines.append(f'{metric}{{stage="{label}",quantile="0.95"}} {row.p95 * scale:.6g}')
+                lines.append(f'{metric}_sum{{stage="{label}"}} {row.total * scale:.6g}')
+                lines.append(f'{metric}_count{{stage="{label}"}} {row.runs}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"generated_at": time.time(), "stages": [asdict(row) for row in self.summary()]}
+
+    def dump(self, directory: str = PERF_DIR) -> None:
+        with self._dump_lock:
+            self._dump(directory)
+
+    def _dump(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        for name, payload in (
+            (PROMETHEUS_FILE, self.to_prometheus()),
+            (JSON_FILE, json.dumps(self.to_json(), ensure_ascii=False, indent=2)),
+        ):
+            tmp_path = os.path.join(directory, name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            # Scrapers never see a half-written file.
+            os.replace(tmp_path, os.path.join(directory, name))
+        self._last_dump = time.monotonic()
+
+    def maybe_dump(self, interval_s: float, directory: str = PERF_DIR) -> bool:
+        if time.monotonic() - self._last_dump < interval_s:
+            return False
+        # A session that finds a dump in progress skips it rather than wait.
+        if not self._dump_lock.acquire(blocking=False):
+            return False
+        try:
+            if time.monotonic() - self._last_dump < interval_s:
+                return False
+            self._dump(directory)
+            return True
+        finally:
+            self._dump_lock.release()
+
+
+PERF = PerfRecorder()
+
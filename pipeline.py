@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from allocation import ASSET_CLASS_VOLATILITY, expected_returns
+from montecarlo import scenario_spec, simulate, snapshot_scenarios
+from scoring import (
+    _composite_score,
+    _fundamental_metrics,
+    _fundamental_score,
+    _hedge_score,
+    _hedge_signals,
+    _make_macro_factors,
+    _market_score,
+    _market_signals,
+    _portfolio_metrics,
+    _portfolio_score,
+    _score_to_decision,
+    _score_to_rating,
+    _stable_seed,
+    _thesis_blocks,
+    _weighted_score,
+)
+
+SCENARIO_PREVIEW_PATHS = 20_000
+
+_MISSING = object()
+
+
+@dataclass
+class NodeStats:
+    name: str
+    inputs: Tuple[str, ...]
+    state: str
+    computations: int
+    reuses: int
+    last_ms: float
+    total_ms: float
+
+
+@dataclass
+class _Node:
+    name: str
+    func: Optional[Callable[..., Any]]
+    inputs: Tuple[str, ...]
+    value: Any = _MISSING
+    version: int = 0
+    seen: Tuple[int, ...] = ()
+    computations: int = 0
+    reuses: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+
+    @property
+    def is_input(self) -> bool:
+        return self.func is None
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        # Arrays/frames compare element-wise; treat them as changed.
+        return False
+
+
+@dataclass
+class Pipeline:
+    """Named computations with declared inputs, evaluated lazily.
+
+    A node recomputes only when the version of one of its inputs moved since
+    its last run. A recomputed value equal to the previous one keeps the old
+    version, so unchanged intermediates stop the change from propagating."""
+
+    _nodes: Dict[str, _Node] = field(default_factory=dict)
+    recomputed: List[str] = field(default_factory=list)
+    _visited: Set[str] = field(default_factory=set)
+
+    def input(self, name: str, value: Any = _MISSING) -> None:
+        self._register(_Node(name, None, (), value=value))
+
+    def add(self, name: str, func: Callable[..., Any], inputs: Sequence[str]) -> None:
+        missing = [dep for dep in inputs if dep not in self._nodes]
+        if missing:
+            # Dependencies must exist first, which also rules out cycles.
+            raise KeyError(f"Nœud {name} : entrées inconnues {missing}")
+        self._register(_Node(name, func, tuple(inputs)))
+
+    def _register(self, node: _Node) -> None:
+        if node.name in self._nodes:
+            raise ValueError(f"Nœud déjà défini : {node.name}")
+        self._nodes[node.name] = node
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._nodes)
+
+    def set(self, **values: Any) -> List[str]:
+        changed = []
+        for name, value in values.items():
+            node = self._nodes[name]
+            if not node.is_input:
+                raise ValueError(f"{name} n'est pas une entrée")
+            if node.value is _MISSING or not _same(node.value, value):
+                node.value = value
+                node.version += 1
+                changed.append(name)
+        return changed
+
+    def _evaluate(self, name: str) -> Any:
+        node = self._nodes[name]
+        if name in self._visited:
+            return node.value
+        self._visited.add(name)
+        if node.is_input:
+            if node.value is _MISSING:
+                raise ValueError(f"Entrée non renseignée : {name}")
+            return node.value
+        args = [self._evaluate(dep) for dep in node.inputs]
+        versions = tuple(self._nodes[dep].version for dep in node.inputs)
+        if node.value is not _MISSING and versions == node.seen:
+            node.reuses += 1
+            return node.value
+
+        start = time.perf_counter()
+        value = node.func(*args)
+        node.last_ms = (time.perf_counter() - start) * 1000
+        node.total_ms += node.last_ms
+        node.computations += 1
+        node.seen = versions
+        self.recomputed.append(name)
+        if node.value is _MISSING or not _same(node.value, value):
+            node.value = value
+            node.version += 1
+        return node.value
+
+    def get(self, name: str) -> Any:
+        return self.run([name])[name]
+
+    def run(self, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        self.recomputed = []
+        self._visited = set()
+        return {name: self._evaluate(name) for name in (names or self.names)}
+
+    def stats(self) -> List[NodeStats]:
+        stale: Dict[str, bool] = {}
+        rows = []
+        for node in self._nodes.values():  # registration order is topological
+            stale[node.name] = not node.is_input and (
+                node.value is _MISSING
+                or any(stale[dep] for dep in node.inputs)
+                or tuple(self._nodes[dep].version for dep in node.inputs) != node.seen
+            )
+            if node.is_input:
+                state = "entrée"
+            elif node.value is _MISSING:
+                state = "vide"
+            else:
+                state = "à recalculer" if stale[node.name] else "à jour"
+            rows.append(
+                NodeStats(
+                    name=node.name,
+                    inputs=node.inputs,
+                    state=state,
+                    computations=node.computations,
+                    reuses=node.reuses,
+                    last_ms=node.last_ms,
+                    total_ms=node.total_ms,
+                )
+            )
+        return rows
+
+
+def _scenario_spec(asset_class: str, horizon: str, seed: int, composite_score: int, live: Optional[Dict]):
+    volatility = live["volatility"] if live else ASSET_CLASS_VOLATILITY.get(asset_class, 0.20)
+    drift = float(expected_returns([composite_score], np.array([[volatility**2]]))[0])
+    return scenario_spec(drift, volatility, horizon, seed, paths=SCENARIO_PREVIEW_PATHS)
+
+
+def scoring_pipeline(
+    live_risk: Callable[[str], Optional[Dict[str, float]]] = lambda asset: None,
+    reported_fundamentals: Callable[[str], Optional[Dict[str, float]]] = lambda asset: None,
+    curve_signals: Callable[[str], Optional[Dict[str, float]]] = lambda asset: None,
+    asset_risk: Callable[[str, int], Optional[Dict[str, float]]] = lambda asset, risk_budget: None,
+) -> Pipeline:
+    """The per-asset scoring chain of the app as a Pipeline.
+
+    Inputs: asset_class, asset, horizon, risk_budget and macro_weights.
+    `live_risk`, `reported_fundamentals` and `curve_signals` look an asset
+    up in the market data, the fundamentals store and the fitted yield
+    curves; `asset_risk` checks it against the risk budget's limits. None
+    falls back to the seeded values."""
+    graph = Pipeline()
+    for name in ("asset_class", "asset", "horizon", "risk_budget", "macro_weights"):
+        graph.input(name)
+
+    graph.add(
+        "seed",
+        lambda asset_class, asset, horizon, risk_budget: _stable_seed(f"{asset_class}-{asset}-{horizon}-{risk_budget}"),
+        ["asset_class", "asset", "horizon", "risk_budget"],
+    )
+    graph.add("live_risk", live_risk, ["asset"])
+    graph.add("reported_fundamentals", reported_fundamentals, ["asset"])
+    graph.add("curve_signals", curve_signals, ["asset"])
+    graph.add("asset_risk", asset_risk, ["asset", "risk_budget"])
+    graph.add("macro_factors", _make_macro_factors, ["seed", "macro_weights"])
+    graph.add("macro_score", _weighted_score, ["macro_factors"])
+    graph.add("fundamental_score", _fundamental_score, ["seed", "macro_score"])
+    graph.add("market_score", _market_score, ["seed", "macro_score"])
+    graph.add("portfolio_score", _portfolio_score, ["seed", "macro_score"])
+    graph.add("hedge_score", _hedge_score, ["seed", "macro_score"])
+    graph.add(
+        "composite_score",
+        _composite_score,
+        ["macro_score", "fundamental_score", "market_score", "portfolio_score", "hedge_score"],
+    )
+    graph.add("rating", _score_to_rating, ["composite_score"])
+    graph.add("decision", _score_to_decision, ["composite_score"])
+    graph.add("fundamental_metrics", _fundamental_metrics, ["seed", "reported_fundamentals"])
+    graph.add("market_signals", _market_signals, ["seed", "live_risk", "curve_signals"])
+    graph.add("portfolio_metrics", _portfolio_metrics, ["seed", "live_risk", "asset_risk"])
+    graph.add("hedge_signals", _hedge_signals, ["seed"])
+    graph.add("thesis_blocks", _thesis_blocks, ["seed"])
+    graph.add(
+        "simulation_spec",
+        _scenario_spec,
+        ["asset_class", "horizon", "seed", "composite_score", "live_risk"],
+    )
+    graph.add(
+        "scenarios",
+        lambda seed, spec: snapshot_scenarios(seed, simulate(spec)),
+        ["seed", "simulation_spec"],
+    )
+    return graph
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from allocation import target_volatility
+from rolling import TRADING_DAYS
+
+RISK_METHODS = {
+    "Historique": "historical",
+    "Paramétrique": "parametric",
+    "Historique filtrée": "filtered",
+}
+
+# Drawdown tolerated per unit of annual target volatility.
+DRAWDOWN_LIMIT_MULTIPLE = 1.5
+# RiskMetrics decay for the EWMA volatility of filtered historical simulation.
+EWMA_DECAY = 0.94
+
+# Working set per column chunk: a few arrays of (days, columns) per order statistic.
+_CHUNK_BYTES = 128 * 1024 * 1024
+_EWMA_BLOCK = 128
+_MAX_PORTFOLIOS = 16
+
+
+@dataclass
+class RiskProfile:
+    """Rolling risk of return series, one row per window (aligned on its
+    last day) and one column per series. VaR, ES and drawdowns are losses,
+    positive, as fractions of the position."""
+
+    window: int
+    confidence: float
+    var: Dict[str, np.ndarray]
+    es: Dict[str, np.ndarray]
+    max_drawdown: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.max_drawdown)
+
+
+@dataclass
+class RiskCheck:
+    method: str
+    var: float
+    es: float
+    max_drawdown: float
+    var_limit: float
+    drawdown_limit: float
+    # Windows of the history in which the position would have been over its limits.
+    var_breaches: int
+    drawdown_breaches: int
+    windows: int
+
+    @property
+    def utilisation(self) -> float:
+        return self.var / self.var_limit
+
+    @property
+    def within_limits(self) -> bool:
+        return self.var <= self.var_limit and self.max_drawdown <= self.drawdown_limit
+
+
+def risk_limits(risk_budget: int, confidence: float = 0.99) -> Tuple[float, float]:
+    """One-day VaR and drawdown limits implied by the budget's target volatility."""
+    volatility = target_volatility(risk_budget)
+    var_limit = -NormalDist().inv_cdf(1.0 - confidence) * volatility / math.sqrt(TRADING_DAYS)
+    return var_limit, DRAWDOWN_LIMIT_MULTIPLE * volatility
+
+
+def _sliding_reduce(
+    leaves: Tuple[np.ndarray, ...],
+    window: int,
+    merge: Callable[[Tuple[np.ndarray, ...], Tuple[np.ndarray, ...]], Tuple[np.ndarray, ...]],
+) -> Tuple[np.ndarray, ...]:
+    """Reduce every length-`window` run of rows with an associative `merge`.
+
+    Each window is cut into the disjoint power-of-two blocks of `window`'s
+    binary expansion. Blocks of length 2L are merged from pairs of length-L
+    blocks for all start rows at once, so the cost is O(rows × log window)
+    array operations, whatever the window."""
+    outputs = len(leaves[0]) - window + 1
+    level, length = leaves, 1
+    result: Optional[Tuple[np.ndarray, ...]] = None
+    offset, remaining = 0, window
+    while True:
+        if remaining & 1:
+            block = tuple(part[offset : offset + outputs] for part in level)
+            result = block if result is None else merge(result, block)
+            offset += length
+        remaining >>= 1
+        if not remaining:
+            return result
+        level = merge(tuple(part[:-length] for part in level), tuple(part[length:] for part in level))
+        length *= 2
+
+
+def _merge_smallest(first: Tuple[np.ndarray, ...], second: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    # The j-th smallest of two ascending k-lists is the least of first[j],
+    # second[j] and max(first[i - 1], second[j - i]) for i in 1..j.
+    merged = []
+    for j in range(len(first)):
+        value = np.minimum(first[j], second[j])
+        for i in range(1, j + 1):
+            np.minimum(value, np.maximum(first[i - 1], second[j - i]), out=value)
+        merged.append(value)
+    return tuple(merged)
+
+
+def _merge_drawdown(first: Tuple[np.ndarray, ...], second: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    # (peak, trough, drawdown) of a path segment; `first` comes before `second`.
+    peak, trough, drawdown = first
+    peak2, trough2, drawdown2 = second
+    return (
+        np.maximum(peak, peak2),
+        np.minimum(trough, trough2),
+        np.maximum(np.maximum(drawdown, drawdown2), peak - trough2),
+    )
+
+
+def rolling_smallest(values: np.ndarray, window: int, count: int) -> np.ndarray:
+    """The `count` smallest values of every trailing window, ascending:
+    (count, windows, columns)."""
+    values = np.asarray(values, dtype=float)
+    inf = np.full_like(values, np.inf)
+    return np.stack(_sliding_reduce((values,) + (inf,) * (count - 1), window, _merge_smallest))
+
+
+def rolling_max_drawdown(returns: np.ndarray, window: int) -> np.ndarray:
+    """Largest peak-to-trough fall of the cumulative return within every
+    trailing window, the level before the window's first day included.
+    Returns are added, not compounded, so a drawdown scales with the
+    position."""
+    returns = np.asarray(returns, dtype=float)
+    path = np.zeros((len(returns) + 1, returns.shape[1]))
+    np.cumsum(returns, axis=0, out=path[1:])
+    return _sliding_reduce((path, path, np.zeros_like(path)), window + 1, _merge_drawdown)[2]
+
+
+def ewma_variance(returns: np.ndarray, decay: float = EWMA_DECAY, seed_days: int = 20) -> np.ndarray:
+    """One-day-ahead EWMA variance forecasts: row t uses returns before t,
+    so there are len(returns) + 1 rows.
+
+    The recursion s[t+1] = decay·s[t] + (1 − decay)·r[t]² is solved in closed
+    form over blocks of days, one cumulative sum per block."""
+    returns = np.asarray(returns, dtype=float)
+    days = len(returns)
+    out = np.empty((days + 1, returns.shape[1]))
+    out[0] = np.var(returns[:seed_days], axis=0) if days > 1 else 0.0
+    squares = returns * returns
+    for start in range(0, days, _EWMA_BLOCK):
+        block = squares[start : start + _EWMA_BLOCK]
+        powers = decay ** np.arange(1, len(block) + 1)[:, None]
+        # s[start + t] = decay^t · (s[start] + (1 − decay) Σ_{i<t} r[start + i]² / decay^(i + 1))
+        weighted = np.cumsum(block / powers, axis=0)
+        out[start + 1 : start + 1 + len(block)] = powers * (out[start] + (1 - decay) * weighted)
+    return out
+
+
+def _column_chunks(days: int, columns: int, arrays: int) -> List[slice]:
+    width = max(1, _CHUNK_BYTES // max(1, days * 8 * arrays))
+    return [slice(start, min(start + width, columns)) for start in range(0, columns, width)]
+
+
+def rolling_risk(
+    returns: np.ndarray,
+    window: int = 250,
+    confidence: float = 0.99,
+    decay: float = EWMA_DECAY,
+) -> RiskProfile:
+    """Historical, parametric (normal) and filtered historical VaR/ES with
+    the rolling max drawdown, for every window and column at once.
+
+    Filtered historical simulation rescales the window's returns by their
+    EWMA volatility, takes the quantile of those standardised returns and
+    applies it to the next day's volatility forecast. `returns` must be
+    finite, days × series."""
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    days, columns = returns.shape
+    if window < 2 or window > days:
+        raise ValueError(f"Fenêtre {window} incompatible avec {days} jours de rendements")
+    tail = 1.0 - confidence
+    count = max(1, math.ceil(tail * window - 1e-9))
+    windows = days - window + 1
+    z = NormalDist().inv_cdf(tail)
+
+    var = {method: np.empty((windows, columns)) for method in RISK_METHODS.values()}
+    es = {method: np.empty((windows, columns)) for method in RISK_METHODS.values()}
+    max_drawdown = np.empty((windows, columns))
+    for chunk in _column_chunks(days, columns, 4 * count + 4):
+        block = returns[:, chunk]
+        smallest = rolling_smallest(block, window, count)
+        var["historical"][:, chunk] = -smallest[-1]
+        es["historical"][:, chunk] = -smallest.mean(axis=0)
+
+        # Rolling moments from cumulative sums of centred returns.
+        centred = block - block.mean(axis=0)
+        sums = np.zeros((days + 1, block.shape[1]))
+        squares = np.zeros((days + 1, block.shape[1]))
+        np.cumsum(centred, axis=0, out=sums[1:])
+        np.cumsum(centred * centred, axis=0, out=squares[1:])
+        total = sums[window:] - sums[:-window]
+        mean = total / window
+        variance = np.maximum((squares[window:] - squares[:-window] - total * mean) / (window - 1), 0.0)
+        sigma = np.sqrt(variance)
+        mean += block.mean(axis=0)
+        var["parametric"][:, chunk] = -(mean + z * sigma)
+        es["parametric"][:, chunk] = -(mean - sigma * math.exp(-0.5 * z * z) / math.sqrt(2 * math.pi) / tail)
+
+        forecast = np.sqrt(ewma_variance(block, decay))
+        standardised = block / np.where(forecast[:-1] > 0, forecast[:-1], np.inf)
+        smallest = rolling_smallest(standardised, window, count)
+        next_day = forecast[window:]
+        var["filtered"][:, chunk] = -smallest[-1] * next_day
+        es["filtered"][:, chunk] = -smallest.mean(axis=0) * next_day
+
+        max_drawdown[:, chunk] = rolling_max_drawdown(block, window)
+    return RiskProfile(window=window, confidence=confidence, var=var, es=es, max_drawdown=max_drawdown)
+
+
+class RiskMonitor:
+    """Rolling risk of a returns history, computed once, and the budget
+    checks read off it.
+
+    VaR, ES and additive drawdowns scale linearly with the position, so a
+    series' history is kept sorted once: a risk-budget change only moves the
+    limits, and each check is a few binary searches instead of a pass over
+    the history. Portfolios are cached by direction (weights over their
+    gross exposure); the exposure is applied at check time."""
+
+    def __init__(
+        self,
+        returns: np.ndarray,
+        window: int = 250,
+        confidence: float = 0.99,
+        decay: float = EWMA_DECAY,
+    ) -> None:
+        self.returns = np.asarray(returns, dtype=float)
+        self.window = window
+        self.confidence = confidence
+        self.decay = decay
+        self._assets: Optional[RiskProfile] = None
+        self._asset_sorted: Dict[Tuple, np.ndarray] = {}
+        self._portfolios: Dict[bytes, Tuple[RiskProfile, Dict[Tuple, np.ndarray]]] = {}
+
+    @property
+    def assets(self) -> RiskProfile:
+        if self._assets is None:
+            self._assets = rolling_risk(self.returns, self.window, self.confidence, self.decay)
+        return self._assets
+
+    def _portfolio(self, weights: Sequence[float]) -> Tuple[RiskProfile, Dict[Tuple, np.ndarray], float]:
+        weights = np.asarray(weights, dtype=float)
+        gross = float(np.abs(weights).sum())
+        direction = np.round(weights / gross, 12) if gross > 0 else weights
+        key = direction.tobytes()
+        entry = self._portfolios.get(key)
+        if entry is None:
+            profile = rolling_risk(self.returns @ direction, self.window, self.confidence, self.decay)
+            if len(self._portfolios) >= _MAX_PORTFOLIOS:
+                self._portfolios.pop(next(iter(self._portfolios)))
+            entry = self._portfolios[key] = (profile, {})
+        return entry[0], entry[1], gross
+
+    def portfolio(self, weights: Sequence[float]) -> Tuple[RiskProfile, float]:
+        """Risk profile of the weights' direction, and their gross exposure."""
+        profile, _, gross = self._portfolio(weights)
+        return profile, gross
+
+    @staticmethod
+    def _breaches(ordered: Dict[Tuple, np.ndarray], key: Tuple, history: np.ndarray, threshold: float) -> int:
+        if key not in ordered:
+            ordered[key] = np.sort(history)
+        return len(history) - int(np.searchsorted(ordered[key], threshold, side="right"))
+
+    def _check(
+        self,
+        profile: RiskProfile,
+        ordered: Dict[Tuple, np.ndarray],
+        column: int,
+        scale: float,
+        risk_budget: int,
+        method: str,
+    ) -> RiskCheck:
+        var_limit, drawdown_limit = risk_limits(risk_budget, self.confidence)
+        var_history = profile.var[method][:, column]
+        drawdown_history = profile.max_drawdown[:, column]
+        if scale <= 0:
+            var_breaches = drawdown_breaches = 0
+        else:
+            var_breaches = self._breaches(ordered, (column, method), var_history, var_limit / scale)
+            drawdown_breaches = self._breaches(ordered, (column, "drawdown"), drawdown_history, drawdown_limit / scale)
+        return RiskCheck(
+            method=method,
+            var=float(var_history[-1]) * scale,
+            es=float(profile.es[method][-1, column]) * scale,
+            max_drawdown=float(drawdown_history[-1]) * scale,
+            var_limit=var_limit,
+            drawdown_limit=drawdown_limit,
+            var_breaches=var_breaches,
+            drawdown_breaches=drawdown_breaches,
+            windows=len(profile),
+        )
+
+    def asset_check(
+        self, column: int, risk_budget: int, method: str = "historical", exposure: float = 1.0
+    ) -> RiskCheck:
+        return self._check(self.assets, self._asset_sorted, column, exposure, risk_budget, method)
+
+    def portfolio_check(self, weights: Sequence[float], risk_budget: int, method: str = "historical") -> RiskCheck:
+        profile, ordered, gross = self._portfolio(weights)
+        return self._check(profile, ordered, 0, gross, risk_budget, method)
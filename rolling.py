@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from store import TIMEFRAMES, OHLCVStore
+
+TRADING_DAYS = 252
+
+
+class EWMCovariance:
+    """Exponentially weighted mean/covariance, updated in place per tick.
+
+    The (1 - alpha) decay is folded into a running scale factor so a tick is
+    a single rank-1 pass over the preallocated (n, n) matrix: O(n) for means
+    and variances, O(n²) for the full covariance."""
+
+    def __init__(self, n_assets: int, halflife: float = 30.0) -> None:
+        self.n_assets = n_assets
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        self._raw = np.zeros((n_assets, n_assets))
+        self._scale = 1.0
+        self._delta = np.empty(n_assets)
+        self._outer = np.empty((n_assets, n_assets))
+
+    def update(self, x: np.ndarray) -> None:
+        if self.count == 0:
+            self.mean[:] = x
+            self.count = 1
+            return
+        np.subtract(x, self.mean, out=self._delta)
+        self.mean += self.alpha * self._delta
+        self._delta *= np.sqrt(self.alpha / self._scale)
+        np.multiply.outer(self._delta, self._delta, out=self._outer)
+        self._raw += self._outer
+        self._scale *= 1.0 - self.alpha
+        if self._scale < 1e-150:
+            self._raw *= self._scale
+            self._scale = 1.0
+        self.count += 1
+
+    def update_many(self, rows: np.ndarray) -> None:
+        for row in np.asarray(rows, dtype=float):
+            self.update(row)
+
+    @property
+    def cov(self) -> np.ndarray:
+        return self._raw * self._scale
+
+    @property
+    def variance(self) -> np.ndarray:
+        return np.diagonal(self._raw) * self._scale
+
+    def volatility(self, periods_per_year: int = TRADING_DAYS) -> np.ndarray:
+        return np.sqrt(self.variance * periods_per_year)
+
+    def correlation(self) -> np.ndarray:
+        return _correlation(self.cov)
+
+
+class RollingCovariance:
+    """Fixed-window mean/covariance with Welford-style add/remove updates.
+
+    The last `window` observations sit in a preallocated ring buffer; each
+    tick adds the newest row and retires the oldest without rescanning the
+    window."""
+
+    def __init__(self, n_assets: int, window: int = 60) -> None:
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        self.n_assets = n_assets
+        self.window = window
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        self.comoment = np.zeros((n_assets, n_assets))
+        self._buffer = np.zeros((window, n_assets))
+        self._head = 0
+        self._left = np.empty((n_assets, 2))
+        self._right = np.empty((2, n_assets))
+        self._outer = np.empty((n_assets, n_assets))
+
+    def _shift_mean(self, x: np.ndarray, n: int, sign: float) -> Tuple[np.ndarray, np.ndarray]:
+        before = x - self.mean
+        self.mean += sign * before / n
+        return before, x - self.mean
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=float)
+        if self.count < self.window:
+            self.count += 1
+            before, after = self._shift_mean(x, self.count, 1.0)
+            np.multiply.outer(before, after, out=self._outer)
+        else:
+            # Add the newest row and retire the oldest as one rank-2 product.
+            oldest = self._buffer[self._head]
+            self._left[:, 0], self._right[0] = self._shift_mean(x, self.window + 1, 1.0)
+            before, after = self._shift_mean(oldest, self.window, -1.0)
+            self._left[:, 1] = -before
+            self._right[1] = after
+            np.matmul(self._left, self._right, out=self._outer)
+        self.comoment += self._outer
+        self._buffer[self._head] = x
+        self._head = (self._head + 1) % self.window
+
+    def update_many(self, rows: np.ndarray) -> None:
+        for row in np.asarray(rows, dtype=float):
+            self.update(row)
+
+    @classmethod
+    def from_history(cls, returns: np.ndarray, window: int = 60) -> "RollingCovariance":
+        returns = np.asarray(returns, dtype=float)
+        stats = cls(returns.shape[1], window)
+        tail = returns[-window:]
+        stats.count = len(tail)
+        stats.mean[:] = tail.mean(axis=0)
+        centered = tail - stats.mean
+        stats.comoment[:] = centered.T @ centered
+        stats._buffer[: len(tail)] = tail
+        stats._head = len(tail) % window
+        return stats
+
+    @property
+    def cov(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.comoment)
+        return self.comoment / (self.count - 1)
+
+    @property
+    def variance(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros(self.n_assets)
+        return np.diagonal(self.comoment) / (self.count - 1)
+
+    def volatility(self, periods_per_year: int = TRADING_DAYS) -> np.ndarray:
+        return np.sqrt(np.maximum(self.variance, 0.0) * periods_per_year)
+
+    def correlation(self) -> np.ndarray:
+        return _correlation(self.cov)
+
+
+def _correlation(cov: np.ndarray) -> np.ndarray:
+    std = np.sqrt(np.maximum(np.diagonal(cov), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.multiply.outer(std, std)
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def average_correlation(corr: np.ndarray, index: int) -> float:
+    others = np.delete(corr[index], index)
+    return float(others.mean()) if len(others) else 0.0
+
+
+def diversification_ratio(cov: np.ndarray, weights: Optional[np.ndarray] = None) -> float:
+    n_assets = cov.shape[0]
+    weights = np.full(n_assets, 1.0 / n_assets) if weights is None else np.asarray(weights, dtype=float)
+    portfolio_vol = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+    weighted_vol = float(weights @ np.sqrt(np.maximum(np.diagonal(cov), 0.0)))
+    return weighted_vol / portfolio_vol if portfolio_vol > 0 else 1.0
+
+
+def returns_matrix(
+    store: OHLCVStore,
+    symbols: Sequence[str],
+    timeframe: str = "1d",
+    start_ms: Optional[int] = None,
+) -> Tuple[List[str], np.ndarray]:
+    closes = {}
+    for symbol in symbols:
+        if timeframe in store.timeframes(symbol):
+            bars = store.read(symbol, timeframe, start_ms)
+            if len(bars) > 1:
+                ts = bars.ts
+                if timeframe == "1d":
+                    # Providers stamp daily bars at different times of the
+                    # day (ccxt 00:00 UTC, yfinance the exchange's local
+                    # midnight), so key them by the nearest calendar date.
+                    ts = (ts + TIMEFRAMES["1d"] // 2) // TIMEFRAMES["1d"]
+                closes[symbol] = (ts, bars.close)
+    if not closes:
+        return [], np.empty((0, 0))
+
+    timestamps = np.unique(np.concatenate([ts for ts, _ in closes.values()]))
+    prices = np.full((len(timestamps), len(closes)), np.nan)
+    for column, (ts, close) in enumerate(closes.values()):
+        prices[np.searchsorted(timestamps, ts), column] = close
+    # Carry the last close over sessions where a market was shut.
+    valid = np.where(np.isnan(prices), 0, np.arange(len(timestamps))[:, None])
+    np.maximum.accumulate(valid, axis=0, out=valid)
+    prices = prices[valid, np.arange(len(closes))]
+    returns = np.diff(np.log(prices), axis=0)
+    return list(closes), returns[~np.isnan(returns).any(axis=1)]
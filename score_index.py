@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from scoring import (
+    BASE_DIR,
+    HORIZONS,
+    RISK_BUDGETS,
+    SCORE_COLUMNS,
+    _MACRO_WEIGHTS,
+    _DECISION_BOUNDS,
+    _DECISION_LABELS,
+    _RATING_BOUNDS,
+    _RATING_LABELS,
+    _load_universe,
+    score_grid,
+)
+
+INDEX_FILE = os.path.join(BASE_DIR, "data", "scores.sqlite")
+
+KEY_COLUMNS = ["asset_class", "asset", "horizon", "risk_budget"]
+_COLUMNS = KEY_COLUMNS + ["seed"] + SCORE_COLUMNS + ["rating", "rating_rank", "decision"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scores (
+    asset_class TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    horizon TEXT NOT NULL,
+    risk_budget INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    {", ".join(f"{column} INTEGER NOT NULL" for column in SCORE_COLUMNS)},
+    rating TEXT NOT NULL,
+    rating_rank INTEGER NOT NULL,
+    decision TEXT NOT NULL,
+    UNIQUE (asset_class, asset, horizon, risk_budget)
+);
+CREATE INDEX IF NOT EXISTS scores_class_ranking ON scores (horizon, risk_budget, asset_class, composite DESC);
+CREATE INDEX IF NOT EXISTS scores_ranking ON scores (horizon, risk_budget, composite DESC);
+CREATE INDEX IF NOT EXISTS scores_composite ON scores (composite DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+@dataclass
+class SyncStats:
+    inserted: int
+    deleted: int
+    rows: int
+    full_rebuild: bool
+    elapsed_ms: float
+
+
+def _rating_rank(rating: str) -> int:
+    if rating not in _RATING_LABELS:
+        raise ValueError(f"Notation inconnue : {rating}")
+    return _RATING_LABELS.index(rating)
+
+
+def _composite_range(bounds: List[int], ranks: Iterable[int]) -> Tuple[Optional[int], Optional[int]]:
+    # Label i covers composite scores in [bounds[i - 1], bounds[i]); both
+    # rating and decision are monotone in the composite.
+    ranks = sorted(ranks)
+    low = bounds[ranks[0] - 1] if ranks[0] > 0 else None
+    high = bounds[ranks[-1]] if ranks[-1] < len(bounds) else None
+    return low, high
+
+
+def _where_sql(where: List[Tuple[str, List[Any]]]) -> Tuple[str, List[Any]]:
+    clauses = " AND ".join(clause for clause, _ in where) or "1"
+    return clauses, [param for _, values in where for param in values]
+
+
+class ScoreIndex:
+    """Precomputed scores for every asset × horizon × risk budget in SQLite.
+
+    sync() only scores the (asset, horizon, budget) rows that are missing
+    and drops the assets that left the universe; syncing a subset of
+    horizons or budgets leaves the others in place. Only a change of macro
+    weights invalidates every row. The ranking and screening queries are
+    answered from indexes."""
+
+    def __init__(self, path: str = INDEX_FILE) -> None:
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def _meta(self, key: str) -> Optional[Any]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def sync(
+        self,
+        universe: Optional[Dict[str, List[str]]] = None,
+        horizons: Iterable[str] = HORIZONS,
+        risk_budgets: Iterable[int] = RISK_BUDGETS,
+        macro_weights: Sequence[float] = _MACRO_WEIGHTS,
+    ) -> SyncStats:
+        start = time.perf_counter()
+        if universe is None:
+            universe = _load_universe()
+        horizons = list(dict.fromkeys(horizons))
+        risk_budgets = list(dict.fromkeys(int(budget) for budget in risk_budgets))
+        weights = [float(weight) for weight in macro_weights]
+        wanted = {(asset_class, asset) for asset_class, assets in universe.items() for asset in assets}
+
+        with self._lock, self._conn:
+            # A row's scores depend on its key and the macro weights only, so
+            # rows are diffed per (horizon, budget) slice; horizons and budgets
+            # outside this sync are another slice, not a change of inputs.
+            full_rebuild = self._meta("macro_weights") != weights
+            if full_rebuild:
+                self._conn.execute("DELETE FROM scores")
+            existing = set(self._conn.execute("SELECT DISTINCT asset_class, asset FROM scores"))
+            stale = existing - wanted
+            self._conn.executemany("DELETE FROM scores WHERE asset_class = ? AND asset = ?", stale)
+
+            missing: List[Tuple[str, str, str, int]] = []
+            for horizon in horizons:
+                for risk_budget in risk_budgets:
+                    params = (horizon, risk_budget)
+                    where = "FROM scores WHERE horizon = ? AND risk_budget = ?"
+                    # Stale assets are gone, so a full count means a complete slice.
+                    if self._conn.execute(f"SELECT COUNT(*) {where}", params).fetchone()[0] == len(wanted):
+                        continue
+                    present = set(self._conn.execute(f"SELECT asset_class, asset {where}", params))
+                    missing += [
+                        (asset_class, asset, horizon, risk_budget)
+                        for asset_class, assets in universe.items()
+                        for asset in dict.fromkeys(assets)
+                        if (asset_class, asset) not in present
+                    ]
+            inserted = 0
+            if missing:
+                scored = score_grid(pd.DataFrame(missing, columns=KEY_COLUMNS), weights)
+                scored["rating_rank"] = np.searchsorted(_RATING_BOUNDS, scored["composite"], side="right")
+                self._conn.executemany(
+                    f"INSERT INTO scores ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    scored[_COLUMNS].itertuples(index=False, name=None),
+                )
+                inserted = len(scored)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", ("macro_weights", json.dumps(weights))
+            )
+            rows = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+        return SyncStats(
+            inserted=inserted,
+            deleted=len(stale),
+            rows=rows,
+            full_rebuild=full_rebuild,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def _query(
+        self,
+        where: List[Tuple[str, List[Any]]],
+        order: str,
+        limit: Optional[int],
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        clauses, params = _where_sql(where)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM scores WHERE {clauses} ORDER BY {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else int(limit), int(offset)]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=_COLUMNS).drop(columns="rating_rank")
+
+    @staticmethod
+    def _filters(
+        asset_class: Optional[str],
+        horizon: Optional[str],
+        risk_budget: Optional[int],
+    ) -> List[Tuple[str, List[Any]]]:
+        where = []
+        if horizon is not None:
+            where.append(("horizon = ?", [horizon]))
+        if risk_budget is not None:
+            where.append(("risk_budget = ?", [int(risk_budget)]))
+        if asset_class is not None:
+            where.append(("asset_class = ?", [asset_class]))
+        return where
+
+    def top(
+        self,
+        k: int = 10,
+        by: str = "composite",
+        asset_class: Optional[str] = None,
+        horizon: Optional[str] = None,
+        risk_budget: Optional[int] = None,
+        offset: int = 0,
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        if by not in SCORE_COLUMNS:
+            raise ValueError(f"Score inconnu : {by}")
+        where = self._filters(asset_class, horizon, risk_budget)
+        # ORDER BY ... LIMIT k keeps a bounded k-row sorter rather than sorting
+        # every match, and the composite indexes avoid even that.
+        return self._query(where, f"{by} {'ASC' if ascending else 'DESC'}, asset", k, offset)
+
+    def count(
+        self,
+        asset_class: Optional[str] = None,
+        horizon: Optional[str] = None,
+        risk_budget: Optional[int] = None,
+    ) -> int:
+        where = self._filters(asset_class, horizon, risk_budget)
+        clauses, params = _where_sql(where)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM scores WHERE {clauses}", params).fetchone()[0]
+
+    def screen(
+        self,
+        min_rating: Optional[str] = None,
+        decision: Optional[Union[str, Sequence[str]]] = None,
+        asset_class: Optional[str] = None,
+        horizon: Optional[str] = None,
+        risk_budget: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        where = self._filters(asset_class, horizon, risk_budget)
+        ranges = []
+        if decision is not None:
+            decisions = [decision] if isinstance(decision, str) else list(decision)
+            unknown = [label for label in decisions if label not in _DECISION_LABELS]
+            if unknown:
+                raise ValueError(f"Décision inconnue : {unknown}")
+            where.append((f"decision IN ({', '.join('?' * len(decisions))})", decisions))
+            ranges.append(_composite_range(_DECISION_BOUNDS, [_DECISION_LABELS.index(label) for label in decisions]))
+        if min_rating is not None:
+            where.append(("rating_rank >= ?", [_rating_rank(min_rating)]))
+            ranges.append(_composite_range(_RATING_BOUNDS, [_rating_rank(min_rating), len(_RATING_BOUNDS)]))
+        # The equivalent composite range lets SQLite walk a composite index in
+        # order and stop after `limit` rows instead of sorting every match.
+        lows = [low for low, _ in ranges if low is not None]
+        highs = [high for _, high in ranges if high is not None]
+        if lows:
+            where.append(("composite >= ?", [max(lows)]))
+        if highs:
+            where.append(("composite < ?", [min(highs)]))
+        return self._query(where, "composite DESC, asset", limit, offset)
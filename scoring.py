@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tables import FactorTable, MacroFactor, Scenario, ScenarioTable
+
+ASSET_UNIVERSE = {
+    "Actions": ["AAPL", "MSFT", "NVDA", "TSLA", "LVMH.PA"],
+    "Indices": ["SPX", "NDX", "EUROSTOXX50", "NIKKEI225"],
+    "Obligations": ["US10Y", "US2Y", "BUND10Y", "OAT10Y"],
+    "Devises": ["EUR/USD", "USD/JPY", "GBP/USD", "USD/CNH"],
+    "Matières premières": ["Brent", "WTI", "Gold", "Copper"],
+    "Crypto": ["BTC", "ETH", "SOL", "XRP"],
+}
+
+HORIZONS = ["Court terme", "Moyen terme", "Long terme"]
+RISK_BUDGETS = list(range(1, 11))
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_FILE = os.path.join(BASE_DIR, "assets.json")
+SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
+
+
+@dataclass(frozen=True)
+class Instrument:
+    symbol: str
+    asset_class: str
+    name: str = ""
+    isin: str = ""
+
+
+@dataclass(slots=True)
+class ThesisBlock:
+    title: str
+    content: str
+
+
+def _stable_seed(text: str) -> int:
+    digest = hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
+    return int(digest, 16)
+
+
+def _score_to_rating(score: int) -> str:
+    if score >= 85:
+        return "AAA"
+    if score >= 75:
+        return "AA"
+    if score >= 65:
+        return "A"
+    if score >= 55:
+        return "BBB"
+    if score >= 45:
+        return "BB"
+    if score >= 35:
+        return "B"
+    return "D"
+
+
+def _score_to_decision(score: int) -> str:
+    if score >= 75:
+        return "Accumuler"
+    if score >= 60:
+        return "Conserver"
+    if score >= 45:
+        return "Réduire"
+    return "Short"
+
+
+_RATING_BOUNDS = [35, 45, 55, 65, 75, 85]
+_RATING_LABELS = ["D", "B", "BB", "BBB", "A", "AA", "AAA"]
+_DECISION_BOUNDS = [45, 60, 75]
+_DECISION_LABELS = ["Short", "Réduire", "Conserver", "Accumuler"]
+
+_MACRO_BASE_SCORES = [70, 64, 59, 61, 56, 67]
+_MACRO_LABELS = [
+    "Cycle économique",
+    "Politique monétaire",
+    "Inflation",
+    "Croissance PIB",
+    "Flux de capitaux",
+    "Risque géopolitique",
+]
+_MACRO_SIGNALS = [
+    "Expansion tardive",
+    "Restrictive mais prévisible",
+    "Désinflation graduelle",
+    "Croissance sous tendance",
+    "Flux sélectifs",
+    "Tensions régionales persistantes",
+]
+_MACRO_WEIGHTS = [0.2, 0.2, 0.15, 0.15, 0.15, 0.15]
+# The settings.json "macro_weights" key that weights each factor. Growth is
+# already "Croissance PIB"; the cycle is read through liquidity conditions.
+_MACRO_WEIGHT_KEYS = {
+    "Cycle économique": "liquidity",
+    "Politique monétaire": "rates",
+    "Inflation": "inflation",
+    "Croissance PIB": "growth",
+    "Flux de capitaux": "flows",
+    "Risque géopolitique": "geopolitics",
+}
+
+SCORE_COLUMNS = ["macro", "fundamental", "market", "portfolio", "hedge", "composite"]
+
+
+def _macro_weights(settings: Optional[Dict] = None) -> Tuple[float, ...]:
+    configured = (settings or {}).get("macro_weights", {})
+    return tuple(
+        float(configured.get(_MACRO_WEIGHT_KEYS[label], default))
+        for label, default in zip(_MACRO_LABELS, _MACRO_WEIGHTS)
+    )
+
+
+def _macro_factor_table(seeds: Sequence[int], weights: Sequence[float] = _MACRO_WEIGHTS) -> FactorTable:
+    adjustment = (np.asarray(seeds, dtype=np.int64) % 11) - 5
+    scores = np.clip(np.asarray(_MACRO_BASE_SCORES) + adjustment[:, None], 35, 90)
+    return FactorTable(_MACRO_LABELS, _MACRO_SIGNALS, weights, scores)
+
+
+@lru_cache(maxsize=16)
+def _macro_rows(weights: Tuple[float, ...]) -> List[List[MacroFactor]]:
+    # Factor scores only depend on seed % 11: one table row per residue.
+    table = _macro_factor_table(np.arange(11), weights)
+    return [table.row(index) for index in range(len(table))]
+
+
+def _make_macro_factors(seed: int, weights: Sequence[float] = _MACRO_WEIGHTS) -> List[MacroFactor]:
+    """Views onto the table row of `seed`; universe code uses _macro_factor_table."""
+    return list(_macro_rows(tuple(weights))[seed % 11])
+
+
+def _weighted_score(factors: List[MacroFactor]) -> int:
+    return int(sum(f.weight * f.score for f in factors))
+
+
+def _fundamental_score(seed: int, macro_score: int) -> int:
+    return max(40, min(90, macro_score + (seed % 7) - 3))
+
+
+def _market_score(seed: int, macro_score: int) -> int:
+    return max(35, min(90, macro_score + (seed % 9) - 4))
+
+
+def _live_market_score(market_score: int, momentum: float) -> int:
+    # Intraday move, in daily-volatility units, nudges the market score by up to ±5.
+    return max(35, min(90, market_score + int(max(-5, min(5, round(momentum))))))
+
+
+def _portfolio_score(seed: int, macro_score: int) -> int:
+    return max(35, min(90, macro_score + (seed % 5) - 2))
+
+
+def _hedge_score(seed: int, macro_score: int) -> int:
+    return max(35, min(90, macro_score + (seed % 11) - 5))
+
+
+def _composite_score(
+    macro_score: int,
+    fundamental_score: int,
+    market_score: int,
+    portfolio_score: int,
+    hedge_score: int,
+) -> int:
+    return int(
+        0.25 * macro_score
+        + 0.3 * fundamental_score
+        + 0.2 * market_score
+        + 0.15 * portfolio_score
+        + 0.1 * hedge_score
+    )
+
+
+def _sub_scores(seed: int, macro_score: int) -> Dict[str, int]:
+    fundamental_score = _fundamental_score(seed, macro_score)
+    market_score = _market_score(seed, macro_score)
+    portfolio_score = _portfolio_score(seed, macro_score)
+    hedge_score = _hedge_score(seed, macro_score)
+    composite_score = _composite_score(macro_score, fundamental_score, market_score, portfolio_score, hedge_score)
+    return {
+        "macro": macro_score,
+        "fundamental": fundamental_score,
+        "market": market_score,
+        "portfolio": portfolio_score,
+        "hedge": hedge_score,
+        "composite": composite_score,
+    }
+
+
+def _instrument(asset_class: str, entry: Union[str, Dict[str, str]]) -> Instrument:
+    # assets.json entries are either a bare ticker or {"ticker", "name", "isin"}.
+    if isinstance(entry, str):
+        return Instrument(entry, asset_class)
+    return Instrument(entry["ticker"], asset_class, entry.get("name", ""), entry.get("isin", ""))
+
+
+def _load_instruments(path: str = ASSETS_FILE) -> List[Instrument]:
+    instruments = {
+        (asset_class, asset): Instrument(asset, asset_class)
+        for asset_class, assets in ASSET_UNIVERSE.items()
+        for asset in assets
+    }
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as handle:
+            extra = json.load(handle)
+        for asset_class, entries in extra.items():
+            for entry in entries:
+                instrument = _instrument(asset_class, entry)
+                key = (asset_class, instrument.symbol)
+                # A known symbol keeps its position; the file only adds its name and ISIN.
+                if key not in instruments or instrument.name or instrument.isin:
+                    instruments[key] = instrument
+    return list(instruments.values())
+
+
+def _load_universe(path: str = ASSETS_FILE) -> Dict[str, List[str]]:
+    universe: Dict[str, List[str]] = {asset_class: [] for asset_class in ASSET_UNIVERSE}
+    for instrument in _load_instruments(path):
+        universe.setdefault(instrument.asset_class, []).append(instrument.symbol)
+    return universe
+
+
+def _load_settings(path: str = SETTINGS_FILE) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _universe_grid(
+    universe: Dict[str, List[str]],
+    horizons: Iterable[str],
+    risk_budgets: Iterable[int],
+) -> pd.DataFrame:
+    rows = [
+        (asset_class, asset, horizon, risk_budget)
+        for asset_class, assets in universe.items()
+        for asset in assets
+        for horizon in horizons
+        for risk_budget in risk_budgets
+    ]
+    return pd.DataFrame(rows, columns=["asset_class", "asset", "horizon", "risk_budget"])
+
+
+def _score_arrays(seeds: np.ndarray, weights: Sequence[float] = _MACRO_WEIGHTS) -> Dict[str, np.ndarray]:
+    # Mirrors _weighted_score/_sub_scores term by term so the float64
+    # accumulation order (and therefore every truncation) is identical.
+    macro = _macro_factor_table(seeds, weights).weighted_scores()
+
+    fundamental = np.clip(macro + (seeds % 7) - 3, 40, 90)
+    market = np.clip(macro + (seeds % 9) - 4, 35, 90)
+    portfolio = np.clip(macro + (seeds % 5) - 2, 35, 90)
+    hedge = np.clip(macro + (seeds % 11) - 5, 35, 90)
+    composite = (0.25 * macro + 0.3 * fundamental + 0.2 * market + 0.15 * portfolio + 0.1 * hedge).astype(np.int64)
+    return {
+        "macro": macro,
+        "fundamental": fundamental,
+        "market": market,
+        "portfolio": portfolio,
+        "hedge": hedge,
+        "composite": composite,
+    }
+
+
+def _ratings(scores: np.ndarray) -> np.ndarray:
+    return np.asarray(_RATING_LABELS, dtype=object)[np.searchsorted(_RATING_BOUNDS, scores, side="right")]
+
+
+def _decisions(scores: np.ndarray) -> np.ndarray:
+    return np.asarray(_DECISION_LABELS, dtype=object)[np.searchsorted(_DECISION_BOUNDS, scores, side="right")]
+
+
+def score_universe(
+    universe: Optional[Dict[str, List[str]]] = None,
+    horizons: Iterable[str] = HORIZONS,
+    risk_budgets: Iterable[int] = RISK_BUDGETS,
+    macro_weights: Sequence[float] = _MACRO_WEIGHTS,
+) -> pd.DataFrame:
+    if universe is None:
+        universe = _load_universe()
+    return score_grid(_universe_grid(universe, list(horizons), list(risk_budgets)), macro_weights)
+
+
+def score_grid(grid: pd.DataFrame, macro_weights: Sequence[float] = _MACRO_WEIGHTS) -> pd.DataFrame:
+    """Scores the (asset_class, asset, horizon, risk_budget) rows of `grid` in place."""
+    keys = (
+        grid["asset_class"] + "-" + grid["asset"] + "-" + grid["horizon"] + "-" + grid["risk_budget"].astype(str)
+    )
+    seeds = np.fromiter((_stable_seed(key) for key in keys), dtype=np.int64, count=len(keys))
+    scores = _score_arrays(seeds, macro_weights)
+
+    grid["seed"] = seeds
+    for column in SCORE_COLUMNS:
+        grid[column] = scores[column]
+    grid["rating"] = _ratings(scores["composite"])
+    grid["decision"] = _decisions(scores["composite"])
+    return grid
+
+
+def _reported(value: float, fmt: str, scale: float = 1.0) -> str:
+    return "n.d." if value != value else fmt.format(value * scale)
+
+
+def _fundamental_metrics(seed: int, reported: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    adj = (seed % 9) - 4
+    roe = 17.5 + adj
+    margin = 22.5 + (adj // 2)
+    leverage = 1.4 + (adj / 20)
+    growth = 7.5 + (adj / 2)
+    valuation = 21 + adj
+    fcf = 12 + (adj / 3)
+    if reported:
+        # Ratios from the fundamentals store are fractions and multiples; a
+        # ratio the statements cannot support (NaN) is shown as such.
+        return {
+            "ROE": _reported(reported["roe"], "{:.1f}%", 100),
+            "Marge opérationnelle": _reported(reported["operating_margin"], "{:.1f}%", 100),
+            "FCF yield": _reported(reported["fcf_yield"], "{:.1f}%", 100),
+            "Levier net": _reported(reported["net_leverage"], "{:.2f}x"),
+            "Croissance CA 3a": _reported(reported["revenue_growth_3y"], "{:.1f}%", 100),
+            "EV/EBITDA": _reported(reported["ev_ebitda"], "{:.1f}x"),
+        }
+    return {
+        "ROE": f"{roe:.1f}%",
+        "Marge opérationnelle": f"{margin:.1f}%",
+        "FCF yield": f"{fcf:.1f}%",
+        "Levier net": f"{leverage:.2f}x",
+        "Croissance CA 3a": f"{growth:.1f}%",
+        "EV/EBITDA": f"{valuation:.1f}x",
+    }
+
+
+def _market_signals(
+    seed: int, live: Optional[Dict[str, float]] = None, curve_signals: Optional[Dict[str, float]] = None
+) -> Dict[str, str]:
+    adj = (seed % 7) - 3
+    curve = curve_signals["slope_2s10s"] if curve_signals else 12 + adj
+    credit = 135 + adj * 5
+    corr = 0.55 + adj * 0.02
+    vol = 18 + adj
+    if live:
+        corr = live.get("correlation", corr)
+        vol = live["volatility"] * 100 if "volatility" in live else vol
+    return {
+        "Pente de courbe": f"{curve:.1f} pb",
+        "Spread crédit": f"{credit} pb",
+        "Corrélation cross-asset": f"{corr:.2f}",
+        "Volatilité implicite": f"{vol:.1f}%",
+        "Régime": "Risk-on sélectif",
+    }
+
+
+def _portfolio_metrics(
+    seed: int, live: Optional[Dict[str, float]] = None, risk: Optional[Dict[str, float]] = None
+) -> Dict[str, str]:
+    adj = (seed % 5) - 2
+    sharpe = 1.05 + adj * 0.1
+    sortino = 1.35 + adj * 0.12
+    drawdown = 8.5 + adj
+    diversification = 0.6 + adj * 0.02
+    liquidity = 2.4 + adj * 0.1
+    if live:
+        diversification = live["diversification"]
+    metrics = {
+        "Sharpe": f"{sharpe:.2f}",
+        "Sortino": f"{sortino:.2f}",
+        "Max drawdown": f"-{drawdown:.1f}%",
+        "Diversification effective": f"{diversification:.2f}",
+        "Budget liquidité": f"{liquidity:.2f}x",
+    }
+    if risk:
+        # Measured on the price history: rolling-window drawdown and the
+        # headroom of the one-day VaR under the risk budget's limit.
+        metrics["Max drawdown"] = f"-{risk['max_drawdown'] * 100:.1f}%"
+        del metrics["Budget liquidité"]
+        metrics["Marge budget VaR"] = f"{risk['var_limit'] / risk['var']:.2f}x" if risk["var"] > 0 else "n.d."
+    return metrics
+
+
+def _hedge_signals(seed: int) -> Dict[str, str]:
+    adj = (seed % 6) - 3
+    asym = 1.3 + adj * 0.1
+    catalyst = "Résultats + guidance" if seed % 2 == 0 else "Macro surprise + positioning"
+    stress = "Moderate" if seed % 3 == 0 else "Elevated"
+    return {
+        "Asymétrie rendement/risque": f"{asym:.2f}",
+        "Inefficiences détectées": "Dispersion + microstructure",
+        "Catalyseur": catalyst,
+        "Stress de liquidité": stress,
+    }
+
+
+_SCENARIO_NAMES = ["Scénario central", "Scénario haussier", "Scénario baissier"]
+_SCENARIO_NARRATIVES = [
+    "Normalisation progressive et croissance modérée.",
+    "Désinflation rapide et regain d'appétit au risque.",
+    "Choc de liquidité et stress de crédit.",
+]
+
+
+def _scenario_table(seeds: Sequence[int], probabilities: Optional[np.ndarray] = None) -> ScenarioTable:
+    """The given (n, 3) central/bull/bear probabilities, such as the Monte
+    Carlo ones, or else the seed's default split."""
+    if probabilities is None:
+        base = np.asarray(seeds, dtype=np.int64) % 10
+        central = 55 + (base - 5)
+        bull = 25 - (base - 5) // 2
+        probabilities = np.column_stack((central, bull, 100 - central - bull))
+    return ScenarioTable(_SCENARIO_NAMES, _SCENARIO_NARRATIVES, probabilities)
+
+
+@lru_cache(maxsize=1)
+def _default_scenario_rows() -> List[List[Scenario]]:
+    # The default split only depends on seed % 10: one table row per residue.
+    table = _scenario_table(np.arange(10))
+    return [table.row(index) for index in range(len(table))]
+
+
+def _scenarios(seed: int, probabilities: Optional[Sequence[float]] = None) -> List[Scenario]:
+    """Views onto a one-row table of `probabilities`, or onto the seed's
+    default row."""
+    if probabilities is None:
+        return list(_default_scenario_rows()[seed % 10])
+    return _scenario_table([seed], np.asarray([probabilities], dtype=np.float64)).row(0)
+
+
+def _thesis_blocks(seed: int) -> List[ThesisBlock]:
+    risk_focus = "corrélations élevées" if seed % 2 == 0 else "fragilité du crédit"
+    return [
+        ThesisBlock(
+            "Thèse d'investissement",
+            "Prime de qualité justifiée par la résilience cash-flow et le pricing power.",
+        ),
+        ThesisBlock(
+            "Risques prioritaires",
+            f"Durcissement financier, {risk_focus}, liquidité asymétrique.",
+        ),
+        ThesisBlock(
+            "Catalyseurs",
+            "Normalisation macro, re-rating sélectif, rotation vers actifs défensifs.",
+        ),
+    ]
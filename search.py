@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from scoring import Instrument
+
+# Key kinds, best first: a ticker hit outranks an ISIN hit, which outranks a name hit.
+_TICKER, _ISIN, _NAME = 0, 1, 2
+
+_WORD = re.compile(r"[^\W_]+")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def _normalize(text: str) -> str:
+    """Case- and accent-insensitive, punctuation dropped: "EUR/USD" and
+    "eurusd" are the same key, "Nestlé" matches "nestle"."""
+    if text.isascii():
+        return _SEPARATORS.sub("", text).lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if char.isalnum() and not unicodedata.combining(char)).casefold()
+
+
+def _words(kind: int, text: str) -> Iterator[Tuple[Tuple[int, int], str]]:
+    # The whole text, then the text from each later word on, ranked after
+    # it: "Moët" finds LVMH, "usd" finds EUR/USD, "hy oas" finds US HY OAS.
+    words = [_normalize(word) for word in _WORD.findall(text)]
+    yield (kind, 0), "".join(words)
+    for start in range(1, len(words)):
+        if len(words[start]) > 1:
+            yield (kind, 1), "".join(words[start:])
+
+
+def _keys(instrument: Instrument) -> Iterator[Tuple[Tuple[int, int], str]]:
+    yield from _words(_TICKER, instrument.symbol)
+    if instrument.isin:
+        yield (_ISIN, 0), _normalize(instrument.isin)
+    if instrument.name:
+        yield from _words(_NAME, instrument.name)
+
+
+def _max_edits(query: str) -> int:
+    if len(query) < 3:
+        return 0
+    return 1 if len(query) < 8 else 2
+
+
+class _Node:
+    __slots__ = ("children", "ids", "tails")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # The best-ranked instruments of the whole subtree, at most `fanout`.
+        self.ids: List[int] = []
+        # At the maximum depth only: the rest of every key below, each
+        # distinct suffix once (name words repeat across instruments).
+        self.tails: Dict[str, List[int]] = {}
+
+
+class SymbolIndex:
+    """Prefix trie over tickers, ISINs and name words, with fuzzy fallback.
+
+    Every node keeps the top `fanout` instruments of its subtree in rank
+    order, so a prefix lookup is a walk of len(query) nodes and no scan.
+    Past `depth` characters keys are kept as plain suffixes on the last
+    node: ISINs and long names branch on every character, and nodes for
+    them would cost far more than filtering a handful of suffixes.
+
+    When the prefix matches nothing, the trie is walked again from the
+    query's first character with an edit-distance row per node, pruned as
+    soon as the row's minimum exceeds the allowed edits, which finds
+    "nivdia" or "aple" without visiting branches that cannot match."""
+
+    def __init__(self, instruments: Sequence[Instrument], fanout: int = 32, depth: int = 6) -> None:
+        self.instruments = list(instruments)
+        self.fanout = fanout
+        self.depth = depth
+        self._root = _Node()
+        self.nodes = 1
+        entries = [
+            (rank, len(key), position, key)
+            for position, instrument in enumerate(self.instruments)
+            for rank, key in _keys(instrument)
+            if key
+        ]
+        # Inserted best first, so the first `fanout` ids reaching a node are its top ones.
+        entries.sort()
+        for _, _, position, key in entries:
+            self._insert(key, position)
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def _insert(self, key: str, position: int) -> None:
+        node = self._root
+        self._add(node, position)
+        for char in key[: self.depth]:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+                self.nodes += 1
+            node = child
+            self._add(node, position)
+        if len(key) > self.depth:
+            node.tails.setdefault(key[self.depth :], []).append(position)
+
+    def _add(self, node: _Node, position: int) -> None:
+        ids = node.ids
+        if len(ids) < self.fanout and position not in ids:
+            ids.append(position)
+
+    def _prefix(self, query: str) -> List[int]:
+        node: Optional[_Node] = self._root
+        for char in query[: self.depth]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if len(query) <= self.depth:
+            return node.ids
+        rest = query[self.depth :]
+        matches = (positions for tail, positions in node.tails.items() if tail.startswith(rest))
+        return list(dict.fromkeys(position for positions in matches for position in positions))
+
+    @staticmethod
+    def _row(query: str, char: str, previous: List[int], before: Optional[List[int]], previous_char: str) -> List[int]:
+        """Next row of the optimal-string-alignment distance: Levenshtein
+        plus adjacent transpositions, so "nivdia" is one edit from "nvidia"."""
+        row = [previous[0] + 1]
+        for column, query_char in enumerate(query, 1):
+            cost = min(row[column - 1] + 1, previous[column] + 1, previous[column - 1] + (query_char != char))
+            if before is not None and column > 1 and query_char == previous_char and query[column - 2] == char:
+                cost = min(cost, before[column - 2] + 1)
+            row.append(cost)
+        return row
+
+    def _fuzzy(self, query: str, max_edits: int) -> List[Tuple[int, int, List[int]]]:
+        """(edits, depth, ids) of every trie path or key suffix within
+        `max_edits` of `query`. The first character is taken as typed."""
+        start = self._root.children.get(query[0])
+        if start is None:
+            return []
+        hits = []
+        first_row = list(range(len(query) + 1))
+        stack = [(start, self._row(query, query[0], first_row, None, ""), first_row, query[0], 1)]
+        while stack:
+            node, row, previous, char, depth = stack.pop()
+            if row[-1] <= max_edits:
+                hits.append((row[-1], depth, node.ids))
+            if min(row) > max_edits:
+                continue
+            stack.extend(
+                (child, self._row(query, next_char, row, previous, char), row, next_char, depth + 1)
+                for next_char, child in node.children.items()
+            )
+            for tail, positions in node.tails.items():
+                tail_row, tail_previous, tail_char = row, previous, char
+                for offset, next_char in enumerate(tail, 1):
+                    tail_row, tail_previous = self._row(query, next_char, tail_row, tail_previous, tail_char), tail_row
+                    tail_char = next_char
+                    if tail_row[-1] <= max_edits:
+                        hits.append((tail_row[-1], depth + offset, positions))
+                    if min(tail_row) > max_edits:
+                        break
+        return hits
+
+    def search(self, query: str, limit: int = 20) -> List[Instrument]:
+        """The `limit` best matches for a partial ticker, ISIN or name; the
+        first instruments of the universe for an empty query."""
+        key = _normalize(query)
+        if not key:
+            return self.instruments[:limit]
+        found = list(self._prefix(key)[:limit])
+        max_edits = _max_edits(key)
+        # Fuzzy only once the prefix matches nothing: the user has mistyped,
+        # not merely narrowed the list down to a few instruments.
+        if not found and max_edits:
+            seen = set()
+            # Fewest edits first; at equal edits the longer match is the more specific.
+            for edits, depth, ids in sorted(self._fuzzy(key, max_edits), key=lambda hit: (hit[0], -hit[1])):
+                for position in ids:
+                    if position not in seen:
+                        seen.add(position)
+                        found.append(position)
+                if len(found) >= limit:
+                    break
+        return [self.instruments[position] for position in found[:limit]]
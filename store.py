@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from scoring import BASE_DIR
+
+STORE_DIR = os.path.join(BASE_DIR, "data", "ohlcv")
+
+COLUMNS = {
+    "ts": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+TIMEFRAMES = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+_META_FILE = "meta.json"
+
+
+@dataclass
+class Bars:
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(
+            {column: getattr(self, column) for column in COLUMNS if column != "ts"},
+            index=pd.to_datetime(self.ts, unit="ms", utc=True),
+            copy=False,
+        )
+        frame.index.name = "ts"
+        return frame
+
+
+class OHLCVStore:
+    """Append-only columnar bar store: one raw little-endian file per column,
+    one directory per symbol/timeframe, read back through np.memmap."""
+
+    def __init__(self, root: str = STORE_DIR) -> None:
+        self.root = root
+
+    def _series_dir(self, symbol: str, timeframe: str) -> str:
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Timeframe inconnu : {timeframe}")
+        return os.path.join(self.root, quote(symbol, safe=""), timeframe)
+
+    def _read_meta(self, path: str) -> Dict:
+        meta_path = os.path.join(path, _META_FILE)
+        if not os.path.exists(meta_path):
+            return {"rows": 0, "first_ts": None, "last_ts": None}
+        with open(meta_path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _write_meta(self, path: str, meta: Dict) -> None:
+        tmp_path = os.path.join(path, _META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, os.path.join(path, _META_FILE))
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(unquote(name) for name in os.listdir(self.root))
+
+    def timeframes(self, symbol: str) -> List[str]:
+        path = os.path.join(self.root, quote(symbol, safe=""))
+        if not os.path.isdir(path):
+            return []
+        return [timeframe for timeframe in TIMEFRAMES if os.path.isdir(os.path.join(path, timeframe))]
+
+    def rows(self, symbol: str, timeframe: str) -> int:
+        return self._read_meta(self._series_dir(symbol, timeframe))["rows"]
+
+    def last_ts(self, symbol: str, timeframe: str) -> Optional[int]:
+        return self._read_meta(self._series_dir(symbol, timeframe))["last_ts"]
+
+    def append(self, symbol: str, timeframe: str, bars: Mapping[str, np.ndarray]) -> int:
+        path = self._series_dir(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta(path)
+
+        ts = np.asarray(bars["ts"], dtype=COLUMNS["ts"])
+        if len(ts) > 1 and np.any(np.diff(ts) <= 0):
+            raise ValueError("Les timestamps doivent être strictement croissants")
+        start = 0 if meta["last_ts"] is None else int(np.searchsorted(ts, meta["last_ts"], side="right"))
+        if start == len(ts):
+            return 0
+
+        rows = meta["rows"]
+        for column, dtype in COLUMNS.items():
+            values = np.ascontiguousarray(np.asarray(bars[column])[start:], dtype=dtype)
+            with open(os.path.join(path, f"{column}.bin"), "ab") as handle:
+                # Drop bytes from a write that crashed before its meta update.
+                handle.truncate(rows * dtype.itemsize)
+                handle.write(values.tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        self._write_meta(
+            path,
+            {
+                "rows": rows + len(ts) - start,
+                "first_ts": int(ts[start]) if meta["first_ts"] is None else meta["first_ts"],
+                "last_ts": int(ts[-1]),
+            },
+        )
+        return len(ts) - start
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Bars:
+        path = self._series_dir(symbol, timeframe)
+        rows = self._read_meta(path)["rows"]
+        if rows == 0:
+            return Bars(**{column: np.empty(0, dtype=dtype) for column, dtype in COLUMNS.items()})
+
+        columns = {
+            column: np.memmap(os.path.join(path, f"{column}.bin"), dtype=dtype, mode="r", shape=(rows,))
+            for column, dtype in COLUMNS.items()
+        }
+        ts = columns["ts"]
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side="left"))
+        hi = rows if end_ms is None else int(np.searchsorted(ts, end_ms, side="right"))
+        return Bars(**{column: values[lo:hi] for column, values in columns.items()})
+
+    def read_frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> pd.DataFrame:
+        return self.read(symbol, timeframe, start_ms, end_ms).to_frame()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class MacroFactor:
+    """One factor of one asset: a slotted view onto a FactorTable row.
+
+    Label and signal are read from the table's per-factor columns; weight
+    and score feed every composite, so they are read once when the row is
+    viewed."""
+
+    __slots__ = ("table", "index", "column", "weight", "score")
+
+    def __init__(self, table: "FactorTable", index: int, column: int, weight: float, score: int) -> None:
+        self.table = table
+        self.index = index
+        self.column = column
+        self.weight = weight
+        self.score = score
+
+    @property
+    def label(self) -> str:
+        return self.table.labels[self.column]
+
+    @property
+    def signal(self) -> str:
+        return self.table.signals[self.column]
+
+    def __repr__(self) -> str:
+        return f"MacroFactor(label={self.label!r}, signal={self.signal!r}, weight={self.weight}, score={self.score})"
+
+
+class Scenario:
+    """One scenario of one asset: a slotted view onto a ScenarioTable row."""
+
+    __slots__ = ("table", "index", "column", "probability")
+
+    def __init__(self, table: "ScenarioTable", index: int, column: int, probability: float) -> None:
+        self.table = table
+        self.index = index
+        self.column = column
+        self.probability = probability
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.column]
+
+    @property
+    def narrative(self) -> str:
+        return self.table.narratives[self.column]
+
+    def __repr__(self) -> str:
+        return f"Scenario(name={self.name!r}, probability={self.probability}, narrative={self.narrative!r})"
+
+
+class FactorTable:
+    """Factor scores of n assets × k factors as one uint8 matrix (scores are
+    0–100). Labels, signals and weights are per factor and shared by every
+    asset, so an asset costs k bytes instead of k Python objects."""
+
+    __slots__ = ("labels", "signals", "weights", "weight_values", "scores")
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        signals: Sequence[str],
+        weights: Sequence[float],
+        scores: np.ndarray,
+    ) -> None:
+        self.labels = tuple(labels)
+        self.signals = tuple(signals)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        # Per factor, not per asset: plain floats keep record access cheap.
+        self.weight_values = self.weights.tolist()
+        self.scores = np.asarray(scores, dtype=np.uint8)
+        if self.scores.ndim != 2 or self.scores.shape[1] != len(self.labels):
+            raise ValueError(f"Scores attendus de forme (n, {len(self.labels)}), reçu {self.scores.shape}")
+
+    def __len__(self) -> int:
+        return self.scores.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.scores.nbytes + self.weights.nbytes
+
+    def weighted_scores(self) -> np.ndarray:
+        # Accumulates factor by factor, like sum() over the records, so every
+        # int() truncation matches the per-asset computation.
+        total = np.zeros(len(self))
+        for column, weight in enumerate(self.weights):
+            total = total + weight * self.scores[:, column]
+        return total.astype(np.int64)
+
+    def row(self, index: int) -> List[MacroFactor]:
+        scores = self.scores[index].tolist()
+        return [
+            MacroFactor(self, index, column, weight, score)
+            for column, (weight, score) in enumerate(zip(self.weight_values, scores))
+        ]
+
+    def to_frame(self, index: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """Assets × factors, sharing the score buffer (no copy)."""
+        return pd.DataFrame(self.scores, index=index, columns=list(self.labels), copy=False)
+
+    def asset_frame(self, index: int) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "label": self.labels,
+                "signal": self.signals,
+                "weight": self.weights,
+                "score": self.scores[index],
+            }
+        )
+
+
+class ScenarioTable:
+    """Scenario probabilities of n assets × k scenarios as one float64
+    matrix; names and narratives are per scenario, shared by every asset."""
+
+    __slots__ = ("names", "narratives", "probabilities")
+
+    def __init__(self, names: Sequence[str], narratives: Sequence[str], probabilities: np.ndarray) -> None:
+        self.names = tuple(names)
+        self.narratives = tuple(narratives)
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        if self.probabilities.ndim != 2 or self.probabilities.shape[1] != len(self.names):
+            raise ValueError(
+                f"Probabilités attendues de forme (n, {len(self.names)}), reçu {self.probabilities.shape}"
+            )
+
+    def __len__(self) -> int:
+        return self.probabilities.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.probabilities.nbytes
+
+    def row(self, index: int) -> List[Scenario]:
+        return [
+            Scenario(self, index, column, probability)
+            for column, probability in enumerate(self.probabilities[index].tolist())
+        ]
+
+    def to_frame(self, index: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """Assets × scenarios, sharing the probability buffer (no copy)."""
+        return pd.DataFrame(self.probabilities, index=index, columns=list(self.names), copy=False)
+
+    def asset_frame(self, index: int) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "name": self.names,
+                "probability": self.probabilities[index],
+                "narrative": self.narratives,
+            }
+        )
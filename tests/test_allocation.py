@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from allocation import AllocationEngine, mean_variance, proxy_covariance, risk_parity, target_volatility
+from scoring import ASSET_UNIVERSE
+
+
+def _covariance(n_assets: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.1, (n_assets, 3))
+    return factors @ factors.T + np.diag(rng.uniform(0.01, 0.09, n_assets))
+
+
+@pytest.mark.parametrize("n_assets", [2, 7, 40])
+def test_risk_parity_equalises_risk_contributions(n_assets):
+    cov = _covariance(n_assets)
+    weights, _ = risk_parity(cov)
+    contributions = weights * (cov @ weights)
+    assert weights.sum() == pytest.approx(1.0) and np.all(weights > 0)
+    np.testing.assert_allclose(contributions / contributions.sum(), 1 / n_assets, atol=1e-7)
+
+    budgets = np.arange(1, n_assets + 1, dtype=float)
+    weights, _ = risk_parity(cov, budgets)
+    contributions = weights * (cov @ weights)
+    np.testing.assert_allclose(contributions / contributions.sum(), budgets / budgets.sum(), atol=1e-7)
+
+
+def test_risk_parity_warm_start_converges_faster():
+    cov = _covariance(40, seed=1)
+    weights, cold = risk_parity(cov)
+    again, warm = risk_parity(cov * 1.01, x0=weights)
+    assert warm < cold
+    np.testing.assert_allclose(again, weights, atol=1e-6)
+
+
+def test_mean_variance_matches_the_closed_form_inside_the_box():
+    cov = _covariance(5, seed=2)
+    mu = np.array([0.01, 0.02, 0.0, 0.015, 0.005])
+    weights, _ = mean_variance(cov, mu, risk_aversion=4.0, tol=1e-12, max_iter=100_000)
+    # Interior optimum: λΣw - μ = ν·1 with Σw = 1.
+    inverse = np.linalg.inv(cov)
+    ones = np.ones(5)
+    nu = (4.0 - ones @ inverse @ mu) / (ones @ inverse @ ones)
+    expected = inverse @ (mu + nu) / 4.0
+    assert np.all((expected > 0) & (expected < 1))
+    np.testing.assert_allclose(weights, expected, atol=1e-6)
+
+    capped, _ = mean_variance(cov, mu * 50, risk_aversion=1.0, upper=0.3)
+    assert capped.sum() == pytest.approx(1.0) and capped.max() <= 0.3 + 1e-12 and capped.min() >= 0
+
+
+def test_engine_holds_cash_above_the_target_volatility():
+    cov = proxy_covariance(ASSET_UNIVERSE)
+    result = AllocationEngine().allocate(cov, np.zeros(len(cov)), 2, "Moyen terme")
+    assert result.cash > 0
+    assert result.volatility == pytest.approx(target_volatility(2))
+    assert np.sqrt(result.weights @ cov @ result.weights) == pytest.approx(result.volatility)
+    assert result.weights.sum() + result.cash == pytest.approx(1.0)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from backtest import (
+    DECISION_POSITIONS,
+    RATING_POSITIONS,
+    backtest,
+    collect_statistics,
+    evaluate_grid,
+    rule_statistics,
+)
+from scoring import _DECISION_BOUNDS, _RATING_BOUNDS, _RATING_LABELS, _score_to_decision, _score_to_rating
+
+COST_BPS = 5.0
+
+
+def _market(days: int = 120, assets: int = 9, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    scores = np.clip(55 + np.cumsum(rng.normal(0, 6, (days, assets)), axis=0), 0, 100).round()
+    prices = 100 * np.cumprod(1 + rng.normal(0.0005, 0.015, (days, assets)), axis=0)
+    return scores, prices
+
+
+def _scalar_pnl(scores, prices, position_of):
+    """The decision rule applied asset by asset, day by day."""
+    days, assets = scores.shape
+    pnl = np.zeros((days - 1, assets))
+    for asset in range(assets):
+        previous = None
+        for day in range(days - 1):
+            held = position_of(int(scores[day, asset]))
+            cost = 0.0 if previous is None else abs(held - previous) * COST_BPS * 1e-4
+            pnl[day, asset] = held * (prices[day + 1, asset] / prices[day, asset] - 1) - cost
+            previous = held
+    return pnl
+
+
+def test_backtest_agrees_with_the_scalar_decision_rules():
+    scores, prices = _market()
+    pnl = _scalar_pnl(scores, prices, lambda score: DECISION_POSITIONS[_score_to_decision(score)])
+    result = backtest(scores, prices, cost_bps=COST_BPS)
+    np.testing.assert_allclose(result.assets["total_return"], np.prod(1 + pnl, axis=0) - 1)
+    np.testing.assert_allclose(result.equity, np.cumprod(1 + pnl.mean(axis=1)))
+
+
+def test_rating_rules_agree_with_the_scalar_ratings():
+    scores, prices = _market(seed=1)
+    pnl = _scalar_pnl(scores, prices, lambda score: RATING_POSITIONS[_score_to_rating(score)])
+    result = backtest(scores, prices, _RATING_BOUNDS, RATING_POSITIONS, _RATING_LABELS, COST_BPS)
+    np.testing.assert_allclose(result.equity, np.cumprod(1 + pnl.mean(axis=1)))
+
+
+def test_grid_evaluation_matches_a_direct_backtest():
+    scores, prices = _market(seed=2)
+    grid = [tuple(_DECISION_BOUNDS), (40, 55, 80), (20, 50, 95)]
+    stats = rule_statistics(scores, prices)
+    chunked = collect_statistics(scores, prices, chunk_assets=4)
+    np.testing.assert_allclose(chunked.returns_by_score, stats.returns_by_score)
+    np.testing.assert_array_equal(chunked.crossings, stats.crossings)
+
+    frame = evaluate_grid(chunked, grid, cost_bps=COST_BPS).set_index("bounds")
+    for bounds in grid:
+        direct = backtest(scores, prices, bounds, cost_bps=COST_BPS).portfolio
+        row = frame.loc[[bounds]].iloc[0]
+        for metric in ("sharpe", "annual_return", "max_drawdown", "hit_rate", "turnover"):
+            assert row[metric] == pytest.approx(direct[metric], rel=1e-9, abs=1e-12), (bounds, metric)
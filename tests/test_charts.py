@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from charts import chart_series, lttb, minmax
+from store import TIMEFRAMES, OHLCVStore
+
+START = 1_735_689_600_000  # 2025-01-01 00:00 UTC
+
+
+def _walk(n: int, seed: int = 0) -> np.ndarray:
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+
+
+def _naive_lttb(x, y, n_out):
+    """Textbook LTTB, one bucket and one point at a time."""
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept, anchor = [0], 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            following = range(edges[bucket + 1], edges[bucket + 2])
+            mean_x = sum(x[i] for i in following) / len(following)
+            mean_y = sum(y[i] for i in following) / len(following)
+        else:
+            mean_x, mean_y = x[-1], y[-1]
+        best, best_area = lo, -1.0
+        for i in range(lo, hi):
+            area = abs((x[anchor] - mean_x) * (y[i] - y[anchor]) - (x[anchor] - x[i]) * (mean_y - y[anchor]))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        anchor = best
+    return np.array(kept + [n - 1])
+
+
+@pytest.mark.parametrize("n, n_out", [(1_000, 50), (997, 101), (10, 9), (5, 3)])
+def test_lttb_keeps_the_endpoints_and_matches_the_textbook_loop(n, n_out):
+    x = np.arange(n, dtype=float) * 60
+    y = _walk(n)
+    kept = lttb(x, y, n_out)
+    assert len(kept) == n_out and kept[0] == 0 and kept[-1] == n - 1
+    assert np.all(np.diff(kept) > 0)
+    np.testing.assert_array_equal(kept, _naive_lttb(x, y, n_out))
+    np.testing.assert_array_equal(lttb(x, y, n + 5), np.arange(n))
+
+
+def test_minmax_keeps_every_extreme():
+    y = _walk(5_003, seed=1)
+    y[1_234] = 1e6
+    kept = minmax(y, 200)
+    assert {0, len(y) - 1, int(np.argmin(y)), 1_234} <= set(kept.tolist())
+    assert len(kept) <= 202 and np.all(np.diff(kept) > 0)
+
+
+def test_chart_reads_the_coarsest_dense_timeframe(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    for timeframe, count in (("1h", 24 * 400), ("1d", 400)):
+        ts = START + np.arange(count) * TIMEFRAMES[timeframe]
+        close = _walk(count, seed=2)
+        bars = {"ts": ts, "open": close, "high": close, "low": close, "close": close, "volume": np.ones(count)}
+        store.append("SPY", timeframe, bars)
+    year = chart_series(store, "SPY", "1 an", resolution=300)
+    assert (year.timeframe, year.source_points, len(year)) == ("1d", 366, 300)
+    month = chart_series(store, "SPY", "1 mois", resolution=300)
+    assert month.timeframe == "1h" and month.ts[-1] == store.last_ts("SPY", "1h")
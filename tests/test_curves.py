@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import curves
+from curves import CurveBook, CurveHistory, _spline_weights, fit_nss, nss_yields
+
+TENORS = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+KNOTS = np.array([0.5, 1, 2, 5, 10, 30])
+TRUE_PARAMS = np.array(
+    [
+        [4.0, -1.5, -0.5, 1.0, 1.5, 8.0],
+        [3.2, 0.8, 1.2, -0.6, 0.7, 4.0],
+        [5.1, -2.4, 2.0, 0.5, 2.5, 12.0],
+    ]
+)
+
+
+def test_spline_weights_reproduce_the_knots():
+    np.testing.assert_allclose(_spline_weights(KNOTS, KNOTS), np.eye(len(KNOTS)), atol=1e-12)
+    # A natural spline is exact on straight lines.
+    np.testing.assert_allclose(_spline_weights(KNOTS, TENORS) @ (2 + 0.3 * KNOTS), 2 + 0.3 * np.clip(TENORS, 0.5, 30))
+
+
+def test_spline_weights_match_scipy_natural_spline():
+    interpolate = pytest.importorskip("scipy.interpolate")
+    values = np.array([3.1, 3.4, 3.0, 3.6, 4.2, 4.0])
+    inside = TENORS[(TENORS >= KNOTS[0]) & (TENORS <= KNOTS[-1])]
+    expected = interpolate.CubicSpline(KNOTS, values, bc_type="natural")(inside)
+    np.testing.assert_allclose(_spline_weights(KNOTS, inside) @ values, expected, atol=1e-12)
+
+
+def test_fit_nss_recovers_known_parameters():
+    yields = nss_yields(TRUE_PARAMS, TENORS)
+    # From the grid, every curve is fitted to a fraction of a basis point
+    # (NSS parameters are only weakly identified far from the optimum).
+    params, rmse = fit_nss(TENORS, yields)
+    assert np.all(rmse < 0.002)
+    np.testing.assert_allclose(nss_yields(params, TENORS), yields, atol=0.005)
+    # Warm-started near the true decays, the parameters themselves come back.
+    params, rmse = fit_nss(TENORS, yields[:2], TRUE_PARAMS[:2, 4:] * 1.1)
+    np.testing.assert_allclose(params, TRUE_PARAMS[:2], atol=1e-3)
+    assert np.all(rmse < 1e-5)
+
+    # Too few quotes: no fit.
+    sparse = yields.copy()
+    sparse[0, 3:] = np.nan
+    params, rmse = fit_nss(TENORS, sparse)
+    assert np.isnan(params[0]).all() and np.isnan(rmse[0])
+
+
+def _history(days: int = 30) -> CurveHistory:
+    drift = np.linspace(0, 0.5, days)[:, None]
+    params = np.repeat(TRUE_PARAMS[:1], days, axis=0)
+    params[:, 0] += drift[:, 0]
+    dates = np.datetime64("2026-01-05") + np.arange(days)
+    return CurveHistory(dates=dates, tenors=TENORS, yields=nss_yields(params, TENORS))
+
+
+def test_warm_start_cache_refits_only_requoted_dates(tmp_path, monkeypatch):
+    history = _history()
+    CurveBook({"US": history}, str(tmp_path)).nss("US")
+
+    fitted = []
+    fit = curves.fit_nss
+
+    def counting_fit(tenors, yields, start=None):
+        fitted.append(len(yields))
+        return fit(tenors, yields, start)
+
+    monkeypatch.setattr(curves, "fit_nss", counting_fit)
+    requoted = CurveHistory(history.dates, history.tenors, history.yields.copy())
+    requoted.yields[17, 4] += 0.05
+    params, rmse = CurveBook({"US": requoted}, str(tmp_path)).nss("US")
+    assert fitted == [1]
+    assert not np.isnan(params).any()
+
+    # Unchanged quotes: nothing to fit.
+    fitted.clear()
+    CurveBook({"US": requoted}, str(tmp_path)).nss("US")
+    assert fitted == []
+
+
+def test_an_empty_cached_fit_is_ignored(tmp_path):
+    history = _history()
+    np.savez(
+        tmp_path / "US.nss.npz",
+        dates=history.dates[:0],
+        tenors=history.tenors,
+        yields=history.yields[:0],
+        params=np.empty((0, 6)),
+        rmse=np.empty(0),
+    )
+    params, rmse = CurveBook({"US": history}, str(tmp_path)).nss("US")
+    assert params.shape == (len(history), 6) and not np.isnan(rmse).any()
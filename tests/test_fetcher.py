@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import numpy as np
+
+from fetcher import CcxtProvider, MarketDataFetcher, MarketDataProvider
+from store import TIMEFRAMES, OHLCVStore
+
+DAY = TIMEFRAMES["1d"]
+START = 1_767_225_600_000  # 2026-01-01 00:00 UTC
+
+
+def _rows(ts: np.ndarray) -> np.ndarray:
+    close = 100 + np.arange(len(ts), dtype=float)
+    return np.column_stack([ts, close, close, close, close, np.ones(len(ts))])
+
+
+class _Exchange:
+    """Serves `bars` daily bars from START in pages of `page`, like ccxt."""
+
+    def __init__(self, bars: int, page: int = 500) -> None:
+        self.ts = START + np.arange(bars) * DAY
+        self.page = page
+        self.calls = 0
+
+    async def fetch_ohlcv(self, market, timeframe, since=None, limit=None):
+        self.calls += 1
+        if since is None:
+            return _rows(self.ts[-(limit or self.page) :]).tolist()
+        lo = int(np.searchsorted(self.ts, since))
+        return _rows(self.ts[lo : lo + min(limit or self.page, self.page)]).tolist()
+
+
+def _ccxt(exchange: _Exchange) -> CcxtProvider:
+    provider = CcxtProvider.__new__(CcxtProvider)
+    provider._exchange, provider.quote, provider.rate_limit = exchange, "USDT", 1e6
+    return provider
+
+
+class _Provider(MarketDataProvider):
+    name = "fake"
+
+    def __init__(self, ts: np.ndarray) -> None:
+        self.ts = ts
+
+    async def fetch_bars(self, symbol, timeframe, since_ms=None, limit=None):
+        ts = self.ts if since_ms is None else self.ts[self.ts >= since_ms]
+        close = 100 + (ts - START) / DAY
+        return {"ts": ts, "open": close, "high": close, "low": close, "close": close, "volume": np.ones(len(ts))}
+
+
+def test_ccxt_first_fill_walks_every_page():
+    exchange = _Exchange(1_234)
+    bars = asyncio.run(_ccxt(exchange).fetch_bars("BTC", "1d"))
+    assert np.array_equal(bars["ts"], exchange.ts)
+    assert exchange.calls == 4  # three pages and the empty one
+    latest = asyncio.run(_ccxt(exchange).fetch_bars("BTC", "1d", limit=10))
+    assert np.array_equal(latest["ts"], exchange.ts[-10:])
+
+
+def test_refresh_stores_closed_bars_only(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    provider = _Provider(START + np.arange(10) * DAY)
+    fetcher = MarketDataFetcher({"fake": provider})
+    # Day 9 opened at START + 9 days and is still trading at noon.
+    now_ms = START + 9 * DAY + DAY // 2
+    assert asyncio.run(fetcher.refresh_store(store, {"Crypto": ["BTC"]}, now_ms=now_ms)) == {"BTC": 9}
+    assert store.last_ts("BTC", "1d") == START + 8 * DAY
+
+    # Once it has closed, the next refresh picks it up.
+    results = asyncio.run(fetcher.refresh_store(store, {"Crypto": ["BTC"]}, now_ms=now_ms + DAY))
+    assert results == {"BTC": 1}
+    assert np.array_equal(store.read("BTC", "1d").ts, provider.ts)
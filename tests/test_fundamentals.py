@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundamentals import FIELDS, RATIOS, FundamentalsBook, FundamentalsStore, compute_ratios, ingest
+
+PERIODS = [f"{year}Q{quarter}" for year in range(2020, 2024) for quarter in range(1, 5)]
+
+
+def _statement(symbol: str = "ACME") -> pd.DataFrame:
+    """Sixteen quarters with round numbers: revenue grows 10 % a year, the
+    other flows are flat and the balances are set at the two year ends the
+    ratios read."""
+    revenue = np.repeat([100.0, 110.0, 121.0, 133.1], 4)
+    frame = pd.DataFrame({
+        "symbol": symbol,
+        "period": PERIODS,
+        "revenue": revenue,
+        "operating_income": 20.0,
+        "net_income": 10.0,
+        "ebitda": 25.0,
+        "operating_cash_flow": 30.0,
+        "capex": 10.0,
+        "equity": 200.0,
+        "net_debt": 150.0,
+        "market_cap": 1000.0,
+    })
+    frame.loc[frame["period"] == "2022Q4", "equity"] = 180.0
+    frame.loc[frame["period"] == "2023Q4", "equity"] = 220.0
+    return frame
+
+
+def _columns(frame: pd.DataFrame) -> dict:
+    fields = [column for column in frame.columns if column not in ("symbol", "period")]
+    return {field: frame[field].to_numpy(dtype=float)[None, :] for field in fields}
+
+
+def test_ratios_match_a_hand_computed_statement():
+    ratios = compute_ratios(_columns(_statement()))
+    last = {name: values[0, -1] for name, values in ratios.items()}
+
+    # TTM at 2023Q4: revenue 4 × 133.1, net income 40, operating income 80,
+    # EBITDA 100, free cash flow 120 - 40; average equity (180 + 220) / 2.
+    assert last["roe"] == pytest.approx(40 / 200)
+    assert last["operating_margin"] == pytest.approx(80 / 532.4)
+    assert last["fcf_yield"] == pytest.approx(80 / 1000)
+    assert last["net_leverage"] == pytest.approx(150 / 100)
+    assert last["ev_ebitda"] == pytest.approx((1000 + 150) / 100)
+    # 532.4 / 400 = 1.1 ** 3.
+    assert last["revenue_growth_3y"] == pytest.approx(0.1)
+
+
+def test_ratios_wait_for_complete_windows():
+    ratios = compute_ratios(_columns(_statement()))
+    # TTM flows need four quarters, the 3-year growth fifteen.
+    assert np.isnan(ratios["operating_margin"][0, :3]).all()
+    assert ratios["operating_margin"][0, 3] == pytest.approx(80 / 400)
+    assert np.isnan(ratios["revenue_growth_3y"][0, :15]).all()
+    # Without a year-ago balance, ROE falls back to the closing equity.
+    assert ratios["roe"][0, 3] == pytest.approx(40 / 200)
+
+
+def test_missing_quarter_and_non_positive_bases_give_nan():
+    frame = _statement()
+    frame.loc[frame["period"] == "2023Q2", "revenue"] = np.nan
+    frame.loc[frame["period"] == "2023Q4", "ebitda"] = -200.0
+    ratios = compute_ratios(_columns(frame))
+    # A gap voids every trailing window that spans it.
+    assert np.isnan(ratios["operating_margin"][0, -3:]).all()
+    assert not np.isnan(ratios["operating_margin"][0, -4])
+    # TTM EBITDA is 25 × 3 - 200 < 0: leverage multiples are not meaningful.
+    assert np.isnan(ratios["net_leverage"][0, -1])
+    assert np.isnan(ratios["ev_ebitda"][0, -1])
+
+
+def test_ingested_statement_gives_the_same_ratios(tmp_path):
+    path = tmp_path / "statements.csv"
+    pd.concat([_statement("ACME"), _statement("BETA").iloc[:8]]).to_csv(path, index=False)
+    store = ingest([str(path)], root=str(tmp_path / "store"))
+
+    latest = FundamentalsBook(FundamentalsStore(store.root)).latest("ACME")
+    assert latest["period"] == "2023Q4"
+    assert latest["roe"] == pytest.approx(0.2)
+    assert latest["revenue_growth_3y"] == pytest.approx(0.1)
+    # BETA stopped reporting in 2021: its latest quarter is its own last one.
+    assert FundamentalsBook(store).latest("BETA")["period"] == "2021Q4"
+    assert FundamentalsBook(store).latest("MISSING") is None
+
+
+def test_restatement_overwrites_and_old_generations_are_pruned(tmp_path):
+    store = FundamentalsStore(str(tmp_path))
+    store.ingest([_statement()])
+    store.ingest([_statement()])
+    # Rows arrive as read_statements gives them: every field, NaN where unreported.
+    restated = pd.DataFrame({"symbol": ["ACME"], "period": ["2023Q4"], "net_income": [50.0]})
+    restated = restated.reindex(columns=["symbol", "period", *FIELDS])
+    store.ingest([restated])
+
+    reopened = FundamentalsStore(str(tmp_path))
+    assert reopened.version == 3
+    latest = FundamentalsBook(reopened).latest("ACME")
+    # Only the restated field moves: TTM net income 10 × 3 + 50.
+    assert latest["roe"] == pytest.approx(80 / 200)
+    assert latest["operating_margin"] == pytest.approx(80 / 532.4)
+    history = FundamentalsBook(reopened).company_history("ACME", quarters=4)
+    assert list(history.columns) == list(RATIOS.values())
+    assert list(history.index) == PERIODS[-4:]
+
+    versions = {name.split(".")[1] for name in os.listdir(tmp_path) if name.endswith(".npy")}
+    assert versions == {"v2", "v3"}
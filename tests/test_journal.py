@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+
+from fixtures import synthetic_decisions
+from journal import DecisionJournal
+
+# The backlog asks for thousands of journal writes per second from
+# concurrent sessions; this is the durable rate (entries fsynced) the test
+# requires. A laptop sustains well over 100k/s.
+MIN_WRITES_PER_SECOND = 2_000
+SESSIONS = 16
+PER_SESSION = 1_000
+
+
+def _ts_ms(frame: pd.DataFrame) -> pd.Series:
+    return (frame["ts"] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+
+
+def test_concurrent_sessions_survive_reopen_above_the_write_floor(tmp_path):
+    entries = synthetic_decisions(SESSIONS * PER_SESSION, seed=1)
+    journal = DecisionJournal(str(tmp_path))
+    barrier = threading.Barrier(SESSIONS + 1)
+
+    def session(index: int) -> None:
+        barrier.wait()
+        for entry in entries[index::SESSIONS]:
+            journal.record(entry)
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(SESSIONS)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    assert journal.flush(timeout=60)
+    elapsed = time.perf_counter() - start
+    journal.close()
+
+    rate = len(entries) / elapsed
+    assert rate >= MIN_WRITES_PER_SECOND, f"{rate:,.0f} écritures durables/s"
+    # Group commit: far fewer fsync rounds than entries.
+    assert journal.stats.batches < len(entries) / 10
+
+    frame = DecisionJournal(str(tmp_path)).query()
+    assert len(frame) == len(entries)
+    rows = {key: row for row, key in enumerate(zip(_ts_ms(frame), frame["user"], frame["asset"]))}
+    expected = {(entry.ts_ms, entry.user, entry.asset) for entry in entries}
+    assert set(rows) == expected
+    for index in range(SESSIONS):
+        positions = [rows[(entry.ts_ms, entry.user, entry.asset)] for entry in entries[index::SESSIONS]]
+        assert positions == sorted(positions), f"session {index}"
+    decoded = frame.iloc[0]
+    first = min(entries, key=lambda entry: rows[(entry.ts_ms, entry.user, entry.asset)])
+    assert (decoded["decision"], decoded["composite"], decoded["hedge"]) == (
+        first.decision,
+        first.composite,
+        first.hedge,
+    )
+
+
+def test_changes_match_a_full_scan(tmp_path):
+    entries = synthetic_decisions(20_000, assets=20, seed=2)
+    journal = DecisionJournal(str(tmp_path))
+    for entry in entries:
+        journal.record(entry)
+    journal.flush()
+    previous, expected = {}, []
+    for entry in entries:
+        if entry.asset != "SYM00007":
+            continue
+        key = (entry.horizon, entry.risk_budget)
+        if previous.get(key, entry.decision) != entry.decision:
+            expected.append((entry.ts_ms, previous[key], entry.decision))
+        previous[key] = entry.decision
+    changes = journal.changes("SYM00007")
+    assert list(zip(_ts_ms(changes), changes["previous_decision"], changes["decision"])) == expected
+    assert len(journal.query("SYM00007")) == sum(entry.asset == "SYM00007" for entry in entries)
+    journal.close()
+
+
+def test_uncommitted_dictionary_lines_are_dropped(tmp_path):
+    entries = synthetic_decisions(10, seed=3)
+    journal = DecisionJournal(str(tmp_path))
+    for entry in entries[:5]:
+        journal.record(entry)
+    journal.flush()
+    journal.close()
+    # A crash after the dictionary fsync but before meta.json was replaced.
+    with open(os.path.join(tmp_path, "dictionary.jsonl"), "a", encoding="utf-8") as handle:
+        handle.write('["asset", "ZZZ"]\n')
+
+    journal = DecisionJournal(str(tmp_path))
+    for entry in entries[5:]:
+        journal.record(replace(entry, asset="NEW"))
+    journal.flush()
+    journal.close()
+    frame = DecisionJournal(str(tmp_path)).query()
+    assert list(frame["asset"]) == [entry.asset for entry in entries[:5]] + ["NEW"] * 5
+
+
+def test_failed_batch_releases_its_codes(tmp_path):
+    entries = synthetic_decisions(2, seed=4)
+    journal = DecisionJournal(str(tmp_path))
+    journal.record(entries[0])
+    journal.flush()
+
+    def fail(batch):
+        raise OSError("disque plein")
+
+    journal._append = fail
+    journal.record(replace(entries[1], asset="NEW"))
+    with pytest.raises(RuntimeError):
+        journal.flush()
+    journal.close()
+    assert len(journal) == 1
+    assert journal.query("NEW").empty
+    assert list(DecisionJournal(str(tmp_path)).query()["asset"]) == [entries[0].asset]
+
+
+def test_budgets_viewed_side_by_side_are_not_changes(tmp_path):
+    base = synthetic_decisions(1, seed=5)[0]
+    journal = DecisionJournal(str(tmp_path))
+    # Two sessions alternate on one asset and horizon with different budgets,
+    # each budget with its own, stable decision.
+    for step in range(6):
+        budget, decision = ((3, "Accumuler"), (8, "Réduire"))[step % 2]
+        journal.record(
+            replace(base, ts_ms=base.ts_ms + step, user=f"session-{step % 2}", risk_budget=budget, decision=decision)
+        )
+    journal.record(replace(base, ts_ms=base.ts_ms + 6, risk_budget=3, decision="Conserver"))
+    journal.flush()
+    changes = journal.changes(base.asset)
+    journal.close()
+    assert list(zip(changes["risk_budget"], changes["previous_decision"], changes["decision"])) == [
+        (3, "Accumuler", "Conserver")
+    ]
+
+
+def test_a_failed_batch_is_raised_once(tmp_path):
+    entries = synthetic_decisions(3, seed=6)
+    journal = DecisionJournal(str(tmp_path))
+    append = journal._append
+
+    def fail(batch):
+        raise OSError("disque plein")
+
+    journal._append = fail
+    journal.record(entries[0])
+    with pytest.raises(RuntimeError):
+        journal.flush()
+    journal._append = append
+    journal.record(entries[1])
+    assert journal.flush()
+    assert journal.error is None
+    journal.record(entries[2])
+    assert journal.flush()
+    journal.close()
+    assert len(journal) == 2
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from montecarlo import (
+    PERCENTILES,
+    StreamingAggregator,
+    _chunks,
+    scenario_spec,
+    simulate,
+    simulate_chunk,
+    snapshot_scenarios,
+)
+
+
+def _spec(paths: int = 200_000):
+    return scenario_spec(drift=0.06, volatility=0.2, horizon="Moyen terme", seed=11, paths=paths)
+
+
+def test_histogram_and_bucket_mass_sum_to_one():
+    spec = _spec()
+    aggregator = StreamingAggregator(spec)
+    for seed, size in _chunks(spec):
+        aggregator.add(simulate_chunk(spec, seed, size))
+    snapshot = aggregator.snapshot()
+    assert aggregator.histogram.sum() / aggregator.paths == pytest.approx(1.0)
+    # The histogram spans ±8 sigmas: its under/overflow bins stay empty.
+    assert aggregator.histogram[0] == aggregator.histogram[-1] == 0
+    assert snapshot.bucket_probabilities.sum() == pytest.approx(1.0)
+    assert snapshot.done and snapshot.paths_done == spec.paths
+
+    quantiles = [snapshot.percentiles[q] for q in PERCENTILES]
+    assert quantiles == sorted(quantiles)
+    assert snapshot.worst <= quantiles[0] and quantiles[-1] <= snapshot.best
+    # E[exp(X)] = exp(drift × years) for the simulated log-returns.
+    assert snapshot.mean == pytest.approx(np.expm1(0.06 * spec.horizon_days / 252), abs=3e-3)
+
+
+def test_results_do_not_depend_on_the_executor():
+    spec = _spec(paths=120_000)
+    sequential = simulate(spec)
+    with ThreadPoolExecutor(4) as executor:
+        pooled = simulate(spec, executor)
+    np.testing.assert_array_equal(sequential.bucket_probabilities, pooled.bucket_probabilities)
+    assert sequential.percentiles == pooled.percentiles
+
+
+def test_scenarios_carry_the_simulated_probabilities():
+    snapshot = simulate(_spec(paths=100_000))
+    bear, central, bull = (round(float(p) * 100, 1) for p in snapshot.bucket_probabilities)
+    scenarios = snapshot_scenarios(7, snapshot)
+    assert [s.probability for s in scenarios] == [central, bull, bear]
+    assert sum(s.probability for s in scenarios) == pytest.approx(100, abs=0.2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from risk import RiskMonitor, ewma_variance, risk_limits, rolling_max_drawdown, rolling_risk, rolling_smallest
+
+# Not powers of two, so windows are cut into several blocks.
+WINDOWS = [1, 3, 7, 12, 50]
+
+
+def _returns(days: int = 160, columns: int = 3, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_t(4, (days, columns)) * 0.01
+
+
+def _windows(values: np.ndarray, window: int):
+    return [values[end - window : end] for end in range(window, len(values) + 1)]
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_smallest_matches_a_sort_per_window(window):
+    returns = _returns()
+    for count in range(1, min(window, 4) + 1):
+        expected = np.stack([np.sort(chunk, axis=0)[:count] for chunk in _windows(returns, window)], axis=1)
+        np.testing.assert_array_equal(rolling_smallest(returns, window, count), expected)
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_max_drawdown_matches_a_loop(window):
+    returns = _returns()
+    path = np.vstack([np.zeros((1, returns.shape[1])), np.cumsum(returns, axis=0)])
+    expected = np.zeros((len(returns) - window + 1, returns.shape[1]))
+    for row in range(len(expected)):
+        for column in range(returns.shape[1]):
+            peak = -np.inf
+            for level in path[row : row + window + 1, column]:
+                peak = max(peak, level)
+                expected[row, column] = max(expected[row, column], peak - level)
+    np.testing.assert_allclose(rolling_max_drawdown(returns, window), expected, atol=1e-15)
+
+
+def test_ewma_variance_matches_the_recursion():
+    returns = _returns(days=300)  # several closed-form blocks
+    decay = 0.94
+    expected = np.empty((len(returns) + 1, returns.shape[1]))
+    expected[0] = np.var(returns[:20], axis=0)
+    for day, row in enumerate(returns):
+        expected[day + 1] = decay * expected[day] + (1 - decay) * row * row
+    np.testing.assert_allclose(ewma_variance(returns, decay), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("window", [12, 50])
+def test_rolling_risk_matches_per_window_estimates(window):
+    returns = _returns()
+    confidence = 0.9
+    tail = 1 - confidence
+    count = math.ceil(tail * window - 1e-9)
+    z = NormalDist().inv_cdf(tail)
+    profile = rolling_risk(returns, window, confidence)
+    forecast = np.sqrt(ewma_variance(returns))
+    for row, chunk in enumerate(_windows(returns, window)):
+        smallest = np.sort(chunk, axis=0)[:count]
+        np.testing.assert_allclose(profile.var["historical"][row], -smallest[-1])
+        np.testing.assert_allclose(profile.es["historical"][row], -smallest.mean(axis=0))
+        mean, sigma = chunk.mean(axis=0), chunk.std(axis=0, ddof=1)
+        np.testing.assert_allclose(profile.var["parametric"][row], -(mean + z * sigma))
+        standardised = np.sort(chunk / forecast[row : row + window], axis=0)[:count]
+        np.testing.assert_allclose(profile.var["filtered"][row], -standardised[-1] * forecast[row + window])
+
+
+def test_monitor_checks_scale_with_the_position():
+    returns = _returns(days=400)
+    monitor = RiskMonitor(returns, window=100, confidence=0.95)
+    var_limit, drawdown_limit = risk_limits(3, 0.95)
+    check = monitor.asset_check(1, 3, "parametric", exposure=2.0)
+    history = monitor.assets.var["parametric"][:, 1] * 2.0
+    assert check.var == pytest.approx(history[-1])
+    assert check.var_breaches == int(np.sum(history > var_limit))
+    drawdowns = monitor.assets.max_drawdown[:, 1] * 2.0
+    assert check.drawdown_breaches == int(np.sum(drawdowns > drawdown_limit))
+
+    weights = np.array([0.5, -0.3, 0.4])
+    portfolio = monitor.portfolio_check(weights, 3)
+    direct = RiskMonitor(returns @ (weights / np.abs(weights).sum()), window=100, confidence=0.95)
+    expected = direct.asset_check(0, 3, exposure=float(np.abs(weights).sum()))
+    assert portfolio.var == pytest.approx(expected.var)
+    assert (portfolio.var_breaches, portfolio.drawdown_breaches) == (expected.var_breaches, expected.drawdown_breaches)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from rolling import returns_matrix
+from store import TIMEFRAMES, OHLCVStore
+
+DAYS = 30
+MIDNIGHT_UTC = 1_767_225_600_000  # 2026-01-01
+
+
+def _bars(ts: np.ndarray, close: np.ndarray) -> dict:
+    return {"ts": ts, "open": close, "high": close, "low": close, "close": close, "volume": np.ones(len(ts))}
+
+
+def test_daily_bars_from_offset_providers_share_one_row_per_day(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    rng = np.random.default_rng(7)
+    days = MIDNIGHT_UTC + np.arange(DAYS) * TIMEFRAMES["1d"]
+    closes = {symbol: 100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS))) for symbol in ("BTC", "SPY", "CAC")}
+    store.append("BTC", "1d", _bars(days, closes["BTC"]))  # ccxt: 00:00 UTC
+    store.append("SPY", "1d", _bars(days + 5 * 3_600_000, closes["SPY"]))  # New York midnight
+    store.append("CAC", "1d", _bars(days - 3_600_000, closes["CAC"]))  # Paris midnight
+
+    symbols, returns = returns_matrix(store, ["BTC", "SPY", "CAC"])
+    assert symbols == ["BTC", "SPY", "CAC"]
+    assert returns.shape == (DAYS - 1, 3)
+    assert np.count_nonzero(returns == 0) == 0
+    expected = np.column_stack([np.diff(np.log(closes[symbol])) for symbol in symbols])
+    np.testing.assert_allclose(returns, expected)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from score_index import ScoreIndex
+from scoring import HORIZONS, RISK_BUDGETS, _load_universe
+
+
+def test_horizon_subset_is_an_incremental_update():
+    universe = _load_universe()
+    full = sum(len(set(assets)) for assets in universe.values()) * len(HORIZONS) * len(RISK_BUDGETS)
+    index = ScoreIndex(":memory:")
+    assert index.sync(universe).rows == full
+
+    subset = index.sync(universe, [HORIZONS[0]], [RISK_BUDGETS[0]])
+    assert (subset.inserted, subset.deleted, subset.rows, subset.full_rebuild) == (0, 0, full, False)
+    again = index.sync(universe)
+    assert (again.inserted, again.rows, again.full_rebuild) == (0, full, False)
+
+
+def test_subset_sync_fills_only_its_missing_rows():
+    universe = _load_universe()
+    assets = sum(len(set(assets)) for assets in universe.values())
+    index = ScoreIndex(":memory:")
+    index.sync(universe, [HORIZONS[0]])
+    stats = index.sync(universe, [HORIZONS[1]])
+    assert (stats.inserted, stats.rows) == (assets * len(RISK_BUDGETS), 2 * assets * len(RISK_BUDGETS))
+    assert index.sync(universe, macro_weights=[1.0] * 6).full_rebuild
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from scoring import (
+    ASSET_UNIVERSE,
+    HORIZONS,
+    RISK_BUDGETS,
+    _MACRO_LABELS,
+    _composite_score,
+    _fundamental_score,
+    _hedge_score,
+    _load_universe,
+    _macro_factor_table,
+    _macro_weights,
+    _make_macro_factors,
+    _market_score,
+    _portfolio_score,
+    _scenarios,
+    _score_to_decision,
+    _score_to_rating,
+    _stable_seed,
+    _weighted_score,
+    score_universe,
+)
+
+WEIGHTS = [
+    None,  # the defaults
+    (0.3, 0.1, 0.2, 0.1, 0.2, 0.1),
+    (0.15, 0.2, 0.2, 0.2, 0.1, 0.15),
+    (1 / 3, 1 / 7, 1 / 11, 0.2, 0.1, 0.13),
+]
+
+
+def _scalar_row(asset_class: str, asset: str, horizon: str, risk_budget: int, weights) -> dict:
+    seed = _stable_seed(f"{asset_class}-{asset}-{horizon}-{risk_budget}")
+    factors = _make_macro_factors(seed) if weights is None else _make_macro_factors(seed, weights)
+    macro = _weighted_score(factors)
+    fundamental = _fundamental_score(seed, macro)
+    market = _market_score(seed, macro)
+    portfolio = _portfolio_score(seed, macro)
+    hedge = _hedge_score(seed, macro)
+    composite = _composite_score(macro, fundamental, market, portfolio, hedge)
+    return {
+        "seed": seed,
+        "macro": macro,
+        "fundamental": fundamental,
+        "market": market,
+        "portfolio": portfolio,
+        "hedge": hedge,
+        "composite": composite,
+        "rating": _score_to_rating(composite),
+        "decision": _score_to_decision(composite),
+    }
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_score_universe_matches_scalar_path(weights):
+    universe = _load_universe()
+    frame = score_universe(universe) if weights is None else score_universe(universe, macro_weights=weights)
+    assert len(frame) == sum(map(len, universe.values())) * len(HORIZONS) * len(RISK_BUDGETS)
+    for row in frame.itertuples(index=False):
+        expected = _scalar_row(row.asset_class, row.asset, row.horizon, row.risk_budget, weights)
+        assert {key: getattr(row, key) for key in expected} == expected, (row.asset, row.horizon, row.risk_budget)
+
+
+def test_score_universe_covers_every_rating_boundary():
+    # Scaling the weights sweeps the composite across every rating and
+    # decision bound, so the searchsorted labels meet the scalar thresholds.
+    universe = {asset_class: [f"{asset_class[:3]}{i:04d}" for i in range(50)] for asset_class in ASSET_UNIVERSE}
+    ratings, decisions = set(), set()
+    for scale in (0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3):
+        weights = tuple(scale / 6 for _ in range(6))
+        frame = score_universe(universe, HORIZONS[:1], RISK_BUDGETS[:2], weights)
+        for row in frame.itertuples(index=False):
+            expected = _scalar_row(row.asset_class, row.asset, row.horizon, row.risk_budget, weights)
+            assert (row.composite, row.rating, row.decision) == (
+                expected["composite"],
+                expected["rating"],
+                expected["decision"],
+            )
+        ratings.update(frame["rating"])
+        decisions.update(frame["decision"])
+    assert ratings == {"AAA", "AA", "A", "BBB", "BB", "B", "D"}
+    assert decisions == {"Accumuler", "Conserver", "Réduire", "Short"}
+
+
+def test_settings_weights_land_on_their_named_factor():
+    configured = dict(growth=0.21, inflation=0.22, rates=0.23, liquidity=0.24, geopolitics=0.25, flows=0.26)
+    weights = dict(zip(_MACRO_LABELS, _macro_weights({"macro_weights": configured})))
+    assert weights == {
+        "Cycle économique": 0.24,
+        "Politique monétaire": 0.23,
+        "Inflation": 0.22,
+        "Croissance PIB": 0.21,
+        "Flux de capitaux": 0.26,
+        "Risque géopolitique": 0.25,
+    }
+
+
+def test_records_are_views_onto_their_table_row():
+    seed = _stable_seed("Actions-NVDA-Moyen terme-6")
+    factors = _make_macro_factors(seed, WEIGHTS[1])
+    table = factors[0].table
+    assert all(factor.table is table for factor in factors)
+    frame = table.asset_frame(factors[0].index)
+    assert [(f.label, f.signal, f.weight, f.score) for f in factors] == list(frame.itertuples(index=False))
+    assert [f.score for f in factors] == _macro_factor_table([seed], WEIGHTS[1]).scores[0].tolist()
+
+    scenarios = _scenarios(seed, probabilities=(48.5, 30.0, 21.5))
+    assert [s.probability for s in scenarios] == [48.5, 30.0, 21.5]
+    assert np.shares_memory(scenarios[0].table.probabilities, scenarios[0].table.to_frame().to_numpy())
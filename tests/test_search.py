@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from fixtures import synthetic_instruments
+from scoring import Instrument
+from search import SymbolIndex, _keys
+
+INSTRUMENTS = [
+    Instrument("NVDA", "Actions", "NVIDIA Corp", "US67066G1040"),
+    Instrument("AAPL", "Actions", "Apple Inc", "US0378331005"),
+    Instrument("MC.PA", "Actions", "LVMH Moët Hennessy Louis Vuitton", "FR0000121014"),
+    Instrument("NESN.SW", "Actions", "Nestlé SA", "CH0038863350"),
+    Instrument("EUR/USD", "Devises", "Euro / Dollar US", ""),
+]
+
+
+def _osa(a: str, b: str) -> int:
+    """Optimal string alignment distance, the textbook full table."""
+    table = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1, table[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+@pytest.mark.parametrize(
+    "query, symbol",
+    [
+        ("nivdia", "NVDA"),  # adjacent transposition
+        ("aple", "AAPL"),  # missing letter
+        ("appke", "AAPL"),  # substitution
+        ("nestle", "NESN.SW"),  # accents ignored
+        ("moet", "MC.PA"),  # a later name word
+        ("eurusd", "EUR/USD"),  # punctuation ignored
+        ("FR0000121014", "MC.PA"),
+    ],
+)
+def test_search_finds_one_edit_typos_and_normalised_keys(query, symbol):
+    assert SymbolIndex(INSTRUMENTS).search(query)[0].symbol == symbol
+
+
+def test_fuzzy_matches_agree_with_a_brute_force_scan():
+    instruments = synthetic_instruments(400, seed=3)
+    index = SymbolIndex(instruments)
+    keys = [[key for _, key in _keys(instrument)] for instrument in instruments]
+    for query in ("phrama", "telcom", "zenth", "polrais", "insurnce", "semicondutors", "qxzy"):
+        assert not index._prefix(query)
+        found = {instrument.symbol for instrument in index.search(query, limit=len(instruments))}
+        edits = 1 if len(query) < 8 else 2
+        expected = {
+            instrument.symbol
+            for instrument, candidates in zip(instruments, keys)
+            if any(
+                key[0] == query[0] and min(_osa(query, key[:end]) for end in range(1, len(key) + 1)) <= edits
+                for key in candidates
+            )
+        }
+        assert found == expected, query
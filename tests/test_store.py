@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+from store import TIMEFRAMES, OHLCVStore
+
+HOUR = TIMEFRAMES["1h"]
+START = 1_767_225_600_000  # 2026-01-01 00:00 UTC
+
+
+def _bars(first: int, count: int) -> dict:
+    ts = START + (first + np.arange(count)) * HOUR
+    close = 100 + first + np.arange(count, dtype=float)
+    return {"ts": ts, "open": close - 1, "high": close + 1, "low": close - 2, "close": close, "volume": close * 10}
+
+
+def test_append_and_read_round_trip(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    assert store.append("BTC/USDT", "1h", _bars(0, 50)) == 50
+    # Overlapping bars are skipped: only the new ones are appended.
+    assert store.append("BTC/USDT", "1h", _bars(40, 30)) == 20
+    assert store.append("BTC/USDT", "1h", _bars(10, 5)) == 0
+
+    expected = _bars(0, 70)
+    bars = store.read("BTC/USDT", "1h")
+    for column, values in expected.items():
+        np.testing.assert_array_equal(getattr(bars, column), values)
+    assert (store.rows("BTC/USDT", "1h"), store.last_ts("BTC/USDT", "1h")) == (70, int(expected["ts"][-1]))
+    assert store.symbols() == ["BTC/USDT"] and store.timeframes("BTC/USDT") == ["1h"]
+
+    window = store.read("BTC/USDT", "1h", START + 10 * HOUR, START + 19 * HOUR)
+    np.testing.assert_array_equal(window.close, expected["close"][10:20])
+    frame = store.read_frame("BTC/USDT", "1h", START + 65 * HOUR)
+    assert list(frame["close"]) == list(expected["close"][65:])
+
+    with pytest.raises(ValueError):
+        store.append("BTC/USDT", "1h", {**_bars(80, 3), "ts": START + np.array([3, 2, 1]) * HOUR})
+
+
+def test_bytes_of_an_uncommitted_append_are_truncated(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append("SPY", "1h", _bars(0, 10))
+    # A crash after the column writes but before meta.json was replaced.
+    path = store._series_dir("SPY", "1h")
+    for column in ("ts", "close"):
+        with open(os.path.join(path, f"{column}.bin"), "ab") as handle:
+            handle.write(b"\xff" * 8 * 4)
+
+    assert store.rows("SPY", "1h") == 10
+    assert store.append("SPY", "1h", _bars(10, 5)) == 5
+    bars = store.read("SPY", "1h")
+    np.testing.assert_array_equal(bars.ts, _bars(0, 15)["ts"])
+    np.testing.assert_array_equal(bars.close, _bars(0, 15)["close"])